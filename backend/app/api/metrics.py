@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from fastapi import APIRouter
+
+from app.services.exchange_rates import get_exchange_rate_index
+from app.services.scrape_cache import get_scrape_cache
+from app.services.shipping_rates import get_shipping_rate_index
+from app.services.taobao_client import get_taobao_call_guard
+from app.services.translation_glossary import get_glossary_store
+from app.services.translation_memory import get_translation_memory
+from app.services.translation_metrics import get_translation_metrics
+from app.services.translation_passthrough import get_passthrough_filter
+
+router = APIRouter(prefix="/api/metrics", tags=["metrics"])
+
+
+@router.get("")
+def get_metrics() -> dict:
+    """Expose in-process counters for caches and upstream integrations."""
+
+    scrape_cache = get_scrape_cache()
+    return {
+        "scrape_cache": scrape_cache.stats.as_dict() if scrape_cache else None,
+        "taobao_client": get_taobao_call_guard().state(),
+        "translation_memory": get_translation_memory().stats.as_dict(),
+        "translation_glossary": get_glossary_store().stats.as_dict(),
+        "translation_passthrough": get_passthrough_filter().stats.as_dict(),
+        "translation_providers": get_translation_metrics().as_dict(),
+        "exchange_rates": get_exchange_rate_index().stats.as_dict(),
+        "shipping_rates": get_shipping_rate_index().stats.as_dict(),
+    }
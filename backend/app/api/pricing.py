@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import List
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database import get_session
+from app.models.domain import ExchangeRate
+from app.schemas.pricing import (
+    ExchangeRatePublish,
+    ExchangeRateRead,
+    PricingSimulationRequest,
+    PricingSimulationResult,
+    SalePriceRefreshRequest,
+    SalePriceRefreshResult,
+    ShippingRatesUpdate,
+    ShippingRateTierRead,
+)
+from app.services.exchange_rates import ExchangeRateIndex, get_exchange_rate_index
+from app.services.pricing_simulation import PricingSimulator
+from app.services.sale_prices import SalePriceRefresher, run_sale_price_refresh
+from app.services.shipping_rates import ShippingRateIndex, get_shipping_rate_index
+
+router = APIRouter(prefix="/api/pricing", tags=["pricing"])
+
+
+def _refresh_after_response(background_tasks: BackgroundTasks, session: Session) -> None:
+    """Re-price the catalog once the response is sent, on a session of its own."""
+
+    background_tasks.add_task(
+        run_sale_price_refresh, sessionmaker(bind=session.get_bind(), autoflush=False)
+    )
+
+
+@router.get("/exchange-rates", response_model=List[ExchangeRateRead])
+def list_exchange_rates(
+    base_currency: str = "CNY",
+    quote_currency: str = "KRW",
+    session: Session = Depends(get_session),
+):
+    return (
+        session.query(ExchangeRate)
+        .filter(
+            ExchangeRate.base_currency == base_currency.upper(),
+            ExchangeRate.quote_currency == quote_currency.upper(),
+        )
+        .order_by(ExchangeRate.effective_from.desc())
+        .all()
+    )
+
+
+# Publish a rate; pricing picks it up from its effective_from onwards
+@router.post("/exchange-rates", response_model=ExchangeRateRead, status_code=201)
+def publish_exchange_rate(
+    payload: ExchangeRatePublish,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    rates: ExchangeRateIndex = Depends(get_exchange_rate_index),
+):
+    try:
+        row = rates.publish(
+            session,
+            payload.base_currency,
+            payload.quote_currency,
+            payload.rate,
+            payload.effective_from,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _refresh_after_response(background_tasks, session)
+    return row
+
+
+def _tiers(index: ShippingRateIndex) -> List[ShippingRateTierRead]:
+    return [
+        ShippingRateTierRead(max_weight_kg=bound, fee=fee)
+        for bound, fee in zip(index.tiers.max_weights, index.tiers.fees)
+    ]
+
+
+@router.get("/shipping-rates", response_model=List[ShippingRateTierRead])
+def list_shipping_rates(
+    session: Session = Depends(get_session),
+    shipping: ShippingRateIndex = Depends(get_shipping_rate_index),
+):
+    shipping.sync(session)
+    return _tiers(shipping)
+
+
+# Replace the weight tiers; products without a shipping_fee are priced by them
+@router.put("/shipping-rates", response_model=List[ShippingRateTierRead])
+def update_shipping_rates(
+    payload: ShippingRatesUpdate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    shipping: ShippingRateIndex = Depends(get_shipping_rate_index),
+):
+    try:
+        shipping.replace(session, [(tier.max_weight_kg, tier.fee) for tier in payload.tiers])
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    _refresh_after_response(background_tasks, session)
+    return _tiers(shipping)
+
+
+# Recompute materialized sale prices whose inputs changed (all products by default)
+@router.post("/sale-prices/refresh", response_model=SalePriceRefreshResult)
+def refresh_sale_prices(
+    payload: SalePriceRefreshRequest,
+    session: Session = Depends(get_session),
+):
+    result = SalePriceRefresher(session).refresh(payload.product_ids)
+    return asdict(result)
+
+
+# What-if: price the whole catalog under candidate rules without writing anything
+@router.post("/simulate", response_model=PricingSimulationResult)
+def simulate_pricing(
+    payload: PricingSimulationRequest,
+    session: Session = Depends(get_session),
+):
+    try:
+        return PricingSimulator(session).simulate(
+            payload.channel,
+            payload.rule_changes(),
+            thresholds=payload.thresholds,
+            order_days=payload.order_days,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
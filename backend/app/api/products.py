@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from dataclasses import asdict
+from datetime import timedelta
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
@@ -7,17 +10,32 @@ from app.database import get_session
 from app.models.domain import Product
 from app.repositories.product_repository import ProductRepository
 from app.schemas.product import (
+    ImageMirrorRequest,
+    ImageMirrorResult,
     ProductCreate,
     ProductImportRequest,
     ProductLocalizedInfoCreate,
+    ProductBulkTranslateRequest,
     ProductLocalizedInfoRead,
     ProductRead,
+    ProductResyncRequest,
+    ProductResyncResult,
     ProductTranslateRequest,
     ProductUpdate,
+    TranslationJobRead,
 )
+from app.services.image_mirror_service import ImageMirrorService
 from app.services.product_import_service import ProductImportService
 from app.services.product_service import ProductService
+from app.services.product_sync_service import ProductSyncService
+from app.services.taobao_registry import TaobaoClientRegistry, get_taobao_registry
+from app.services.translation_jobs import (
+    TranslationJobManager,
+    get_translation_job_manager,
+    select_products_for_translation,
+)
 from app.services.translation_service import (
+    TranslationBudgetExceeded,
     TranslationError,
     TranslationService,
     UnsupportedTranslationProviderError,
@@ -34,9 +52,11 @@ def get_service(session: Session = Depends(get_session)) -> ProductService:
 # Ingest a product scraped from an external URL
 @router.post("/import", response_model=ProductRead)
 async def import_product(
-    payload: ProductImportRequest, session: Session = Depends(get_session)
+    payload: ProductImportRequest,
+    session: Session = Depends(get_session),
+    registry: TaobaoClientRegistry = Depends(get_taobao_registry),
 ):
-    importer = ProductImportService(session)
+    importer = ProductImportService(session, scrapers=registry.scrapers())
     try:
         product = await importer.import_product(
             source_url=payload.source_url, source_site=payload.source_site
@@ -46,6 +66,68 @@ async def import_product(
     return product
 
 
+# Re-fetch stale products and persist only upstream changes
+@router.post("/resync", response_model=ProductResyncResult)
+async def resync_products(
+    payload: ProductResyncRequest,
+    session: Session = Depends(get_session),
+    registry: TaobaoClientRegistry = Depends(get_taobao_registry),
+):
+    service = ProductSyncService(session, registry.scrapers())
+    result = await service.resync_stale(
+        timedelta(hours=payload.stale_after_hours), limit=payload.limit
+    )
+    return asdict(result)
+
+
+# Download referenced product images into the local content-addressed mirror
+@router.post("/images/mirror", response_model=ImageMirrorResult)
+async def mirror_product_images(
+    payload: ImageMirrorRequest,
+    session: Session = Depends(get_session),
+):
+    result = await ImageMirrorService(session).mirror_products(payload.product_ids)
+    return asdict(result)
+
+
+# Translate many products in the background; poll the returned job for progress
+@router.post("/translate:bulk", response_model=TranslationJobRead, status_code=202)
+async def bulk_translate_products(
+    payload: ProductBulkTranslateRequest,
+    session: Session = Depends(get_session),
+    manager: TranslationJobManager = Depends(get_translation_job_manager),
+):
+    try:
+        TranslationService(session).check_provider(payload.provider)
+    except UnsupportedTranslationProviderError as exc:
+        raise HTTPException(status_code=422, detail="지원하지 않는 번역 프로바이더") from exc
+    product_ids = select_products_for_translation(
+        session,
+        product_ids=payload.product_ids,
+        source_site=payload.source_site,
+        untranslated_only=payload.untranslated_only,
+        target_locale=payload.target_locale,
+        limit=payload.limit,
+    )
+    job = manager.submit(
+        product_ids,
+        target_locale=payload.target_locale,
+        provider=payload.provider.lower(),
+        force=payload.force,
+    )
+    return job.as_dict()
+
+
+@router.get("/translate:bulk/{job_id}", response_model=TranslationJobRead)
+def get_bulk_translate_job(
+    job_id: str, manager: TranslationJobManager = Depends(get_translation_job_manager)
+):
+    job = manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Translation job not found")
+    return job.as_dict()
+
+
 @router.get("", response_model=list[ProductRead])
 def list_products(service: ProductService = Depends(get_service)):
     return service.list()
@@ -87,12 +169,17 @@ def translate_product(
     service = TranslationService(session)
     try:
         return service.translate_product(
-            product_id, target_locale=payload.target_locale, provider=payload.provider
+            product_id,
+            target_locale=payload.target_locale,
+            provider=payload.provider,
+            force=payload.force,
         )
     except LookupError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
     except UnsupportedTranslationProviderError as exc:
         raise HTTPException(status_code=422, detail="지원하지 않는 번역 프로바이더") from exc
+    except TranslationBudgetExceeded as exc:
+        raise HTTPException(status_code=429, detail="일일 번역 한도 초과") from exc
     except TranslationError as exc:
         raise HTTPException(status_code=400, detail="번역 실패") from exc
     except ValueError as exc:
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_session
+from app.models.domain import GlossaryTerm
+from app.schemas.translation import GlossaryTermRead, GlossaryUpdateRequest
+from app.services.translation_glossary import GlossaryStore, get_glossary_store
+
+router = APIRouter(prefix="/api/translation", tags=["translation"])
+
+
+def _glossary_terms(
+    session: Session, store: GlossaryStore, target_lang: str
+) -> list[GlossaryTermRead]:
+    custom = store.custom_terms(session, target_lang)
+    return [
+        GlossaryTermRead(source_text=source, translated_text=target, custom=source in custom)
+        for source, target in sorted(store.terms(session, target_lang).items())
+    ]
+
+
+@router.get("/glossary/{target_lang}", response_model=list[GlossaryTermRead])
+def list_glossary(
+    target_lang: str,
+    session: Session = Depends(get_session),
+    store: GlossaryStore = Depends(get_glossary_store),
+):
+    return _glossary_terms(session, store, target_lang.lower())
+
+
+# Add or override terms; they take effect for the next translation
+@router.put("/glossary/{target_lang}", response_model=list[GlossaryTermRead])
+def update_glossary(
+    target_lang: str,
+    payload: GlossaryUpdateRequest,
+    session: Session = Depends(get_session),
+    store: GlossaryStore = Depends(get_glossary_store),
+):
+    target_lang = target_lang.lower()
+    existing = {
+        term.source_text: term
+        for term in session.query(GlossaryTerm).filter(
+            GlossaryTerm.target_lang == target_lang,
+            GlossaryTerm.source_text.in_([term.source_text for term in payload.terms]),
+        )
+    }
+    for term in payload.terms:
+        row = existing.get(term.source_text)
+        if row is None:
+            row = GlossaryTerm(source_text=term.source_text, target_lang=target_lang)
+            session.add(row)
+            existing[term.source_text] = row
+        row.translated_text = term.translated_text
+        row.disabled = False
+    session.commit()
+    store.invalidate(target_lang)
+    return _glossary_terms(session, store, target_lang)
+
+
+# Removes a custom term (reverting to the shipped default, if any) or disables a default
+@router.delete("/glossary/{target_lang}/{source_text}", status_code=204)
+def delete_glossary_term(
+    target_lang: str,
+    source_text: str,
+    session: Session = Depends(get_session),
+    store: GlossaryStore = Depends(get_glossary_store),
+):
+    target_lang = target_lang.lower()
+    defaults = store.default_terms(target_lang)
+    row = (
+        session.query(GlossaryTerm)
+        .filter(GlossaryTerm.target_lang == target_lang, GlossaryTerm.source_text == source_text)
+        .first()
+    )
+    if row is not None and not row.disabled:
+        session.delete(row)
+    elif row is None and source_text in defaults:
+        session.add(
+            GlossaryTerm(
+                source_text=source_text,
+                target_lang=target_lang,
+                translated_text=defaults[source_text],
+                disabled=True,
+            )
+        )
+    else:
+        raise HTTPException(status_code=404, detail="Glossary term not found")
+    session.commit()
+    store.invalidate(target_lang)
+    return Response(status_code=204)
@@ -0,0 +1,70 @@
+"""Maintenance commands for the backend.
+
+Usage::
+
+    cd backend
+    python -m app.cli reparse [--limit N] [--batch-size N]
+    python -m app.cli mirror-images [--product-id ID ...] [--concurrency N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict
+
+from app.database import Base, SessionLocal, apply_schema_upgrades, engine
+from app.models import domain  # noqa: F401
+from app.services.image_mirror_service import ImageMirrorService
+from app.services.product_sync_service import ProductSyncService
+from app.services.taobao_registry import get_taobao_registry
+
+
+def reparse(args: argparse.Namespace) -> None:
+    session = SessionLocal()
+    try:
+        service = ProductSyncService(
+            session, get_taobao_registry().scrapers(), batch_size=args.batch_size
+        )
+        result = service.reparse_archived(limit=args.limit)
+    finally:
+        session.close()
+    print(" ".join(f"{key}={value}" for key, value in asdict(result).items()))
+
+
+def mirror_images(args: argparse.Namespace) -> None:
+    session = SessionLocal()
+    try:
+        service = ImageMirrorService(session, concurrency=args.concurrency)
+        result = asyncio.run(service.mirror_products(args.product_ids))
+    finally:
+        session.close()
+    print(" ".join(f"{key}={value}" for key, value in asdict(result).items()))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    reparse_parser = subcommands.add_parser(
+        "reparse", help="Re-derive products/options from archived raw payloads (offline)"
+    )
+    reparse_parser.add_argument("--limit", type=int, default=None)
+    reparse_parser.add_argument("--batch-size", type=int, default=200)
+    reparse_parser.set_defaults(handler=reparse)
+
+    mirror_parser = subcommands.add_parser(
+        "mirror-images", help="Download product images into the local content-addressed mirror"
+    )
+    mirror_parser.add_argument("--product-id", dest="product_ids", type=int, action="append")
+    mirror_parser.add_argument("--concurrency", type=int, default=None)
+    mirror_parser.set_defaults(handler=mirror_images)
+
+    args = parser.parse_args(argv)
+    Base.metadata.create_all(bind=engine)
+    apply_schema_upgrades()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,64 @@ class Settings(BaseSettings):
     translation_api_key: str | None = None
     translation_provider: str = "gcloud"
     google_application_credentials: str | None = None
+    # Per-request limits for batch translate calls (Cloud Translation v2: 128 segments)
+    translation_batch_max_segments: int = 128
+    translation_batch_max_chars: int = 30_000
+    # Longest text segment sent from an HTML description; longer text nodes split at sentences
+    translation_html_segment_max_chars: int = 2_000
+    # Entries of the persistent translation memory kept hot in process memory
+    translation_memory_lru_size: int = 20_000
+    # Bulk translation: parallel chunks, products per commit, and in-flight calls per provider
+    translation_bulk_workers: int = 4
+    translation_bulk_chunk_size: int = 20
+    translation_provider_concurrency: int = 4
+    translation_provider_timeout_seconds: float = 10.0
+    # Characters per provider per UTC day (0 = unlimited); bulk jobs wait for the reset
+    translation_daily_char_budget: int = 0
+    translation_budget_poll_seconds: float = 60.0
+    # Registers a local "fake" provider (for load tests and benchmarks)
+    translation_fake_provider_enabled: bool = False
+    translation_fake_provider_latency_ms: float = 0.0
+
+    # Taobao IOP call resilience
+    taobao_request_timeout_seconds: float = 10.0
+    taobao_http_pool_size: int = 10
+    taobao_rate_limit_per_second: float = 5.0
+    taobao_rate_limit_burst: float = 10.0
+    taobao_rate_limit_max_wait: float = 5.0
+    # Upper bound on Taobao calls in worker threads at once (async callers queue)
+    taobao_max_concurrent_calls: int = 8
+    taobao_retry_max_attempts: int = 3
+    taobao_retry_base_delay: float = 0.5
+    taobao_retry_max_delay: float = 5.0
+    taobao_breaker_failure_threshold: int = 5
+    taobao_breaker_reset_seconds: float = 30.0
+
+    # Taobao scrape response cache
+    scrape_cache_enabled: bool = True
+    scrape_cache_dir: str = "./cache/scrape"
+    scrape_cache_ttl_seconds: float = 6 * 60 * 60
+    scrape_cache_stale_seconds: float = 24 * 60 * 60
+
+    # Product image mirroring (content-addressed local copies of CDN images)
+    image_mirror_dir: str = "./media/images"
+    # Path the mirror directory is served under by this app, and the absolute
+    # public URL that path is reachable at (e.g. https://shop.example.com/media/images).
+    # Exports keep the original image URLs until the public URL is set.
+    image_mirror_mount_path: str = "/media/images"
+    image_mirror_public_base_url: str | None = None
+    image_mirror_concurrency: int = 8
+    image_mirror_timeout_seconds: float = 20.0
+    image_mirror_max_bytes: int = 20 * 1024 * 1024
+
+    # Raw scrape payload archive codec: "zlib" or "zstd" (requires zstandard)
+    payload_archive_codec: str = "zlib"
+
+    # Scheduled price/SKU re-sync of imported products (0 disables the scheduler)
+    product_sync_interval_seconds: float = 0.0
+    product_sync_stale_after_hours: float = 24.0
+    product_sync_batch_size: int = 50
+    product_sync_concurrency: int = 4
 
     # Generated file locations
     sales_channel_export_dir: str = "./exports"
@@ -24,6 +82,15 @@ class Settings(BaseSettings):
     default_margin: float = 15.0
     vat_rate: float = 10.0
     default_delivery: float = 3500.0
+    # Volumetric weight (kg) = length * width * height (cm) / divisor
+    shipping_volumetric_divisor: float = 6000.0
+    # Materialized sale prices: channels kept up to date and the background
+    # refresh interval (0 disables the scheduler)
+    sale_price_channels: list[str] = ["smartstore"]
+    # Optional sweep for changes no event reports (a scheduled rate taking
+    # effect, rules or tiers edited by another process); 0 disables it.
+    sale_price_refresh_interval_seconds: float = 0.0
+    sale_price_refresh_batch_size: int = 500
 
     # Content helpers
     return_policy_image_url: str | None = None
@@ -46,6 +46,60 @@ def apply_schema_upgrades() -> None:
                     "ALTER TABLE product_options ADD COLUMN localized_name VARCHAR(255)"
                 )
             )
+        if "content_hash" not in product_option_columns:
+            connection.execute(
+                text("ALTER TABLE product_options ADD COLUMN content_hash VARCHAR(64)")
+            )
+        if "variant_path" not in product_option_columns:
+            connection.execute(
+                text("ALTER TABLE product_options ADD COLUMN variant_path VARCHAR(255)")
+            )
+        if "localized_source_hash" not in product_option_columns:
+            connection.execute(
+                text("ALTER TABLE product_options ADD COLUMN localized_source_hash VARCHAR(64)")
+            )
+
+        # Source hashes for delta re-translation on the other localized tables
+        source_hash_columns = {
+            "product_localized_info": ("title_source_hash", "description_source_hash"),
+            "product_variant_dimensions": ("localized_source_hash",),
+            "product_variant_values": ("localized_source_hash",),
+        }
+        for table_name, column_names in source_hash_columns.items():
+            try:
+                existing = {column["name"] for column in inspector.get_columns(table_name)}
+            except Exception:
+                continue
+            for column_name in column_names:
+                if column_name not in existing:
+                    connection.execute(
+                        text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} VARCHAR(64)")
+                    )
+
+        # Republished rates bump ``updated_at`` so other workers notice them
+        try:
+            exchange_rate_columns = {
+                column["name"] for column in inspector.get_columns("exchange_rates")
+            }
+        except Exception:
+            exchange_rate_columns = None
+        if exchange_rate_columns is not None and "updated_at" not in exchange_rate_columns:
+            connection.execute(text("ALTER TABLE exchange_rates ADD COLUMN updated_at DATETIME"))
+
+        # Disabled glossary rows switch off a shipped default term
+        try:
+            glossary_columns = {
+                column["name"] for column in inspector.get_columns("translation_glossary_terms")
+            }
+        except Exception:
+            glossary_columns = None
+        if glossary_columns is not None and "disabled" not in glossary_columns:
+            connection.execute(
+                text(
+                    "ALTER TABLE translation_glossary_terms "
+                    "ADD COLUMN disabled BOOLEAN NOT NULL DEFAULT 0"
+                )
+            )
 
         # Patch ``products`` schema for newly added description and image columns
         try:
@@ -68,6 +122,12 @@ def apply_schema_upgrades() -> None:
         add_product_column("margin_rate", "NUMERIC(6, 2)")
         add_product_column("vat_rate", "NUMERIC(6, 2)")
         add_product_column("shipping_fee", "NUMERIC(12, 2)")
+        add_product_column("weight_kg", "NUMERIC(8, 3)")
+        add_product_column("length_cm", "NUMERIC(8, 1)")
+        add_product_column("width_cm", "NUMERIC(8, 1)")
+        add_product_column("height_cm", "NUMERIC(8, 1)")
+        add_product_column("content_hash", "VARCHAR(64)")
+        add_product_column("synced_at", "DATETIME")
 
 
 def get_session() -> Iterator[Session]:
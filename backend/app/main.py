@@ -1,12 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
 from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
 
 from app.api import after_sales
 from app.api import exports as exports_api
-from app.api import orders, products, shipments
+from app.api import metrics, orders, pricing, products, shipments
 from app.api import purchase_orders
-from app.database import Base, apply_schema_upgrades, engine
+from app.api import translation as translation_api
+from app.config import settings
+from app.database import Base, SessionLocal, apply_schema_upgrades, engine
+from app.services.product_sync_service import run_product_sync_forever
+from app.services.sale_prices import run_sale_price_refresh_forever
+from app.services.taobao_registry import get_taobao_registry
+from app.services.translation_providers import get_translation_providers
 
 
 def init_database() -> None:
@@ -16,6 +27,36 @@ def init_database() -> None:
     apply_schema_upgrades()
 
 
+@asynccontextmanager
+async def lifespan(application: FastAPI):
+    """Run background jobs and release process-wide upstream clients on shutdown."""
+
+    sync_task: asyncio.Task | None = None
+    if settings.product_sync_interval_seconds > 0:
+        sync_task = asyncio.create_task(
+            run_product_sync_forever(
+                SessionLocal,
+                get_taobao_registry().scrapers,
+                interval_seconds=settings.product_sync_interval_seconds,
+                stale_after=timedelta(hours=settings.product_sync_stale_after_hours),
+            )
+        )
+    refresh_task: asyncio.Task | None = None
+    if settings.sale_price_refresh_interval_seconds > 0:
+        refresh_task = asyncio.create_task(
+            run_sale_price_refresh_forever(
+                SessionLocal, interval_seconds=settings.sale_price_refresh_interval_seconds
+            )
+        )
+    yield
+    if sync_task is not None:
+        sync_task.cancel()
+    if refresh_task is not None:
+        refresh_task.cancel()
+    get_taobao_registry().close()
+    get_translation_providers().close()
+
+
 def create_app() -> FastAPI:
     """Application factory for FastAPI.
 
@@ -25,7 +66,7 @@ def create_app() -> FastAPI:
 
     init_database()
 
-    application = FastAPI(title="QQQ Purchase Agency Assistant")
+    application = FastAPI(title="QQQ Purchase Agency Assistant", lifespan=lifespan)
     for router in (
         products.router,
         orders.router,
@@ -33,9 +74,18 @@ def create_app() -> FastAPI:
         after_sales.router,
         exports_api.router,
         purchase_orders.router,
+        translation_api.router,
+        pricing.router,
+        metrics.router,
     ):
         application.include_router(router)
 
+    application.mount(
+        settings.image_mirror_mount_path,
+        StaticFiles(directory=settings.image_mirror_dir, check_dir=False),
+        name="mirrored-images",
+    )
+
     @application.get("/health")
     def healthcheck() -> dict[str, str]:
         return {"status": "ok"}
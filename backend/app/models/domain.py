@@ -4,7 +4,18 @@ from datetime import datetime
 from enum import Enum as PyEnum
 from typing import List, Optional
 
-from sqlalchemy import JSON, DateTime, Enum, ForeignKey, Numeric, String, Text
+from sqlalchemy import (
+    JSON,
+    Boolean,
+    DateTime,
+    Enum,
+    ForeignKey,
+    LargeBinary,
+    Numeric,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -33,8 +44,16 @@ class Product(Base):
     margin_rate: Mapped[float | None] = mapped_column(Numeric(6, 2), nullable=True)
     vat_rate: Mapped[float | None] = mapped_column(Numeric(6, 2), nullable=True)
     shipping_fee: Mapped[float | None] = mapped_column(Numeric(12, 2), nullable=True)
+    # Parcel weight and dimensions; the shipping tier is looked up by
+    # chargeable weight when ``shipping_fee`` is not set.
+    weight_kg: Mapped[float | None] = mapped_column(Numeric(8, 3), nullable=True)
+    length_cm: Mapped[float | None] = mapped_column(Numeric(8, 1), nullable=True)
+    width_cm: Mapped[float | None] = mapped_column(Numeric(8, 1), nullable=True)
+    height_cm: Mapped[float | None] = mapped_column(Numeric(8, 1), nullable=True)
     image_urls: Mapped[list[str]] = mapped_column(JSON, default=list)
     detail_image_urls: Mapped[list[str]] = mapped_column(JSON, default=list)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    synced_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -46,6 +65,46 @@ class Product(Base):
     localizations: Mapped[List["ProductLocalizedInfo"]] = relationship(
         back_populates="product", cascade="all, delete-orphan"
     )
+    raw_payload: Mapped[Optional["ProductRawPayload"]] = relationship(
+        back_populates="product", cascade="all, delete-orphan", uselist=False
+    )
+    variant_dimensions: Mapped[List["ProductVariantDimension"]] = relationship(
+        back_populates="product",
+        cascade="all, delete-orphan",
+        order_by="ProductVariantDimension.position",
+    )
+    sale_prices: Mapped[List["ProductSalePrice"]] = relationship(
+        back_populates="product", cascade="all, delete-orphan"
+    )
+
+
+class ProductRawPayload(Base):
+    """Compressed raw upstream response kept for offline re-parsing."""
+
+    __tablename__ = "product_raw_payloads"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), unique=True)
+    codec: Mapped[str] = mapped_column(String(10))
+    payload: Mapped[bytes] = mapped_column(LargeBinary)
+    content_hash: Mapped[str] = mapped_column(String(64))
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    product: Mapped[Product] = relationship(back_populates="raw_payload")
+
+
+class ImageMirror(Base):
+    """Local, content-addressed copy of a remote product image."""
+
+    __tablename__ = "image_mirrors"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    source_url: Mapped[str] = mapped_column(Text, unique=True)
+    sha256: Mapped[str] = mapped_column(String(64), index=True)
+    file_path: Mapped[str] = mapped_column(String(255))
+    content_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    size_bytes: Mapped[int] = mapped_column()
+    mirrored_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
 class ProductOption(Base):
@@ -57,8 +116,80 @@ class ProductOption(Base):
     raw_name: Mapped[str] = mapped_column(String(255))
     raw_price_diff: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
     localized_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    # ``prop_id:value_id`` pairs joined by ``;`` pointing into the variant matrix.
+    variant_path: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    # Hash of the source text (and target language) ``localized_name`` was translated from.
+    localized_source_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     product: Mapped[Product] = relationship(back_populates="options")
+    # Deleted by the ORM: SQLite ignores ``ON DELETE CASCADE`` without the
+    # ``foreign_keys`` pragma.
+    sale_prices: Mapped[List["ProductSalePrice"]] = relationship(
+        back_populates="option", cascade="all, delete-orphan"
+    )
+
+
+class ProductSalePrice(Base):
+    """Materialized sale price of one option (or an option-less product) on a channel."""
+
+    __tablename__ = "product_sale_prices"
+    __table_args__ = (
+        UniqueConstraint("product_id", "option_id", "channel", name="uq_product_sale_price"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
+    option_id: Mapped[Optional[int]] = mapped_column(
+        ForeignKey("product_options.id", ondelete="CASCADE"), nullable=True
+    )
+    channel: Mapped[str] = mapped_column(String(50))
+    sale_price: Mapped[int] = mapped_column()
+    # Inputs the price was computed from: the option's price difference and a
+    # hash of the product's pricing fields plus the channel's compiled rules.
+    raw_price_diff: Mapped[float] = mapped_column(Numeric(12, 2), default=0)
+    inputs_hash: Mapped[str] = mapped_column(String(64))
+    computed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    product: Mapped[Product] = relationship(back_populates="sale_prices")
+    option: Mapped[Optional[ProductOption]] = relationship(back_populates="sale_prices")
+
+
+class ProductVariantDimension(Base):
+    """One SKU axis of a product (e.g. color or size), parsed from ``prop_path``."""
+
+    __tablename__ = "product_variant_dimensions"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), index=True)
+    position: Mapped[int] = mapped_column(default=0)
+    prop_id: Mapped[str] = mapped_column(String(64))
+    raw_name: Mapped[str] = mapped_column(String(255))
+    localized_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    localized_source_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    product: Mapped[Product] = relationship(back_populates="variant_dimensions")
+    values: Mapped[List["ProductVariantValue"]] = relationship(
+        back_populates="dimension",
+        cascade="all, delete-orphan",
+        order_by="ProductVariantValue.position",
+    )
+
+
+class ProductVariantValue(Base):
+    __tablename__ = "product_variant_values"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    dimension_id: Mapped[int] = mapped_column(
+        ForeignKey("product_variant_dimensions.id"), index=True
+    )
+    position: Mapped[int] = mapped_column(default=0)
+    value_id: Mapped[str] = mapped_column(String(64))
+    raw_name: Mapped[str] = mapped_column(String(255))
+    localized_name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    localized_source_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    dimension: Mapped[ProductVariantDimension] = relationship(back_populates="values")
 
 
 class ProductLocalizedInfo(Base):
@@ -70,10 +201,85 @@ class ProductLocalizedInfo(Base):
     title: Mapped[str] = mapped_column(Text)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     option_display_name_format: Mapped[Optional[str]] = mapped_column(String(255))
+    # Source hashes of the last machine translation; unchanged sources are skipped.
+    title_source_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    description_source_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     product: Mapped[Product] = relationship(back_populates="localizations")
 
 
+class TranslationMemoryEntry(Base):
+    """Previously translated source text, reused across products."""
+
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint("source_hash", "target_lang", "provider", name="uq_translation_memory_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    source_hash: Mapped[str] = mapped_column(String(64))
+    target_lang: Mapped[str] = mapped_column(String(10))
+    provider: Mapped[str] = mapped_column(String(20))
+    source_text: Mapped[str] = mapped_column(Text)
+    translated_text: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class GlossaryTerm(Base):
+    """User-maintained glossary entry; overrides the shipped default for the same term.
+
+    A ``disabled`` row removes the shipped default for its term instead.
+    """
+
+    __tablename__ = "translation_glossary_terms"
+    __table_args__ = (
+        UniqueConstraint("source_text", "target_lang", name="uq_translation_glossary_term"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    source_text: Mapped[str] = mapped_column(String(100))
+    target_lang: Mapped[str] = mapped_column(String(10))
+    translated_text: Mapped[str] = mapped_column(String(255))
+    disabled: Mapped[bool] = mapped_column(Boolean, default=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class ExchangeRate(Base):
+    """Published rate for a currency pair, in effect from ``effective_from`` (UTC)."""
+
+    __tablename__ = "exchange_rates"
+    __table_args__ = (
+        UniqueConstraint(
+            "base_currency", "quote_currency", "effective_from", name="uq_exchange_rate_effective"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    base_currency: Mapped[str] = mapped_column(String(3))
+    quote_currency: Mapped[str] = mapped_column(String(3))
+    rate: Mapped[float] = mapped_column(Numeric(12, 4))
+    effective_from: Mapped[datetime] = mapped_column(DateTime)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
+class ShippingRateTier(Base):
+    """International shipping fee for parcels up to ``max_weight_kg`` chargeable weight."""
+
+    __tablename__ = "shipping_rate_tiers"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    max_weight_kg: Mapped[float] = mapped_column(Numeric(8, 3), unique=True)
+    fee: Mapped[float] = mapped_column(Numeric(12, 2))
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+
 class SalesChannelTemplate(Base):
     __tablename__ = "sales_channel_templates"
 
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ExchangeRatePublish(BaseModel):
+    base_currency: str = Field(default="CNY", min_length=3, max_length=3)
+    quote_currency: str = Field(default="KRW", min_length=3, max_length=3)
+    rate: float = Field(gt=0)
+    effective_from: Optional[datetime] = None
+
+
+class ExchangeRateRead(BaseModel):
+    id: int
+    base_currency: str
+    quote_currency: str
+    rate: float
+    effective_from: datetime
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+
+class ShippingRateTierWrite(BaseModel):
+    max_weight_kg: float = Field(gt=0)
+    fee: float = Field(ge=0)
+
+
+class ShippingRateTierRead(ShippingRateTierWrite):
+    pass
+
+
+class ShippingRatesUpdate(BaseModel):
+    tiers: List[ShippingRateTierWrite]
+
+class SalePriceRefreshRequest(BaseModel):
+    product_ids: Optional[List[int]] = None
+
+
+class SalePriceRefreshResult(BaseModel):
+    checked: int
+    updated: int
+    removed: int
+
+
+class PricingSimulationRequest(BaseModel):
+    """Candidate rule values; omitted fields keep the channel's current rules."""
+
+    channel: str = "smartstore"
+    exchange_rate: Optional[float] = Field(default=None, gt=0)
+    margin_rate: Optional[float] = Field(default=None, ge=0)
+    vat_rate: Optional[float] = Field(default=None, ge=0)
+    include_vat: Optional[bool] = None
+    delivery_fee: Optional[float] = Field(default=None, ge=0)
+    rounding_step: Optional[float] = Field(default=None, gt=0)
+    minimum_price: Optional[float] = Field(default=None, ge=0)
+    thresholds: List[float] = Field(default_factory=list, max_length=50)
+    order_days: int = Field(default=30, ge=0)
+
+    def rule_changes(self) -> dict:
+        return self.model_dump(
+            exclude_none=True, exclude={"channel", "thresholds", "order_days"}
+        )
+
+
+class PriceDistribution(BaseModel):
+    count: int
+    min: int
+    max: int
+    mean: float
+    total: int
+    percentiles: Dict[str, float]
+
+
+class PriceChangeSummary(BaseModel):
+    increased: int
+    decreased: int
+    unchanged: int
+    mean_delta: float
+
+
+class PriceThresholdImpact(BaseModel):
+    threshold: float
+    baseline_at_or_above: int
+    candidate_at_or_above: int
+    crossed_up_rows: int
+    crossed_down_rows: int
+    crossed_up_products: int
+    crossed_down_products: int
+
+
+class RevenueImpact(BaseModel):
+    order_days: int
+    order_items: int
+    units: int
+    actual: float
+    baseline: int
+    candidate: int
+    delta: int
+    delta_pct: float
+
+
+class PricingSimulationResult(BaseModel):
+    channel: str
+    baseline_rules: dict
+    candidate_rules: dict
+    rows: int
+    products: int
+    baseline: PriceDistribution
+    candidate: PriceDistribution
+    changes: PriceChangeSummary
+    thresholds: List[PriceThresholdImpact]
+    revenue: RevenueImpact
+    elapsed_ms: float
@@ -27,6 +27,61 @@ class ProductImportRequest(BaseModel):
 class ProductTranslateRequest(BaseModel):
     target_locale: str = "ko-KR"
     provider: str = "gcloud"
+    # Re-translate fields whose source has not changed since the last run.
+    force: bool = False
+
+
+class ProductBulkTranslateRequest(BaseModel):
+    product_ids: Optional[List[int]] = None
+    source_site: Optional[str] = None
+    untranslated_only: bool = False
+    limit: Optional[int] = Field(default=None, gt=0)
+    target_locale: str = "ko-KR"
+    provider: str = "gcloud"
+    force: bool = False
+
+
+class TranslationJobRead(BaseModel):
+    id: str
+    status: str
+    target_locale: str
+    provider: str
+    force: bool = False
+    total: int
+    translated: int
+    failed: int
+    progress: float
+    errors: List[dict] = []
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    deferred_until: Optional[datetime] = None
+
+
+class ProductResyncRequest(BaseModel):
+    stale_after_hours: float = Field(default=24.0, ge=0)
+    limit: Optional[int] = Field(default=None, gt=0)
+
+
+class ProductResyncResult(BaseModel):
+    checked: int
+    unchanged: int
+    products_updated: int
+    options_updated: int
+    options_added: int
+    failed: int
+
+
+class ImageMirrorRequest(BaseModel):
+    product_ids: Optional[List[int]] = None
+
+
+class ImageMirrorResult(BaseModel):
+    requested: int
+    already_mirrored: int
+    downloaded: int
+    deduplicated: int
+    failed: int
 
 
 class ProductCreate(BaseModel):
@@ -39,6 +94,10 @@ class ProductCreate(BaseModel):
     margin_rate: Optional[float] = None
     vat_rate: Optional[float] = None
     shipping_fee: Optional[float] = Field(default=None, ge=0)
+    weight_kg: Optional[float] = Field(default=None, ge=0)
+    length_cm: Optional[float] = Field(default=None, ge=0)
+    width_cm: Optional[float] = Field(default=None, ge=0)
+    height_cm: Optional[float] = Field(default=None, ge=0)
     raw_description: Optional[str] = None
     thumbnail_image_urls: List[str] = Field(default_factory=list)
     detail_image_urls: List[str] = Field(default_factory=list)
@@ -50,6 +109,10 @@ class ProductUpdate(BaseModel):
     margin_rate: Optional[float] = None
     vat_rate: Optional[float] = None
     shipping_fee: Optional[float] = Field(default=None, ge=0)
+    weight_kg: Optional[float] = Field(default=None, ge=0)
+    length_cm: Optional[float] = Field(default=None, ge=0)
+    width_cm: Optional[float] = Field(default=None, ge=0)
+    height_cm: Optional[float] = Field(default=None, ge=0)
 
 
 class ProductOptionRead(BaseModel):
@@ -58,6 +121,28 @@ class ProductOptionRead(BaseModel):
     raw_name: str
     raw_price_diff: float
     localized_name: Optional[str] = None
+    variant_path: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProductVariantValueRead(BaseModel):
+    id: int
+    value_id: str
+    raw_name: str
+    localized_name: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class ProductVariantDimensionRead(BaseModel):
+    id: int
+    prop_id: str
+    raw_name: str
+    localized_name: Optional[str] = None
+    values: List[ProductVariantValueRead] = []
 
     class Config:
         from_attributes = True
@@ -74,6 +159,16 @@ class ProductLocalizedInfoRead(BaseModel):
         from_attributes = True
 
 
+class ProductSalePriceRead(BaseModel):
+    option_id: Optional[int] = None
+    channel: str
+    sale_price: int
+    computed_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class ProductRead(BaseModel):
     id: int
     source_url: str
@@ -85,11 +180,17 @@ class ProductRead(BaseModel):
     margin_rate: Optional[float] = None
     vat_rate: Optional[float] = None
     shipping_fee: Optional[float] = None
+    weight_kg: Optional[float] = None
+    length_cm: Optional[float] = None
+    width_cm: Optional[float] = None
+    height_cm: Optional[float] = None
     image_urls: list[str]
     detail_image_urls: list[str]
     created_at: datetime
     options: List[ProductOptionRead] = []
     localizations: List[ProductLocalizedInfoRead] = []
+    variant_dimensions: List[ProductVariantDimensionRead] = []
+    sale_prices: List[ProductSalePriceRead] = []
 
     class Config:
         from_attributes = True
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class GlossaryTermWrite(BaseModel):
+    source_text: str = Field(min_length=1, max_length=100)
+    translated_text: str = Field(min_length=1, max_length=255)
+
+
+class GlossaryTermRead(BaseModel):
+    source_text: str
+    translated_text: str
+    custom: bool
+
+
+class GlossaryUpdateRequest(BaseModel):
+    terms: List[GlossaryTermWrite]
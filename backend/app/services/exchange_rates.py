@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_right, insort
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.domain import ExchangeRate
+
+Pair = Tuple[str, str]
+
+
+def to_utc_naive(moment: datetime) -> datetime:
+    """Normalize ``moment`` to the naive UTC datetimes stored in the database."""
+
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+    return moment
+
+
+@dataclass
+class ExchangeRateStats:
+    lookups: int = 0
+    misses: int = 0
+    reloads: int = 0
+    rates: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "rates": self.rates,
+        }
+
+
+class ExchangeRateIndex:
+    """In-memory copy of the ``exchange_rates`` table, sorted per currency pair.
+
+    ``rate`` answers "which rate was in effect at this moment" with a bisect
+    over the pair's effective-from timestamps and never touches the database.
+    ``sync`` reloads the index when the table has changed (one aggregate
+    query), and ``publish`` writes a rate and updates the index in place.
+    """
+
+    def __init__(self) -> None:
+        self._pairs: Dict[Pair, Tuple[List[datetime], List[float]]] = {}
+        self._fingerprint: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self.stats = ExchangeRateStats()
+
+    @staticmethod
+    def _pair(base_currency: str, quote_currency: str) -> Pair:
+        return base_currency.upper(), quote_currency.upper()
+
+    @staticmethod
+    def _table_fingerprint(session: Session) -> tuple:
+        return tuple(
+            session.query(
+                func.count(ExchangeRate.id),
+                func.max(ExchangeRate.id),
+                func.max(ExchangeRate.updated_at),
+            ).one()
+        )
+
+    def sync(self, session: Session) -> None:
+        """Reload from ``session`` if rates were added, changed or removed since the last load."""
+
+        fingerprint = self._table_fingerprint(session)
+        if fingerprint != self._fingerprint:
+            self.load(session, fingerprint=fingerprint)
+
+    def load(self, session: Session, *, fingerprint: Optional[tuple] = None) -> None:
+        pairs: Dict[Pair, Tuple[List[datetime], List[float]]] = {}
+        rows = session.query(
+            ExchangeRate.base_currency,
+            ExchangeRate.quote_currency,
+            ExchangeRate.effective_from,
+            ExchangeRate.rate,
+        ).order_by(ExchangeRate.effective_from)
+        for base, quote, effective_from, rate in rows:
+            times, rates = pairs.setdefault(self._pair(base, quote), ([], []))
+            times.append(effective_from)
+            rates.append(float(rate))
+        with self._lock:
+            self._pairs = pairs
+            self._fingerprint = fingerprint or self._table_fingerprint(session)
+            self.stats.reloads += 1
+            self.stats.rates = sum(len(times) for times, _ in pairs.values())
+
+    def rate(
+        self, base_currency: str, quote_currency: str, at: Optional[datetime] = None
+    ) -> Optional[float]:
+        """Rate in effect at ``at`` (default: now), or ``None`` before the first one."""
+
+        moment = to_utc_naive(at) if at is not None else datetime.utcnow()
+        entry = self._pairs.get(self._pair(base_currency, quote_currency))
+        found: Optional[float] = None
+        if entry is not None:
+            times, rates = entry
+            position = bisect_right(times, moment)
+            if position:
+                found = rates[position - 1]
+        with self._lock:
+            self.stats.lookups += 1
+            if found is None:
+                self.stats.misses += 1
+        return found
+
+    def history(self, base_currency: str, quote_currency: str) -> List[Tuple[datetime, float]]:
+        times, rates = self._pairs.get(self._pair(base_currency, quote_currency), ([], []))
+        return list(zip(times, rates))
+
+    def publish(
+        self,
+        session: Session,
+        base_currency: str,
+        quote_currency: str,
+        rate: float,
+        effective_from: Optional[datetime] = None,
+    ) -> ExchangeRate:
+        """Store a rate effective from ``effective_from`` (default: now) and index it.
+
+        Publishing again for the same pair and timestamp replaces that rate.
+        """
+
+        if rate <= 0:
+            raise ValueError("Exchange rate must be positive")
+        base, quote = self._pair(base_currency, quote_currency)
+        effective_from = to_utc_naive(effective_from or datetime.utcnow())
+        self.sync(session)
+        row = (
+            session.query(ExchangeRate)
+            .filter(
+                ExchangeRate.base_currency == base,
+                ExchangeRate.quote_currency == quote,
+                ExchangeRate.effective_from == effective_from,
+            )
+            .first()
+        )
+        if row is None:
+            row = ExchangeRate(base_currency=base, quote_currency=quote, effective_from=effective_from)
+            session.add(row)
+        row.rate = rate
+        session.commit()
+        session.refresh(row)
+
+        with self._lock:
+            times, rates = self._pairs.get((base, quote), ([], []))
+            times, rates = list(times), list(rates)
+            position = bisect_right(times, effective_from)
+            if position and times[position - 1] == effective_from:
+                rates[position - 1] = float(rate)
+            else:
+                insort(times, effective_from)
+                rates.insert(position, float(rate))
+            # Replace rather than mutate so concurrent readers see a consistent pair.
+            self._pairs = {**self._pairs, (base, quote): (times, rates)}
+            self._fingerprint = self._table_fingerprint(session)
+            self.stats.rates = sum(len(entry[0]) for entry in self._pairs.values())
+        return row
+
+
+_default_index: ExchangeRateIndex | None = None
+
+
+def get_exchange_rate_index() -> ExchangeRateIndex:
+    """Return the process-wide exchange-rate index."""
+
+    global _default_index
+    if _default_index is None:
+        _default_index = ExchangeRateIndex()
+    return _default_index
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 import csv
+import html
 import io
-from typing import List
+import re
+from collections import defaultdict
+from typing import Dict, List
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
-from app.models.domain import Product, ProductLocalizedInfo, ProductOption
-from app.services.pricing import PricingService
+from app.models.domain import (
+    Product,
+    ProductLocalizedInfo,
+    ProductOption,
+    ProductVariantDimension,
+)
+from app.services.image_mirror_service import mirrored_urls
+from app.services.product_variants import VariantLabels
+from app.services.shipping_rates import product_chargeable_weight
+from app.services.pricing import PricingEngine, get_pricing_engine
+from app.services.sale_prices import (
+    PriceOverrides,
+    is_current,
+    pricing_inputs_hash,
+    stored_sale_prices,
+)
 from app.config import settings
 from app.services.template_loader import (
     ChannelTemplate,
@@ -15,6 +32,13 @@ from app.services.template_loader import (
 )
 
 
+# A quoted src/href attribute value in description HTML.
+URL_ATTRIBUTE = re.compile(
+    r"""(?P<prefix>\b(?:src|href)\s*=\s*(?P<quote>["']))(?P<url>.*?)(?P=quote)""",
+    re.IGNORECASE,
+)
+
+
 class SmartStoreExporter:
     def __init__(
         self,
@@ -22,12 +46,14 @@ class SmartStoreExporter:
         locale: str | None = None,
         template_type: str = "default",
         template_loader: ChannelTemplateLoader | None = None,
+        pricing_engine: PricingEngine | None = None,
     ) -> None:
         self.template_config = template_config or {}
         self.locale = locale
         self.template_type = template_type
         self.template_loader = template_loader or ChannelTemplateLoader()
-        self.pricing = PricingService()
+        self.pricing_engine = pricing_engine or get_pricing_engine()
+        self.image_mirrors: dict[str, str] = {}
 
     def export_products(self, session: Session, product_ids: List[int]) -> io.StringIO:
         if not product_ids:
@@ -35,16 +61,42 @@ class SmartStoreExporter:
 
         template = self.template_loader.load("smartstore", self.template_type, session)
 
+        # Options and localizations are loaded with one batched query each
+        # instead of per product.
         products: List[Product] = (
-            session.query(Product).filter(Product.id.in_(product_ids)).all()
+            session.query(Product)
+            .filter(Product.id.in_(product_ids))
+            .options(selectinload(Product.options), selectinload(Product.localizations))
+            .all()
+        )
+
+        self.image_mirrors = mirrored_urls(
+            session,
+            (
+                url
+                for product in products
+                for url in [*(product.image_urls or []), *(product.detail_image_urls or [])]
+            ),
         )
 
+        dimensions: Dict[int, List[ProductVariantDimension]] = defaultdict(list)
+        for dimension in (
+            session.query(ProductVariantDimension)
+            .filter(ProductVariantDimension.product_id.in_(product_ids))
+            .options(selectinload(ProductVariantDimension.values))
+            .order_by(ProductVariantDimension.position)
+        ):
+            dimensions[dimension.product_id].append(dimension)
+
         output = io.StringIO()
         writer = csv.writer(output)
         writer.writerow([column.header for column in template.columns])
 
         target_locale = self._target_locale(template)
 
+        # (product, title, description, option, labels) per CSV row; prices for
+        # every row are computed in one vectorized pass before writing.
+        pending: List[tuple] = []
         for product in products:
             localizations: List[ProductLocalizedInfo] = list(product.localizations)
             localized = next(
@@ -57,37 +109,78 @@ class SmartStoreExporter:
             description = self._pick_description(
                 product, localized, fallback_localized, localizations
             )
+            description = self._rewrite_image_urls(product, description)
             description = self._append_return_policy(description)
+            labels = VariantLabels(dimensions.get(product.id, []))
 
-            options: List[ProductOption] = (
-                session.query(ProductOption)
-                .filter(ProductOption.product_id == product.id)
-                .all()
-            )
+            options: List[ProductOption] = sorted(product.options, key=lambda opt: opt.id)
 
             if not options:
-                row = self._build_row(
-                    template,
-                    product,
-                    ko_title,
-                    description,
-                    option=None,
-                )
-                writer.writerow(row)
+                pending.append((product, ko_title, description, None, None))
             else:
                 for opt in options:
-                    row = self._build_row(
-                        template,
-                        product,
-                        ko_title,
-                        description,
-                        option=opt,
-                    )
-                    writer.writerow(row)
+                    pending.append((product, ko_title, description, opt, labels))
+
+        prices = self._sale_prices(session, pending)
+        for (product, title, description, option, labels), price in zip(pending, prices):
+            writer.writerow(
+                self._build_row(
+                    template, product, title, description, option, price, labels=labels
+                )
+            )
 
         output.seek(0)
         return output
 
+    def _sale_prices(self, session: Session, rows: List[tuple]) -> List[int]:
+        """Price every export row, reading materialized prices where still current.
+
+        Overrides are resolved once per product; rows without a current stored
+        price (new, changed, or priced with template overrides) are computed
+        in one vectorized pass.
+        """
+
+        self.pricing_engine.sync(session)
+        evaluator = self.pricing_engine.compiled("smartstore")
+        overrides: Dict[int, PriceOverrides] = {}
+        hashes: Dict[int, str] = {}
+        for product, *_ in rows:
+            if product.id not in overrides:
+                overrides[product.id] = (
+                    self._shipping_fee(product),
+                    self._margin(product),
+                    self._vat(product),
+                    self._exchange_rate(product),
+                    product_chargeable_weight(product),
+                )
+                hashes[product.id] = pricing_inputs_hash(
+                    evaluator, product.raw_price, overrides[product.id]
+                )
+        stored = stored_sale_prices(session, "smartstore", overrides)
+
+        prices: List[int] = [0] * len(rows)
+        live: List[tuple] = []
+        for index, (product, _title, _description, option, _labels) in enumerate(rows):
+            price_diff = float(option.raw_price_diff or 0) if option else 0.0
+            row = stored.get((product.id, option.id if option else None))
+            if is_current(row, hashes[product.id], price_diff):
+                prices[index] = row.sale_price
+            else:
+                live.append((index, float(product.raw_price), price_diff, overrides[product.id]))
+        if live:
+            computed = evaluator.prices(
+                [raw for _, raw, _, _ in live],
+                [diff for _, _, diff, _ in live],
+                shipping_fees=[columns[0] for *_, columns in live],
+                margin_rates=[columns[1] for *_, columns in live],
+                vat_rates=[columns[2] for *_, columns in live],
+                exchange_rates=[columns[3] for *_, columns in live],
+                weights_kg=[columns[4] for *_, columns in live],
+            ).tolist()
+            for (index, *_), price in zip(live, computed):
+                prices[index] = price
+        return prices
+
     def _pick_title(
         self,
         product: Product,
@@ -125,9 +218,38 @@ class SmartStoreExporter:
 
     def _primary_image(self, product: Product) -> str:
         if product.image_urls:
-            return product.image_urls[0]
+            return self.image_mirrors.get(product.image_urls[0], product.image_urls[0])
         return ""
 
+    def _rewrite_image_urls(self, product: Product, description: str) -> str:
+        """Swap mirrored URLs into ``src``/``href`` values that match them exactly."""
+
+        mirrors = {
+            url: self.image_mirrors[url]
+            for url in product.detail_image_urls or []
+            if url in self.image_mirrors
+        }
+        if not mirrors or not description:
+            return description
+
+        def replace(match: re.Match) -> str:
+            mirrored = mirrors.get(html.unescape(match.group("url")))
+            if mirrored is None:
+                return match.group(0)
+            return f"{match.group('prefix')}{html.escape(mirrored)}{match.group('quote')}"
+
+        return URL_ATTRIBUTE.sub(replace, description)
+
+    def _option_name(self, option: ProductOption | None, labels: VariantLabels | None) -> str:
+        if not option:
+            return ""
+        return (labels and labels.option_name(option)) or "옵션"
+
+    def _option_value(self, option: ProductOption | None, labels: VariantLabels | None) -> str:
+        if not option:
+            return ""
+        return (labels and labels.option_value(option)) or option.localized_name or option.raw_name
+
     def _exchange_rate(self, product: Product) -> float | None:
         if product.exchange_rate is not None:
             return float(product.exchange_rate)
@@ -167,22 +289,15 @@ class SmartStoreExporter:
         title: str,
         description: str,
         option: ProductOption | None,
+        price: int,
+        labels: VariantLabels | None = None,
     ) -> list:
-        price = self.pricing.calculate_sale_price(
-            float(product.raw_price),
-            float(option.raw_price_diff or 0) if option else 0,
-            shipping_fee=self._shipping_fee(product),
-            margin_rate=self._margin(product),
-            vat_rate=self._vat(product),
-            exchange_rate=self._exchange_rate(product),
-        )
-
         row_context = {
             "title": title,
             "price": price,
             "stock": 0,
-            "option_name": "옵션" if option else "",
-            "option_value": (option.localized_name or option.raw_name) if option else "",
+            "option_name": self._option_name(option, labels),
+            "option_value": self._option_value(option, labels),
             "description": description,
             "primary_image": self._primary_image(product),
         }
@@ -0,0 +1,257 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import httpx
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.domain import ImageMirror, Product
+
+CONTENT_TYPE_EXTENSIONS = {
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/avif": ".avif",
+}
+
+
+class ContentAddressedStore:
+    """Store blobs on disk under their SHA-256 digest so duplicates share a file."""
+
+    def __init__(self, base_path: Path | str) -> None:
+        self.base_path = Path(base_path)
+
+    def relative_path(self, digest: str, extension: str) -> str:
+        return f"{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+    def put(self, data: bytes, extension: str) -> tuple[str, str, bool]:
+        """Write ``data`` and return ``(digest, relative_path, created)``."""
+
+        digest = hashlib.sha256(data).hexdigest()
+        relative = self.relative_path(digest, extension)
+        target = self.base_path / relative
+        if target.exists():
+            return digest, relative, False
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(tmp_name, target)
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        return digest, relative, True
+
+
+def public_base_url() -> Optional[str]:
+    """The configured absolute mirror base URL, or ``None`` when unset or relative.
+
+    Sales channels fetch images from outside, so a path like ``/media/images``
+    is not usable in exports.
+    """
+
+    base = settings.image_mirror_public_base_url
+    if not base:
+        return None
+    parsed = urlparse(base)
+    if parsed.scheme not in ("http", "https") or not parsed.netloc:
+        return None
+    return base.rstrip("/")
+
+
+def mirrored_paths(session: Session, source_urls: Iterable[str]) -> Dict[str, str]:
+    """Map each already-mirrored source URL to its stored file path (one query)."""
+
+    urls = {url for url in source_urls if url}
+    if not urls:
+        return {}
+    rows = (
+        session.query(ImageMirror.source_url, ImageMirror.file_path)
+        .filter(ImageMirror.source_url.in_(urls))
+        .all()
+    )
+    return dict(rows)
+
+
+def mirrored_urls(session: Session, source_urls: Iterable[str]) -> Dict[str, str]:
+    """Map each already-mirrored source URL to its public mirror URL (one query).
+
+    Empty when no absolute public base URL is configured.
+    """
+
+    base = public_base_url()
+    if base is None:
+        return {}
+    return {
+        source_url: f"{base}/{file_path}"
+        for source_url, file_path in mirrored_paths(session, source_urls).items()
+    }
+
+
+@dataclass
+class ImageMirrorResult:
+    requested: int = 0
+    already_mirrored: int = 0
+    downloaded: int = 0
+    deduplicated: int = 0
+    failed: int = 0
+
+
+@dataclass
+class _Download:
+    url: str
+    data: bytes
+    content_type: Optional[str]
+
+
+class ImageMirrorService:
+    """Download product images with bounded concurrency into a content-addressed store.
+
+    Images that hash to an existing file are recorded against that file instead
+    of being written again, so the same picture shared by several products (or
+    served from several CDN hosts) is stored once.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        store: Optional[ContentAddressedStore] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        self.session = session
+        self.store = store or ContentAddressedStore(settings.image_mirror_dir)
+        self.client = client
+        self.concurrency = concurrency or settings.image_mirror_concurrency
+
+    async def mirror_products(self, product_ids: Optional[List[int]] = None) -> ImageMirrorResult:
+        query = self.session.query(Product.image_urls, Product.detail_image_urls)
+        if product_ids:
+            query = query.filter(Product.id.in_(product_ids))
+        urls: List[str] = []
+        for image_urls, detail_image_urls in query.all():
+            urls.extend(image_urls or [])
+            urls.extend(detail_image_urls or [])
+        return await self.mirror_urls(urls)
+
+    async def mirror_urls(self, urls: Iterable[str]) -> ImageMirrorResult:
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        result = ImageMirrorResult(requested=len(unique_urls))
+        known = mirrored_paths(self.session, unique_urls)
+        pending = [url for url in unique_urls if url not in known]
+        result.already_mirrored = len(unique_urls) - len(pending)
+        if not pending:
+            return result
+
+        client = self.client or httpx.AsyncClient(
+            timeout=settings.image_mirror_timeout_seconds,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=self.concurrency),
+        )
+        semaphore = asyncio.Semaphore(self.concurrency)
+        try:
+            downloads = await asyncio.gather(
+                *(self._download(client, semaphore, url) for url in pending)
+            )
+        finally:
+            if self.client is None:
+                await client.aclose()
+
+        stored: List[tuple[ImageMirror, bool]] = []
+        for download in downloads:
+            if download is None:
+                result.failed += 1
+                continue
+            extension = self._extension(download.url, download.content_type)
+            digest, relative, created = self.store.put(download.data, extension)
+            row = ImageMirror(
+                source_url=download.url,
+                sha256=digest,
+                file_path=relative,
+                content_type=download.content_type,
+                size_bytes=len(download.data),
+            )
+            stored.append((row, created))
+
+        # Another run may have recorded some of these URLs while we downloaded.
+        recorded = mirrored_paths(self.session, (row.source_url for row, _ in stored))
+        fresh = [(row, created) for row, created in stored if row.source_url not in recorded]
+        result.already_mirrored += len(stored) - len(fresh)
+        self.session.add_all(row for row, _ in fresh)
+        try:
+            self.session.commit()
+            inserted = fresh
+        except IntegrityError:
+            # Lost a race on the unique source_url; insert one by one and keep
+            # whichever row the other run wrote.
+            self.session.rollback()
+            inserted = []
+            for row, created in fresh:
+                self.session.add(self._detached_copy(row))
+                try:
+                    self.session.commit()
+                    inserted.append((row, created))
+                except IntegrityError:
+                    self.session.rollback()
+                    result.already_mirrored += 1
+        for _, created in inserted:
+            if created:
+                result.downloaded += 1
+            else:
+                result.deduplicated += 1
+        return result
+
+    @staticmethod
+    def _detached_copy(row: ImageMirror) -> ImageMirror:
+        return ImageMirror(
+            source_url=row.source_url,
+            sha256=row.sha256,
+            file_path=row.file_path,
+            content_type=row.content_type,
+            size_bytes=row.size_bytes,
+        )
+
+    async def _download(
+        self, client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str
+    ) -> Optional[_Download]:
+        limit = settings.image_mirror_max_bytes
+        async with semaphore:
+            try:
+                async with client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    content_type = (
+                        (response.headers.get("content-type") or "").split(";")[0].strip()
+                    )
+                    if content_type and not content_type.startswith("image/"):
+                        return None
+                    declared = response.headers.get("content-length")
+                    if declared and declared.isdigit() and int(declared) > limit:
+                        return None
+                    # Stop reading as soon as the body passes the size cap.
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body.extend(chunk)
+                        if len(body) > limit:
+                            return None
+            except httpx.HTTPError:
+                return None
+        return _Download(url=url, data=bytes(body), content_type=content_type or None)
+
+    def _extension(self, url: str, content_type: Optional[str]) -> str:
+        if content_type in CONTENT_TYPE_EXTENSIONS:
+            return CONTENT_TYPE_EXTENSIONS[content_type]
+        suffix = Path(urlparse(url).path).suffix.lower()
+        return suffix if suffix in set(CONTENT_TYPE_EXTENSIONS.values()) | {".jpeg"} else ".img"
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Optional
+
+from app.config import settings
+from app.models.domain import Product, ProductRawPayload
+
+SUPPORTED_CODECS = ("zlib", "zstd")
+
+
+def _zstd():
+    try:
+        import zstandard  # type: ignore
+    except ImportError as exc:  # pragma: no cover - optional dependency
+        raise ValueError(
+            "zstandard is required for the zstd payload archive codec. Install zstandard to continue"
+        ) from exc
+    return zstandard
+
+
+def _encode(payload: Any) -> bytes:
+    return json.dumps(
+        payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def compress_payload(payload: Any, codec: Optional[str] = None) -> tuple[str, bytes]:
+    return _compress(_encode(payload), codec)
+
+
+def _compress(raw: bytes, codec: Optional[str]) -> tuple[str, bytes]:
+    codec = (codec or settings.payload_archive_codec).lower()
+    if codec == "zlib":
+        return codec, zlib.compress(raw, 9)
+    if codec == "zstd":
+        return codec, _zstd().ZstdCompressor(level=10).compress(raw)
+    raise ValueError(f"Unsupported payload archive codec: {codec}")
+
+
+def decompress_payload(codec: str, blob: bytes) -> Any:
+    """Decode an archived payload; a corrupt or truncated blob raises ``ValueError``."""
+
+    if codec == "zlib":
+        try:
+            raw = zlib.decompress(blob)
+        except zlib.error as exc:
+            raise ValueError(f"Archived payload could not be decompressed: {exc}") from exc
+    elif codec == "zstd":
+        zstandard = _zstd()
+        try:
+            raw = zstandard.ZstdDecompressor().decompress(blob)
+        except zstandard.ZstdError as exc:
+            raise ValueError(f"Archived payload could not be decompressed: {exc}") from exc
+    else:
+        raise ValueError(f"Unsupported payload archive codec: {codec}")
+    # Undecodable text and malformed JSON raise ``ValueError`` subclasses.
+    return json.loads(raw.decode("utf-8"))
+
+
+def store_raw_payload(
+    product: Product, payload: Any, *, fetched_at: Optional[datetime] = None
+) -> bool:
+    """Attach ``payload`` to ``product``, replacing any previous archive.
+
+    Returns ``False`` without writing when the archived payload is identical.
+    """
+
+    raw = _encode(payload)
+    content_hash = hashlib.sha256(raw).hexdigest()
+    archive = product.raw_payload
+    if archive is not None and archive.content_hash == content_hash:
+        return False
+    codec, blob = _compress(raw, None)
+    archive = archive or ProductRawPayload()
+    archive.codec = codec
+    archive.payload = blob
+    archive.content_hash = content_hash
+    archive.fetched_at = fetched_at or datetime.utcnow()
+    product.raw_payload = archive
+    return True
+
+
+def load_raw_payload(product: Product) -> Optional[Any]:
+    archive = product.raw_payload
+    if archive is None:
+        return None
+    return decompress_payload(archive.codec, archive.payload)
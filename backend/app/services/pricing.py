@@ -1,30 +1,414 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import json
+import threading
+from dataclasses import dataclass, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from sqlalchemy.orm import Session
 
 from app.config import settings
+from app.services.exchange_rates import ExchangeRateIndex, get_exchange_rate_index
+from app.services.shipping_rates import (
+    ShippingRateIndex,
+    ShippingTiers,
+    get_shipping_rate_index,
+)
+
+# A column of per-row values; ``None``/NaN entries in override columns fall
+# back to the channel default.
+Column = Union[Sequence[Optional[float]], np.ndarray]
+
+DEFAULT_CHANNEL = "default"
+# Raw prices are in the source-market currency; sale prices are in won.
+SOURCE_CURRENCY = "CNY"
+SALE_CURRENCY = "KRW"
+
+
+@dataclass(frozen=True)
+class PricingRules:
+    """Declared pricing rules of one sales channel.
+
+    ``margin_rate`` and ``vat_rate`` are percentages; the sale price is
+    ``((raw + option diff) * exchange_rate + delivery_fee) * (1 + margin%)``,
+    times ``(1 + VAT%)`` when ``include_vat`` is set, rounded half-to-even to
+    ``rounding_step`` won and raised to ``minimum_price``. Fields a channel
+    does not declare come from the environment settings; an undeclared
+    ``exchange_rate`` follows the published exchange-rate table.
+    """
+
+    channel: str = DEFAULT_CHANNEL
+    exchange_rate: Optional[float] = None
+    margin_rate: float = settings.default_margin
+    vat_rate: float = settings.vat_rate
+    include_vat: bool = True
+    delivery_fee: float = settings.default_delivery
+    rounding_step: float = 10.0
+    minimum_price: float = 0.0
+
+    @classmethod
+    def defaults(cls, channel: str = DEFAULT_CHANNEL) -> "PricingRules":
+        return cls(
+            channel=channel,
+            margin_rate=settings.default_margin,
+            vat_rate=settings.vat_rate,
+            delivery_fee=settings.default_delivery,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict, *, channel: str) -> "PricingRules":
+        if not isinstance(data, dict):
+            raise ValueError(f"Pricing rules for {channel} must be a mapping of settings")
+        known = {field.name for field in fields(cls)} - {"channel"}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(
+                f"Pricing rules for {channel} have unknown keys: {', '.join(sorted(unknown))}"
+            )
+        values: dict = {}
+        for key, value in data.items():
+            if key == "include_vat":
+                if not isinstance(value, bool):
+                    raise ValueError(f"Pricing rules for {channel}: include_vat must be true/false")
+                values[key] = value
+                continue
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+                raise ValueError(f"Pricing rules for {channel}: {key} must be a non-negative number")
+            values[key] = float(value)
+        if values.get("rounding_step", 10.0) <= 0:
+            raise ValueError(f"Pricing rules for {channel}: rounding_step must be positive")
+        base = cls.defaults(channel)
+        return cls(**{**{field.name: getattr(base, field.name) for field in fields(cls)}, **values})
+
+    def compile(
+        self, exchange_rate: Optional[float] = None, shipping: Optional[ShippingTiers] = None
+    ) -> "CompiledPricing":
+        """Build an evaluator; ``exchange_rate`` applies when the rules declare none."""
+
+        return CompiledPricing(self, exchange_rate, shipping)
+
+
+class CompiledPricing:
+    """Evaluator for one rule set, with its constant factors precomputed.
+
+    ``price`` (one row) and ``prices`` (NumPy columns) run the same operations
+    in the same order, so they agree to the won. A row's delivery fee is its
+    explicit shipping fee, else the shipping tier of its chargeable weight,
+    else the channel's ``delivery_fee``.
+    """
+
+    def __init__(
+        self,
+        rules: PricingRules,
+        exchange_rate: Optional[float] = None,
+        shipping: Optional[ShippingTiers] = None,
+    ) -> None:
+        self.rules = rules
+        self.shipping = shipping or ShippingTiers()
+        if rules.exchange_rate is not None:
+            exchange_rate = rules.exchange_rate
+        self.exchange_rate = float(
+            exchange_rate if exchange_rate is not None else settings.exchange_rate
+        )
+        self.delivery_fee = float(rules.delivery_fee)
+        self.margin_factor = 1 + float(rules.margin_rate) / 100
+        self.vat_factor = 1 + float(rules.vat_rate) / 100 if rules.include_vat else 1.0
+        self.include_vat = rules.include_vat
+        self.step = float(rules.rounding_step)
+        self.minimum_price = float(rules.minimum_price)
+        # Everything a price depends on besides the per-row inputs.
+        self.fingerprint = (
+            self.exchange_rate,
+            self.delivery_fee,
+            self.margin_factor,
+            self.vat_factor,
+            self.step,
+            self.minimum_price,
+            self.shipping.max_weights,
+            self.shipping.fees,
+        )
+
+    def price(
+        self,
+        raw_price_cny: float,
+        option_price_diff_cny: float = 0,
+        *,
+        shipping_fee: float | None = None,
+        margin_rate: float | None = None,
+        vat_rate: float | None = None,
+        exchange_rate: float | None = None,
+        weight_kg: float | None = None,
+    ) -> int:
+        rate = float(exchange_rate) if exchange_rate is not None else self.exchange_rate
+        delivery_fee = shipping_fee
+        if delivery_fee is None:
+            delivery_fee = self.shipping.fee(weight_kg)
+        delivery_fee = float(delivery_fee) if delivery_fee is not None else self.delivery_fee
+        margin_factor = (
+            1 + float(margin_rate) / 100 if margin_rate is not None else self.margin_factor
+        )
+        vat_factor = self.vat_factor
+        if vat_rate is not None and self.include_vat:
+            vat_factor = 1 + float(vat_rate) / 100
+
+        base_cost_krw = (float(raw_price_cny) + float(option_price_diff_cny)) * rate
+        subtotal = base_cost_krw + delivery_fee
+        final_price = subtotal * margin_factor * vat_factor
+        rounded = round(final_price / self.step) * self.step
+        return int(max(rounded, self.minimum_price))
+
+    def prices(
+        self,
+        raw_prices_cny: Column,
+        option_price_diffs_cny: Column | None = None,
+        *,
+        shipping_fees: Column | None = None,
+        margin_rates: Column | None = None,
+        vat_rates: Column | None = None,
+        exchange_rates: Column | None = None,
+        weights_kg: Column | None = None,
+    ) -> np.ndarray:
+        base = np.asarray(raw_prices_cny, dtype=np.float64)
+        size = base.shape[0]
+        diffs = _column(option_price_diffs_cny, size)
+        diffs = np.where(np.isnan(diffs), 0.0, diffs)
+        rate = _filled(exchange_rates, self.exchange_rate, size)
+        delivery_fee = _column(shipping_fees, size)
+        if self.shipping and weights_kg is not None:
+            tiered = self.shipping.fees_for(_column(weights_kg, size))
+            delivery_fee = np.where(np.isnan(delivery_fee), tiered, delivery_fee)
+        delivery_fee = np.where(np.isnan(delivery_fee), self.delivery_fee, delivery_fee)
+        margin_factor = _factor(margin_rates, self.margin_factor, size)
+        vat_factor = (
+            _factor(vat_rates, self.vat_factor, size)
+            if self.include_vat
+            else np.full(size, 1.0)
+        )
+
+        base_cost_krw = (base + diffs) * rate
+        subtotal = base_cost_krw + delivery_fee
+        final_price = subtotal * margin_factor * vat_factor
+        rounded = np.round(final_price / self.step) * self.step
+        return np.maximum(rounded, self.minimum_price).astype(np.int64)
+
+
+def _column(values: Column | None, size: int) -> np.ndarray:
+    if values is None:
+        return np.full(size, np.nan)
+    column = np.asarray(values, dtype=np.float64)
+    if column.shape != (size,):
+        raise ValueError(f"Pricing column has {column.shape[0]} rows, expected {size}")
+    return column
+
+
+def _filled(values: Column | None, default: float, size: int) -> np.ndarray:
+    column = _column(values, size)
+    return np.where(np.isnan(column), default, column)
+
+
+def _factor(percentages: Column | None, default_factor: float, size: int) -> np.ndarray:
+    column = _column(percentages, size)
+    return np.where(np.isnan(column), default_factor, 1 + column / 100)
+
+
+class PricingRuleLoader:
+    """Read channel rules from ``config/pricing_rules/<channel>.json``.
+
+    Channels without a file use the environment defaults.
+    """
+
+    def __init__(self, base_path: Optional[Path] = None) -> None:
+        self.base_path = base_path or (
+            Path(__file__).resolve().parents[2] / "config" / "pricing_rules"
+        )
+
+    def load(self, channel: str) -> PricingRules:
+        channel = channel.lower()
+        path = self.base_path / f"{channel}.json"
+        if not path.exists():
+            return PricingRules.defaults(channel)
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Pricing rules {path.name} could not be parsed: {exc}") from exc
+        return PricingRules.from_dict(data, channel=channel)
+
+
+class PricingEngine:
+    """The single pricing hot path: per-channel rules compiled once and cached.
+
+    Exporters and repricing jobs ask for ``compiled(channel)`` and price rows
+    through it. Channels without a declared exchange rate use the CNY/KRW rate
+    in effect at ``at`` (default: now) from the exchange-rate index, falling
+    back to ``settings.exchange_rate``, and the current shipping tiers.
+    Evaluators are cached per channel, rate and tier table, so publishing a
+    rate or tiers needs no invalidation. ``invalidate`` drops cached rules
+    after a rule change.
+    """
+
+    def __init__(
+        self,
+        loader: Optional[PricingRuleLoader] = None,
+        rates: Optional[ExchangeRateIndex] = None,
+        shipping: Optional[ShippingRateIndex] = None,
+    ) -> None:
+        self.loader = loader or PricingRuleLoader()
+        self.rates = rates or get_exchange_rate_index()
+        self.shipping = shipping or get_shipping_rate_index()
+        self._rules: Dict[str, PricingRules] = {}
+        self._compiled: Dict[tuple, CompiledPricing] = {}
+        self._lock = threading.Lock()
+
+    def rules(self, channel: str = DEFAULT_CHANNEL) -> PricingRules:
+        channel = channel.lower()
+        with self._lock:
+            rules = self._rules.get(channel)
+        if rules is None:
+            rules = self.loader.load(channel)
+            with self._lock:
+                self._rules[channel] = rules
+        return rules
+
+    def sync(self, session: Session) -> None:
+        """Reload exchange rates and shipping tiers if their tables changed."""
+
+        self.rates.sync(session)
+        self.shipping.sync(session)
+
+    def exchange_rate(self, at: Optional[datetime] = None) -> Optional[float]:
+        """Published source-to-won rate in effect at ``at``, if any."""
+
+        return self.rates.rate(SOURCE_CURRENCY, SALE_CURRENCY, at)
+
+    def compiled(
+        self, channel: str = DEFAULT_CHANNEL, at: Optional[datetime] = None
+    ) -> CompiledPricing:
+        rules = self.rules(channel)
+        rate = rules.exchange_rate
+        if rate is None:
+            rate = self.exchange_rate(at)
+        shipping = self.shipping.tiers
+        key = (rules.channel, rate, shipping)
+        with self._lock:
+            evaluator = self._compiled.get(key)
+        if evaluator is None:
+            evaluator = rules.compile(rate, shipping)
+            with self._lock:
+                self._compiled[key] = evaluator
+        return evaluator
+
+    def price(
+        self,
+        channel: str,
+        raw_price_cny: float,
+        option_price_diff_cny: float = 0,
+        **overrides,
+    ) -> int:
+        return self.compiled(channel).price(raw_price_cny, option_price_diff_cny, **overrides)
+
+    def prices(
+        self,
+        channel: str,
+        raw_prices_cny: Column,
+        option_price_diffs_cny: Column | None = None,
+        **overrides,
+    ) -> np.ndarray:
+        return self.compiled(channel).prices(raw_prices_cny, option_price_diffs_cny, **overrides)
+
+    def invalidate(self, channel: Optional[str] = None) -> None:
+        with self._lock:
+            if channel is None:
+                self._rules.clear()
+                self._compiled.clear()
+            else:
+                channel = channel.lower()
+                self._rules.pop(channel, None)
+                for key in [key for key in self._compiled if key[0] == channel]:
+                    del self._compiled[key]
+
+
+_default_engine: PricingEngine | None = None
+
+
+def get_pricing_engine() -> PricingEngine:
+    """Return the process-wide pricing engine."""
+
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = PricingEngine()
+    return _default_engine
 
 
 @dataclass
 class PricingContext:
-    """Configuration driving sale price calculations."""
+    """Configuration driving sale price calculations.
 
-    exchange_rate: float = settings.exchange_rate
+    ``exchange_rate`` of ``None`` uses the published CNY/KRW rate in effect
+    when a price is calculated.
+    """
+
+    exchange_rate: Optional[float] = None
     default_margin: float = settings.default_margin
     vat_rate: float = settings.vat_rate
     default_delivery: float = settings.default_delivery
 
+    def rules(self) -> PricingRules:
+        return PricingRules(
+            exchange_rate=self.exchange_rate,
+            margin_rate=self.default_margin,
+            vat_rate=self.vat_rate,
+            delivery_fee=self.default_delivery,
+        )
+
 
 class PricingService:
     """Calculate sale prices based on cost, shipping, margin, and VAT.
 
-    The defaults are sourced from environment variables, but each call can
-    override the values when channel-specific rules are needed.
+    A thin wrapper that compiles a ``PricingContext`` into the shared pricing
+    engine evaluator; each call can still override the values per row. The
+    published rate and shipping tiers are resolved when pricing, and the
+    evaluator is recompiled only when they changed. Pass ``session`` (or call
+    ``sync``) to reload the indexes from the database first.
     """
 
-    def __init__(self, context: Optional[PricingContext] = None) -> None:
+    def __init__(
+        self,
+        context: Optional[PricingContext] = None,
+        *,
+        session: Optional[Session] = None,
+        rates: Optional[ExchangeRateIndex] = None,
+        shipping: Optional[ShippingRateIndex] = None,
+    ) -> None:
         self.context = context or PricingContext()
+        self.rates = rates or get_exchange_rate_index()
+        self.shipping = shipping or get_shipping_rate_index()
+        self._rules = self.context.rules()
+        self._compiled: Optional[Tuple[tuple, CompiledPricing]] = None
+        if session is not None:
+            self.sync(session)
+
+    def sync(self, session: Session) -> None:
+        """Reload exchange rates and shipping tiers if their tables changed."""
+
+        self.rates.sync(session)
+        self.shipping.sync(session)
+
+    @property
+    def compiled(self) -> CompiledPricing:
+        rate = self._rules.exchange_rate
+        if rate is None:
+            rate = self.rates.rate(SOURCE_CURRENCY, SALE_CURRENCY)
+        key = (rate, self.shipping.tiers)
+        cached = self._compiled
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        evaluator = self._rules.compile(*key)
+        self._compiled = (key, evaluator)
+        return evaluator
 
     def calculate_sale_price(
         self,
@@ -35,15 +419,42 @@ class PricingService:
         margin_rate: float | None = None,
         vat_rate: float | None = None,
         exchange_rate: float | None = None,
+        weight_kg: float | None = None,
     ) -> float:
-        ctx = self.context
-        rate = exchange_rate if exchange_rate is not None else ctx.exchange_rate
-        margin = margin_rate if margin_rate is not None else ctx.default_margin
-        vat = vat_rate if vat_rate is not None else ctx.vat_rate
-        delivery_fee = shipping_fee if shipping_fee is not None else ctx.default_delivery
+        return self.compiled.price(
+            raw_price_cny,
+            option_price_diff_cny,
+            shipping_fee=shipping_fee,
+            margin_rate=margin_rate,
+            vat_rate=vat_rate,
+            exchange_rate=exchange_rate,
+            weight_kg=weight_kg,
+        )
 
-        base_cost_krw = (float(raw_price_cny) + float(option_price_diff_cny)) * rate
-        subtotal = base_cost_krw + float(delivery_fee)
-        with_margin = subtotal * (1 + float(margin) / 100)
-        final_price = with_margin * (1 + float(vat) / 100)
-        return round(final_price / 10) * 10
+    def calculate_sale_prices(
+        self,
+        raw_prices_cny: Column,
+        option_price_diffs_cny: Column | None = None,
+        *,
+        shipping_fees: Column | None = None,
+        margin_rates: Column | None = None,
+        vat_rates: Column | None = None,
+        exchange_rates: Column | None = None,
+        weights_kg: Column | None = None,
+    ) -> np.ndarray:
+        """Vectorized ``calculate_sale_price`` over columns of rows.
+
+        Every column has one entry per row. Override columns may be omitted
+        or hold ``None``/NaN for rows that use the context default. Results
+        match the scalar path exactly; returns an ``int64`` array.
+        """
+
+        return self.compiled.prices(
+            raw_prices_cny,
+            option_price_diffs_cny,
+            shipping_fees=shipping_fees,
+            margin_rates=margin_rates,
+            vat_rates=vat_rates,
+            exchange_rates=exchange_rates,
+            weights_kg=weights_kg,
+        )
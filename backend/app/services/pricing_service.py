@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+from app.services.pricing import PricingRules
+
 
 @dataclass
 class PricingInputs:
@@ -14,7 +16,16 @@ class PricingInputs:
 
 
 class PricingService:
-    """Utility to calculate a sale price from cost components."""
+    """Utility to calculate a sale price from cost components.
+
+    Runs on the shared pricing engine evaluator; ``PricingInputs`` carries
+    margin and VAT as fractions, which are converted to the engine's
+    percentages.
+    """
+
+    def __init__(self) -> None:
+        self._with_vat = PricingRules(include_vat=True).compile()
+        self._without_vat = PricingRules(include_vat=False).compile()
 
     def calculate_sale_price(self, inputs: PricingInputs) -> float:
         """
@@ -27,9 +38,11 @@ class PricingService:
         4. Optionally apply VAT.
         """
 
-        cost_krw = inputs.base_price * inputs.exchange_rate
-        landed_cost = cost_krw + inputs.shipping_fee
-        with_margin = landed_cost * (1 + inputs.margin_rate)
-        if inputs.include_vat:
-            with_margin *= 1 + inputs.vat_rate
-        return round(with_margin / 10) * 10
+        evaluator = self._with_vat if inputs.include_vat else self._without_vat
+        return evaluator.price(
+            inputs.base_price,
+            shipping_fee=inputs.shipping_fee,
+            margin_rate=inputs.margin_rate * 100,
+            vat_rate=inputs.vat_rate * 100,
+            exchange_rate=inputs.exchange_rate,
+        )
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, replace
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.domain import Order, OrderItem, Product, ProductOption
+from app.services.pricing import CompiledPricing, PricingEngine, get_pricing_engine
+from app.services.shipping_rates import chargeable_weights
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class PricingColumns:
+    """Pricing inputs of many rows as NumPy columns; ``None`` overrides become NaN."""
+
+    def __init__(self, rows: Iterable[tuple]) -> None:
+        # (product_id, raw_price, price_diff, shipping_fee, margin_rate, vat_rate,
+        #  exchange_rate, weight_kg, length_cm, width_cm, height_cm)
+        matrix = np.array(
+            [[np.nan if value is None else float(value) for value in row] for row in rows],
+            dtype=np.float64,
+        ).reshape(-1, 11)
+        self.product_ids = matrix[:, 0].astype(np.int64)
+        self.raw_prices = matrix[:, 1]
+        self.price_diffs = matrix[:, 2]
+        self.shipping_fees = matrix[:, 3]
+        self.margin_rates = matrix[:, 4]
+        self.vat_rates = matrix[:, 5]
+        self.exchange_rates = matrix[:, 6]
+        self.weights = chargeable_weights(*matrix[:, 7:11].T)
+
+    def __len__(self) -> int:
+        return len(self.product_ids)
+
+    def price(self, evaluator: CompiledPricing) -> np.ndarray:
+        return evaluator.prices(
+            self.raw_prices,
+            self.price_diffs,
+            shipping_fees=self.shipping_fees,
+            margin_rates=self.margin_rates,
+            vat_rates=self.vat_rates,
+            exchange_rates=self.exchange_rates,
+            weights_kg=self.weights,
+        )
+
+
+def _distribution(prices: np.ndarray) -> dict:
+    if not len(prices):
+        return {"count": 0, "min": 0, "max": 0, "mean": 0.0, "total": 0, "percentiles": {}}
+    return {
+        "count": int(len(prices)),
+        "min": int(prices.min()),
+        "max": int(prices.max()),
+        "mean": round(float(prices.mean()), 2),
+        "total": int(prices.sum()),
+        "percentiles": {
+            f"p{percentile}": float(value)
+            for percentile, value in zip(PERCENTILES, np.percentile(prices, PERCENTILES))
+        },
+    }
+
+
+class PricingSimulator:
+    """Price the whole catalog under candidate channel rules, in memory.
+
+    Loads every option (and option-less product) with column queries, prices
+    them under the channel's current rules and under the candidate rules on
+    the vectorized path, and aggregates the difference. Recent order items are
+    repriced the same way for revenue deltas. Nothing is written.
+    """
+
+    def __init__(self, session: Session, *, engine: PricingEngine | None = None) -> None:
+        self.session = session
+        self.engine = engine or get_pricing_engine()
+
+    def simulate(
+        self,
+        channel: str,
+        changes: dict,
+        *,
+        thresholds: Iterable[float] = (),
+        order_days: int = 30,
+        now: Optional[datetime] = None,
+    ) -> dict:
+        started = time.perf_counter()
+        self.engine.sync(self.session)
+        baseline = self.engine.compiled(channel)
+        candidate = replace(baseline.rules, **changes).compile(
+            baseline.exchange_rate, baseline.shipping
+        )
+
+        catalog = self._catalog()
+        before, after = catalog.price(baseline), catalog.price(candidate)
+        delta = after - before
+
+        return {
+            "channel": baseline.rules.channel,
+            "baseline_rules": {**asdict(baseline.rules), "exchange_rate": baseline.exchange_rate},
+            "candidate_rules": {**asdict(candidate.rules), "exchange_rate": candidate.exchange_rate},
+            "rows": len(catalog),
+            "products": int(len(np.unique(catalog.product_ids))),
+            "baseline": _distribution(before),
+            "candidate": _distribution(after),
+            "changes": {
+                "increased": int((delta > 0).sum()),
+                "decreased": int((delta < 0).sum()),
+                "unchanged": int((delta == 0).sum()),
+                "mean_delta": round(float(delta.mean()), 2) if len(delta) else 0.0,
+            },
+            "thresholds": [
+                self._threshold(float(threshold), catalog.product_ids, before, after)
+                for threshold in sorted(thresholds)
+            ],
+            "revenue": self._revenue(baseline, candidate, order_days, now or datetime.utcnow()),
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+    def _catalog(self) -> PricingColumns:
+        product_columns = (
+            Product.raw_price,
+            Product.shipping_fee,
+            Product.margin_rate,
+            Product.vat_rate,
+            Product.exchange_rate,
+            Product.weight_kg,
+            Product.length_cm,
+            Product.width_cm,
+            Product.height_cm,
+        )
+        options = (
+            self.session.query(Product.id, ProductOption.raw_price_diff, *product_columns)
+            .join(ProductOption, ProductOption.product_id == Product.id)
+            .all()
+        )
+        plain = (
+            self.session.query(Product.id, *product_columns)
+            .outerjoin(ProductOption, ProductOption.product_id == Product.id)
+            .filter(ProductOption.id.is_(None))
+            .all()
+        )
+        return PricingColumns(
+            [
+                *((product_id, raw, diff or 0, *rest) for product_id, diff, raw, *rest in options),
+                *((product_id, raw, 0, *rest) for product_id, raw, *rest in plain),
+            ]
+        )
+
+    @staticmethod
+    def _threshold(
+        threshold: float, product_ids: np.ndarray, before: np.ndarray, after: np.ndarray
+    ) -> dict:
+        crossed_up = (before < threshold) & (after >= threshold)
+        crossed_down = (before >= threshold) & (after < threshold)
+        return {
+            "threshold": threshold,
+            "baseline_at_or_above": int((before >= threshold).sum()),
+            "candidate_at_or_above": int((after >= threshold).sum()),
+            "crossed_up_rows": int(crossed_up.sum()),
+            "crossed_down_rows": int(crossed_down.sum()),
+            "crossed_up_products": int(len(np.unique(product_ids[crossed_up]))),
+            "crossed_down_products": int(len(np.unique(product_ids[crossed_down]))),
+        }
+
+    def _revenue(
+        self,
+        baseline: CompiledPricing,
+        candidate: CompiledPricing,
+        order_days: int,
+        now: datetime,
+    ) -> dict:
+        items = (
+            self.session.query(
+                OrderItem.quantity,
+                OrderItem.unit_price_krw,
+                Product.id,
+                Product.raw_price,
+                ProductOption.raw_price_diff,
+                Product.shipping_fee,
+                Product.margin_rate,
+                Product.vat_rate,
+                Product.exchange_rate,
+                Product.weight_kg,
+                Product.length_cm,
+                Product.width_cm,
+                Product.height_cm,
+            )
+            .join(Order, OrderItem.order_id == Order.id)
+            .join(Product, OrderItem.product_id == Product.id)
+            .outerjoin(ProductOption, OrderItem.product_option_id == ProductOption.id)
+            .filter(Order.order_datetime >= now - timedelta(days=order_days))
+            .all()
+        )
+        quantities = np.array([quantity for quantity, *_ in items], dtype=np.int64)
+        actual = sum(float(unit_price) * quantity for quantity, unit_price, *_ in items)
+        columns = PricingColumns(
+            (product_id, raw, diff or 0, *rest)
+            for _, _, product_id, raw, diff, *rest in items
+        )
+        before = int((columns.price(baseline) * quantities).sum())
+        after = int((columns.price(candidate) * quantities).sum())
+        return {
+            "order_days": order_days,
+            "order_items": len(items),
+            "units": int(quantities.sum()),
+            "actual": round(actual, 2),
+            "baseline": before,
+            "candidate": after,
+            "delta": after - before,
+            "delta_pct": round((after - before) / before * 100, 2) if before else 0.0,
+        }
@@ -1,40 +1,92 @@
 from __future__ import annotations
 
-from sqlalchemy.orm import Session
+import asyncio
+from datetime import datetime
+from typing import Callable
+
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.models.domain import Product, ProductOption
+from app.services.payload_archive import store_raw_payload
+from app.services.product_sync_service import scraped_option_hash, scraped_product_hash
+from app.services.product_variants import sync_variant_matrix, variant_path
+from app.services.sale_prices import SalePriceRefresher
 from app.services.taobao_scraper import (
     ScrapeFailed,
     ScrapedOption,
     ScrapedProduct,
     TaobaoScraper,
 )
+from app.services.taobao_registry import get_taobao_registry
+
+
+# In-flight imports keyed by (source_site, canonical item id). Concurrent callers
+# for the same item await the leader's task instead of scraping again. The task
+# resolves to the new product's id.
+_inflight_imports: dict[tuple[str, str], asyncio.Task] = {}
 
 
 class ProductImportService:
+    """Scrape and store products, coalescing concurrent imports of one item.
+
+    The shared import runs on its own session from ``session_factory``
+    (default: a new session on the request session's engine) and commits
+    there, so it outlives a cancelled leader request whose session is closed.
+    Every caller then loads the product into its own session.
+    """
+
     def __init__(
         self,
         session: Session,
+        scrapers: dict[str, TaobaoScraper] | None = None,
+        *,
+        session_factory: Callable[[], Session] | None = None,
     ) -> None:
         self.session = session
-        self.scrapers = {
-            "TAOBAO": TaobaoScraper(source_site="TAOBAO"),
-            "1688": TaobaoScraper(
-                source_site="1688", item_source_market="CBU_MARKET"
-            ),
-        }
+        self.scrapers = scrapers or get_taobao_registry().scrapers()
+        self.session_factory = session_factory or sessionmaker(
+            bind=session.get_bind(), autocommit=False, autoflush=False
+        )
 
     async def import_product(self, source_url: str, source_site: str) -> Product:
         scraper = self.scrapers.get(source_site.upper())
         if not scraper:
             raise ValueError("Unsupported source_site")
 
-        existing = (
-            self.session.query(Product).filter(Product.source_url == source_url).first()
-        )
+        item_id = scraper.canonical_item_id(source_url)
+        candidate_urls = {source_url}
+        if item_id:
+            candidate_urls.add(scraper.canonical_url(item_id))
+
+        existing = self._find_existing(scraper.source_site, candidate_urls)
         if existing:
             return existing
 
+        key = (scraper.source_site, item_id or source_url)
+        task = _inflight_imports.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._scrape_and_persist(scraper, source_url))
+            _inflight_imports[key] = task
+            task.add_done_callback(lambda _: _inflight_imports.pop(key, None))
+
+        # Shield so a cancelled caller does not cancel the shared import.
+        product_id = await asyncio.shield(task)
+        product = self.session.get(Product, product_id)
+        if product is None:
+            raise ValueError("상품 정보를 불러오지 못했습니다. URL을 확인하고 다시 시도해주세요.")
+        return product
+
+    def _find_existing(self, source_site: str, source_urls: set[str]) -> Product | None:
+        return (
+            self.session.query(Product)
+            .filter(
+                Product.source_site == source_site,
+                Product.source_url.in_(source_urls),
+            )
+            .first()
+        )
+
+    async def _scrape_and_persist(self, scraper: TaobaoScraper, source_url: str) -> int:
         try:
             scraped: ScrapedProduct = await scraper.fetch_product(source_url)
         except ScrapeFailed as exc:
@@ -47,6 +99,16 @@ class ProductImportService:
                 ScrapedOption(option_key="default", raw_name="Default", raw_price_diff=0.0)
             ]
 
+        session = self.session_factory()
+        try:
+            return self._persist(session, scraped)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def _persist(self, session: Session, scraped: ScrapedProduct) -> int:
         product = Product(
             source_url=scraped.source_url,
             source_site=scraped.source_site,
@@ -55,9 +117,14 @@ class ProductImportService:
             raw_currency=scraped.currency,
             image_urls=scraped.image_urls,
             detail_image_urls=scraped.detail_image_urls,
+            content_hash=scraped_product_hash(scraped),
+            synced_at=datetime.utcnow(),
         )
-        self.session.add(product)
-        self.session.flush()
+        if scraped.raw_payload is not None:
+            store_raw_payload(product, scraped.raw_payload)
+        sync_variant_matrix(product, scraped.options)
+        session.add(product)
+        session.flush()
 
         for opt in scraped.options:
             option = ProductOption(
@@ -65,8 +132,12 @@ class ProductImportService:
                 option_key=opt.option_key,
                 raw_name=opt.raw_name,
                 raw_price_diff=opt.raw_price_diff or 0,
+                content_hash=scraped_option_hash(opt),
+                variant_path=variant_path(opt.variant),
             )
-            self.session.add(option)
+            session.add(option)
 
-        self.session.flush()
-        return product
+        # Commit before waking coalesced callers so their sessions can see the row.
+        session.commit()
+        SalePriceRefresher(session).refresh([product.id])
+        return product.id
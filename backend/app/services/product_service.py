@@ -4,6 +4,7 @@ from typing import List
 
 from app.models.domain import Product, ProductLocalizedInfo, ProductOption
 from app.repositories.product_repository import ProductRepository
+from app.services.sale_prices import SalePriceRefresher
 from app.schemas.product import (
     ProductCreate,
     ProductLocalizedInfoCreate,
@@ -26,6 +27,10 @@ class ProductService:
             margin_rate=payload.margin_rate,
             vat_rate=payload.vat_rate,
             shipping_fee=payload.shipping_fee,
+            weight_kg=payload.weight_kg,
+            length_cm=payload.length_cm,
+            width_cm=payload.width_cm,
+            height_cm=payload.height_cm,
             raw_description=payload.raw_description,
             thumbnail_image_urls=payload.thumbnail_image_urls,
             detail_image_urls=payload.detail_image_urls,
@@ -38,7 +43,11 @@ class ProductService:
                     raw_price_diff=option.raw_price_diff,
                 )
             )
-        return self.repo.add(product)
+        self.repo.add(product)
+        self.repo.session.flush()
+        SalePriceRefresher(self.repo.session).refresh([product.id])
+        self.repo.session.refresh(product)
+        return product
 
     def update_localization(
         self, product: Product, localization: ProductLocalizedInfoCreate
@@ -56,5 +65,6 @@ class ProductService:
         for field, value in payload.model_dump(exclude_unset=True).items():
             setattr(product, field, value)
         self.repo.session.flush()
+        SalePriceRefresher(self.repo.session).refresh([product.id])
         self.repo.session.refresh(product)
         return product
@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import or_
+from sqlalchemy.orm import Session, contains_eager, selectinload
+
+from app.config import settings
+from app.models.domain import Product, ProductOption
+from app.services.payload_archive import load_raw_payload, store_raw_payload
+from app.services.product_variants import sync_variant_matrix, variant_path
+from app.services.sale_prices import SalePriceRefresher
+from app.services.taobao_scraper import (
+    ScrapedOption,
+    ScrapedProduct,
+    ScrapeFailed,
+    TaobaoScraper,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _digest(payload: object) -> str:
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def scraped_product_hash(scraped: ScrapedProduct) -> str:
+    """Hash the product-level fields a re-sync may overwrite."""
+
+    return _digest(
+        {
+            "title": scraped.title,
+            "price": round(float(scraped.price or 0), 2),
+            "currency": scraped.currency,
+            "image_urls": list(scraped.image_urls),
+            "detail_image_urls": list(scraped.detail_image_urls),
+        }
+    )
+
+
+def scraped_option_hash(option: ScrapedOption) -> str:
+    payload = {
+        "option_key": option.option_key,
+        "raw_name": option.raw_name,
+        "raw_price_diff": round(float(option.raw_price_diff or 0), 2),
+    }
+    # Only hashed when present so options without dimensions keep their hash.
+    path = variant_path(option.variant)
+    if path:
+        payload["variant_path"] = path
+    return _digest(payload)
+
+
+@dataclass
+class ProductSyncResult:
+    checked: int = 0
+    unchanged: int = 0
+    products_updated: int = 0
+    options_updated: int = 0
+    options_added: int = 0
+    failed: int = 0
+
+    def merge(self, other: "ProductSyncResult") -> None:
+        for field_name, value in asdict(other).items():
+            setattr(self, field_name, getattr(self, field_name) + value)
+
+
+class ProductSyncService:
+    """Re-fetch stale products and persist only what changed upstream.
+
+    Stale products are processed in id-ordered batches; within a batch
+    scrapes run concurrently up to ``concurrency`` while database writes stay on
+    the caller's session. Each product and option carries a hash of its
+    normalized scraped payload, so rows whose hash matches are left untouched.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        scrapers: Dict[str, TaobaoScraper],
+        *,
+        concurrency: int | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.session = session
+        self.scrapers = scrapers
+        self.concurrency = concurrency or settings.product_sync_concurrency
+        self.batch_size = batch_size or settings.product_sync_batch_size
+
+    async def resync_stale(
+        self,
+        stale_after: timedelta,
+        *,
+        limit: int | None = None,
+        now: datetime | None = None,
+    ) -> ProductSyncResult:
+        now = now or datetime.utcnow()
+        cutoff = now - stale_after
+        result = ProductSyncResult()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        last_id = 0
+
+        while limit is None or result.checked < limit:
+            size = self.batch_size
+            if limit is not None:
+                size = min(size, limit - result.checked)
+            batch: List[Product] = (
+                self.session.query(Product)
+                .filter(
+                    Product.id > last_id,
+                    Product.source_site.in_(self.scrapers.keys()),
+                    or_(Product.synced_at.is_(None), Product.synced_at < cutoff),
+                )
+                .options(selectinload(Product.options), selectinload(Product.raw_payload))
+                .order_by(Product.id)
+                .limit(size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            scraped = await asyncio.gather(
+                *(self._fetch(product, semaphore) for product in batch)
+            )
+            changed: List[int] = []
+            for product, fetched in zip(batch, scraped):
+                result.checked += 1
+                if fetched is None:
+                    result.failed += 1
+                    continue
+                applied = self.apply(product, fetched, now=now)
+                if not applied.unchanged:
+                    changed.append(product.id)
+                result.merge(applied)
+            self.session.commit()
+            self._refresh_sale_prices(changed)
+
+        return result
+
+    def reparse_archived(self, *, limit: int | None = None) -> ProductSyncResult:
+        """Re-derive product and option fields from archived raw payloads.
+
+        No upstream calls are made: each archived response is run through the
+        current ``TaobaoScraper.parse_payload`` and applied with the same
+        hash comparison as a re-sync, so only rows whose parsed output changed
+        are written.
+        """
+
+        result = ProductSyncResult()
+        last_id = 0
+        while limit is None or result.checked < limit:
+            size = self.batch_size
+            if limit is not None:
+                size = min(size, limit - result.checked)
+            batch: List[Product] = (
+                self.session.query(Product)
+                .join(Product.raw_payload)
+                .filter(
+                    Product.id > last_id,
+                    Product.source_site.in_(self.scrapers.keys()),
+                )
+                .options(selectinload(Product.options), contains_eager(Product.raw_payload))
+                .order_by(Product.id)
+                .limit(size)
+                .all()
+            )
+            if not batch:
+                break
+            last_id = batch[-1].id
+
+            changed: List[int] = []
+            for product in batch:
+                result.checked += 1
+                scraper = self.scrapers[product.source_site.upper()]
+                num_iid = scraper.canonical_item_id(product.source_url) or ""
+                try:
+                    scraped = scraper.parse_payload(load_raw_payload(product), num_iid)
+                except (ScrapeFailed, ValueError):
+                    result.failed += 1
+                    continue
+                applied = self.apply(product, scraped, mark_synced=False)
+                if not applied.unchanged:
+                    changed.append(product.id)
+                result.merge(applied)
+            self.session.commit()
+            self._refresh_sale_prices(changed)
+
+        return result
+
+    def _refresh_sale_prices(self, product_ids: List[int]) -> None:
+        """Re-price products whose upstream price or options changed."""
+
+        if product_ids:
+            SalePriceRefresher(self.session).refresh(product_ids)
+
+    async def _fetch(
+        self, product: Product, semaphore: asyncio.Semaphore
+    ) -> Optional[ScrapedProduct]:
+        scraper = self.scrapers[product.source_site.upper()]
+        async with semaphore:
+            try:
+                return await scraper.fetch_product(product.source_url, refresh=True)
+            except Exception:
+                return None
+
+    def apply(
+        self,
+        product: Product,
+        scraped: ScrapedProduct,
+        *,
+        now: datetime | None = None,
+        mark_synced: bool = True,
+    ) -> ProductSyncResult:
+        """Write ``scraped`` onto ``product`` where hashes differ.
+
+        ``mark_synced=False`` leaves ``synced_at`` and the raw payload archive
+        alone, for offline re-parses that did not contact upstream.
+        """
+
+        result = ProductSyncResult()
+        product_hash = scraped_product_hash(scraped)
+        if product.content_hash != product_hash:
+            # Assign only fields that differ: rewriting an unchanged title
+            # would still mark it for retranslation.
+            if product.raw_title != scraped.title:
+                product.raw_title = scraped.title
+            if product.raw_price is None or float(product.raw_price) != float(scraped.price or 0):
+                product.raw_price = scraped.price
+            if product.raw_currency != scraped.currency:
+                product.raw_currency = scraped.currency
+            if list(product.image_urls or []) != list(scraped.image_urls):
+                product.image_urls = list(scraped.image_urls)
+            if list(product.detail_image_urls or []) != list(scraped.detail_image_urls):
+                product.detail_image_urls = list(scraped.detail_image_urls)
+            product.content_hash = product_hash
+            result.products_updated += 1
+
+        existing = {option.option_key: option for option in product.options}
+        for scraped_option in scraped.options:
+            option_hash = scraped_option_hash(scraped_option)
+            option = existing.get(scraped_option.option_key)
+            if option is None:
+                product.options.append(
+                    ProductOption(
+                        option_key=scraped_option.option_key,
+                        raw_name=scraped_option.raw_name,
+                        raw_price_diff=scraped_option.raw_price_diff or 0,
+                        content_hash=option_hash,
+                        variant_path=variant_path(scraped_option.variant),
+                    )
+                )
+                result.options_added += 1
+            elif option.content_hash != option_hash:
+                option.raw_name = scraped_option.raw_name
+                option.raw_price_diff = scraped_option.raw_price_diff or 0
+                option.variant_path = variant_path(scraped_option.variant)
+                option.content_hash = option_hash
+                result.options_updated += 1
+
+        if result.options_added or result.options_updated:
+            sync_variant_matrix(product, scraped.options)
+
+        if not (result.products_updated or result.options_updated or result.options_added):
+            result.unchanged += 1
+        # Options that disappeared upstream are kept: orders may still reference them.
+        if mark_synced:
+            product.synced_at = now or datetime.utcnow()
+            if scraped.raw_payload is not None:
+                store_raw_payload(product, scraped.raw_payload, fetched_at=product.synced_at)
+        return result
+
+
+async def run_product_sync_forever(
+    session_factory: Callable[[], Session],
+    scrapers_factory: Callable[[], Dict[str, TaobaoScraper]],
+    *,
+    interval_seconds: float,
+    stale_after: timedelta,
+) -> None:
+    """Periodically re-sync stale products until cancelled."""
+
+    while True:
+        session = session_factory()
+        try:
+            await ProductSyncService(session, scrapers_factory()).resync_stale(stale_after)
+        except Exception:
+            logger.exception("Product re-sync run failed; retrying in %ss", interval_seconds)
+            session.rollback()
+        finally:
+            session.close()
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional
+
+from app.models.domain import (
+    Product,
+    ProductOption,
+    ProductVariantDimension,
+    ProductVariantValue,
+)
+from app.services.taobao_scraper import ScrapedOption, ScrapedVariantValue
+
+VARIANT_LABEL_SEPARATOR = " / "
+
+
+def variant_path(variant: Iterable[ScrapedVariantValue]) -> Optional[str]:
+    """Encode a SKU's dimension values as a ``prop_path`` string."""
+
+    path = ";".join(f"{value.prop_id}:{value.value_id}" for value in variant)
+    return path or None
+
+
+def split_variant_path(path: str) -> List[tuple[str, str]]:
+    pairs = []
+    for part in path.split(";"):
+        prop_id, _, value_id = part.partition(":")
+        pairs.append((prop_id, value_id))
+    return pairs
+
+
+def sync_variant_matrix(product: Product, options: Iterable[ScrapedOption]) -> None:
+    """Upsert ``product``'s dimensions and values from scraped SKUs.
+
+    Each distinct ``prop_id`` becomes one dimension and each distinct
+    ``value_id`` within it one value, in first-seen order, so a color x size
+    grid is stored as ``len(colors) + len(sizes)`` names rather than one name
+    per SKU. Renamed dimensions/values lose their translation; values no longer
+    offered upstream are kept because existing options may still point at them.
+    """
+
+    dimensions = {dimension.prop_id: dimension for dimension in product.variant_dimensions}
+    values: Dict[ProductVariantDimension, Dict[str, ProductVariantValue]] = {
+        dimension: {value.value_id: value for value in dimension.values}
+        for dimension in product.variant_dimensions
+    }
+
+    for option in options:
+        for scraped in option.variant:
+            dimension = dimensions.get(scraped.prop_id)
+            if dimension is None:
+                dimension = ProductVariantDimension(
+                    prop_id=scraped.prop_id,
+                    raw_name=scraped.prop_name,
+                    position=len(dimensions),
+                )
+                product.variant_dimensions.append(dimension)
+                dimensions[scraped.prop_id] = dimension
+                values[dimension] = {}
+            elif dimension.raw_name != scraped.prop_name:
+                dimension.raw_name = scraped.prop_name
+                dimension.localized_name = None
+
+            dimension_values = values[dimension]
+            value = dimension_values.get(scraped.value_id)
+            if value is None:
+                value = ProductVariantValue(
+                    value_id=scraped.value_id,
+                    raw_name=scraped.value_name,
+                    position=len(dimension_values),
+                )
+                dimension.values.append(value)
+                dimension_values[scraped.value_id] = value
+            elif value.raw_name != scraped.value_name:
+                value.raw_name = scraped.value_name
+                value.localized_name = None
+
+
+class VariantLabels:
+    """Resolve options' ``variant_path`` to display names from a loaded matrix."""
+
+    def __init__(self, dimensions: Iterable[ProductVariantDimension]) -> None:
+        self.dimensions: Dict[str, ProductVariantDimension] = {}
+        self.values: Dict[tuple[str, str], ProductVariantValue] = {}
+        for dimension in dimensions:
+            self.dimensions[dimension.prop_id] = dimension
+            for value in dimension.values:
+                self.values[(dimension.prop_id, value.value_id)] = value
+
+    def option_name(self, option: ProductOption) -> Optional[str]:
+        if not option.variant_path:
+            return None
+        names = []
+        for prop_id, _ in split_variant_path(option.variant_path):
+            dimension = self.dimensions.get(prop_id)
+            if dimension is None:
+                return None
+            names.append(dimension.localized_name or dimension.raw_name)
+        return VARIANT_LABEL_SEPARATOR.join(names)
+
+    def option_value(self, option: ProductOption) -> Optional[str]:
+        if not option.variant_path:
+            return None
+        names = []
+        for key in split_variant_path(option.variant_path):
+            value = self.values.get(key)
+            if value is None:
+                return None
+            names.append(value.localized_name or value.raw_name)
+        return VARIANT_LABEL_SEPARATOR.join(names)
@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+import weakref
+from dataclasses import asdict, dataclass
+from typing import Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class UpstreamUnavailableError(RuntimeError):
+    """Base error for calls rejected or abandoned by a ``CallGuard``."""
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    """Raised when the circuit breaker is open and the call fails fast."""
+
+
+class RateLimitExceeded(UpstreamUnavailableError):
+    """Raised when no rate-limit token becomes available within the wait budget."""
+
+
+class TransientCallError(RuntimeError):
+    """Raised by result checks to mark a response as retryable."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every caller of an upstream API."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self._tokens = capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token, returning how long the caller must wait before using it."""
+
+        with self._lock:
+            now = self.clock()
+            elapsed = max(0.0, now - self._updated_at)
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate_per_second)
+            self._updated_at = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate_per_second
+
+    def reserve(self, max_wait: float) -> float:
+        """Take a token and return the wait before using it, without sleeping.
+
+        Raises ``RateLimitExceeded`` (and returns the token) if the wait would
+        exceed ``max_wait``.
+        """
+
+        wait = self._reserve()
+        if wait > max_wait:
+            with self._lock:
+                self._tokens += 1
+            raise RateLimitExceeded(f"Rate limit wait {wait:.2f}s exceeds {max_wait:.2f}s")
+        return wait
+
+    def acquire(self, max_wait: float) -> float:
+        """Block until a token is available; raise if that takes over ``max_wait``."""
+
+        wait = self.reserve(max_wait)
+        if wait > 0:
+            self.sleep(wait)
+        return wait
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker with a single half-open probe."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        on_transition: Optional[Callable[[str], None]] = None,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.on_transition = on_transition
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.OPEN:
+                if self.clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self.state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = self.clock()
+                if self.state != self.OPEN:
+                    self._transition(self.OPEN)
+
+    def release(self) -> None:
+        """Release a half-open probe that ended without a verdict."""
+
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        if self.on_transition:
+            self.on_transition(state)
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 5.0
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for the given 1-based attempt."""
+
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(0, ceiling)
+
+
+class Bulkhead:
+    """Cap how many blocking calls event-loop code runs in worker threads at once.
+
+    Callers queue on an ``asyncio.Semaphore`` before taking a thread, so a
+    burst of requests waits on the loop instead of filling the default
+    executor. Semaphores are bound to a loop, so one is kept per loop.
+    """
+
+    def __init__(self, max_concurrent: int) -> None:
+        self.max_concurrent = max_concurrent
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._semaphores.get(loop)
+            if semaphore is None:
+                semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrent)
+            return semaphore
+
+    def full(self) -> bool:
+        return self._semaphore().locked()
+
+    async def run(self, func: Callable[[], T]) -> T:
+        async with self._semaphore():
+            return await asyncio.to_thread(func)
+
+
+_TRANSITION_COUNTERS = {
+    CircuitBreaker.OPEN: "circuit_opened",
+    CircuitBreaker.HALF_OPEN: "circuit_half_opened",
+    CircuitBreaker.CLOSED: "circuit_closed",
+}
+
+
+@dataclass
+class CallGuardStats:
+    calls: int = 0
+    successes: int = 0
+    failures: int = 0
+    retries: int = 0
+    throttled_waits: int = 0
+    rate_limited: int = 0
+    bulkhead_waits: int = 0
+    short_circuited: int = 0
+    circuit_opened: int = 0
+    circuit_half_opened: int = 0
+    circuit_closed: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class CallGuard:
+    """Apply rate limiting, retries, and circuit breaking to a blocking call.
+
+    ``is_transient`` decides whether an exception is worth retrying; only
+    transient failures count against the circuit breaker, so caller mistakes
+    (bad parameters, missing credentials) never trip it.
+
+    ``call`` is for synchronous callers and sleeps in the calling thread.
+    ``call_async`` awaits rate-limit waits and retry backoff on the event loop
+    and only hands each attempt to a worker thread once the ``bulkhead``
+    admits it.
+    """
+
+    def __init__(
+        self,
+        *,
+        bucket: TokenBucket,
+        breaker: CircuitBreaker,
+        retry: RetryPolicy,
+        max_rate_wait: float = 5.0,
+        is_transient: Callable[[BaseException], bool] = lambda exc: isinstance(
+            exc, (TransientCallError, TimeoutError, ConnectionError)
+        ),
+        sleep: Callable[[float], None] = time.sleep,
+        bulkhead: Optional[Bulkhead] = None,
+    ) -> None:
+        self.bucket = bucket
+        self.breaker = breaker
+        self.retry = retry
+        self.bulkhead = bulkhead
+        self.max_rate_wait = max_rate_wait
+        self.is_transient = is_transient
+        self.sleep = sleep
+        self.stats = CallGuardStats()
+        self._stats_lock = threading.Lock()
+        breaker.on_transition = self._record_transition
+
+    def call(self, func: Callable[[], T]) -> T:
+        self._count("calls")
+        attempt = 1
+        while True:
+            wait = self._admit()
+            if wait > 0:
+                self.sleep(wait)
+            try:
+                result = func()
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                self.sleep(delay)
+                attempt += 1
+                continue
+            return self._succeeded(result)
+
+    async def call_async(self, func: Callable[[], T]) -> T:
+        """``call`` for event-loop callers; ``func`` still runs in a worker thread."""
+
+        self._count("calls")
+        attempt = 1
+        while True:
+            wait = self._admit()
+            try:
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                if self.bulkhead is None:
+                    result = await asyncio.to_thread(func)
+                else:
+                    if self.bulkhead.full():
+                        self._count("bulkhead_waits")
+                    result = await self.bulkhead.run(func)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+            except Exception as exc:
+                delay = self._retry_delay(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            return self._succeeded(result)
+
+    def _admit(self) -> float:
+        """Pass the breaker and take a rate-limit token; return the wait before calling."""
+
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError("Upstream circuit is open; failing fast")
+        try:
+            wait = self.bucket.reserve(self.max_rate_wait)
+        except RateLimitExceeded:
+            self.breaker.release()
+            self._count("rate_limited")
+            raise
+        if wait > 0:
+            self._count("throttled_waits")
+        return wait
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> Optional[float]:
+        """Record a failed attempt; return the backoff before retrying, or ``None`` to give up."""
+
+        if not self.is_transient(exc):
+            self.breaker.release()
+            self._count("failures")
+            return None
+        self.breaker.record_failure()
+        if attempt >= self.retry.max_attempts:
+            self._count("failures")
+            return None
+        self._count("retries")
+        return self.retry.backoff(attempt)
+
+    def _succeeded(self, result: T) -> T:
+        self.breaker.record_success()
+        self._count("successes")
+        return result
+
+    def state(self) -> dict[str, object]:
+        return {"state": self.breaker.state, **self.stats.as_dict()}
+
+    def _record_transition(self, state: str) -> None:
+        self._count(_TRANSITION_COUNTERS[state])
+
+    def _count(self, field_name: str) -> None:
+        with self._stats_lock:
+            setattr(self.stats, field_name, getattr(self.stats, field_name) + 1)
@@ -0,0 +1,267 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.models.domain import Product, ProductOption, ProductSalePrice
+from app.services.pricing import CompiledPricing, PricingEngine, get_pricing_engine
+from app.services.shipping_rates import product_chargeable_weight
+
+logger = logging.getLogger(__name__)
+
+# (shipping_fee, margin_rate, vat_rate, exchange_rate, chargeable weight_kg);
+# ``None`` means the channel default.
+PriceOverrides = Tuple[
+    Optional[float], Optional[float], Optional[float], Optional[float], Optional[float]
+]
+
+
+def product_price_overrides(product: Product) -> PriceOverrides:
+    def value(column) -> Optional[float]:
+        return float(column) if column is not None else None
+
+    return (
+        value(product.shipping_fee),
+        value(product.margin_rate),
+        value(product.vat_rate),
+        value(product.exchange_rate),
+        product_chargeable_weight(product),
+    )
+
+
+def pricing_inputs_hash(
+    evaluator: CompiledPricing, raw_price: float, overrides: PriceOverrides
+) -> str:
+    """Hash of everything a product's sale prices depend on except option price diffs."""
+
+    rules = list(evaluator.fingerprint)
+    if overrides[3] is not None:
+        # A product-level rate makes the channel's rate irrelevant.
+        rules[0] = None
+    payload = [rules, float(raw_price), list(overrides)]
+    encoded = json.dumps(payload, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def stored_sale_prices(
+    session: Session, channel: str, product_ids: Iterable[int]
+) -> Dict[Tuple[int, Optional[int]], ProductSalePrice]:
+    """Materialized prices of ``product_ids`` keyed by ``(product_id, option_id)``."""
+
+    return {
+        (row.product_id, row.option_id): row
+        for row in session.query(ProductSalePrice).filter(
+            ProductSalePrice.channel == channel,
+            ProductSalePrice.product_id.in_(list(product_ids)),
+        )
+    }
+
+
+def is_current(row: Optional[ProductSalePrice], inputs_hash: str, price_diff: float) -> bool:
+    return (
+        row is not None
+        and row.inputs_hash == inputs_hash
+        and float(row.raw_price_diff or 0) == price_diff
+    )
+
+
+@dataclass
+class SalePriceRefreshResult:
+    checked: int = 0
+    updated: int = 0
+    removed: int = 0
+
+    def merge(self, other: "SalePriceRefreshResult") -> None:
+        for field_name, value in asdict(other).items():
+            setattr(self, field_name, getattr(self, field_name) + value)
+
+
+class SalePriceRefresher:
+    """Keep ``product_sale_prices`` in step with their pricing inputs.
+
+    Products are scanned in id-ordered batches. Each stored price carries the
+    option's price difference and a hash of the product's pricing fields and
+    the channel's compiled rules (including the exchange rate), so only rows
+    whose inputs changed are recomputed, in one vectorized pass per batch.
+    """
+
+    def __init__(
+        self,
+        session: Session,
+        *,
+        engine: PricingEngine | None = None,
+        channels: Iterable[str] | None = None,
+        batch_size: int | None = None,
+    ) -> None:
+        self.session = session
+        self.engine = engine or get_pricing_engine()
+        self.channels = [
+            channel.lower() for channel in (channels or settings.sale_price_channels)
+        ]
+        self.batch_size = batch_size or settings.sale_price_refresh_batch_size
+
+    def fingerprints(self) -> Dict[str, tuple]:
+        """Each channel's compiled-rules fingerprint (rules, current rate and tiers)."""
+
+        self.engine.sync(self.session)
+        return {channel: self.engine.compiled(channel).fingerprint for channel in self.channels}
+
+    def unpriced_product_ids(self) -> List[int]:
+        """Products missing a stored price in any channel (e.g. created since the last pass)."""
+
+        missing: set = set()
+        for channel in self.channels:
+            priced = self.session.query(ProductSalePrice.product_id).filter(
+                ProductSalePrice.channel == channel
+            )
+            missing.update(
+                product_id
+                for product_id, in self.session.query(Product.id).filter(~Product.id.in_(priced))
+            )
+        return sorted(missing)
+
+    def refresh(self, product_ids: Iterable[int] | None = None) -> SalePriceRefreshResult:
+        """Recompute stale prices for ``product_ids`` (default: every product)."""
+
+        ids = list(product_ids) if product_ids is not None else None
+        result = SalePriceRefreshResult()
+        self.engine.sync(self.session)
+        for channel in self.channels:
+            evaluator = self.engine.compiled(channel)
+            last_id = 0
+            while True:
+                query = self.session.query(Product).filter(Product.id > last_id)
+                if ids is not None:
+                    query = query.filter(Product.id.in_(ids))
+                batch: List[Product] = (
+                    query.options(selectinload(Product.options))
+                    .order_by(Product.id)
+                    .limit(self.batch_size)
+                    .all()
+                )
+                if not batch:
+                    break
+                last_id = batch[-1].id
+                result.merge(self._refresh_batch(channel, evaluator, batch))
+                self.session.commit()
+
+        if ids is None:
+            removed = (
+                self.session.query(ProductSalePrice)
+                .filter(~ProductSalePrice.channel.in_(self.channels))
+                .delete(synchronize_session=False)
+            )
+            result.removed += removed
+            self.session.commit()
+        return result
+
+    def _refresh_batch(
+        self, channel: str, evaluator: CompiledPricing, products: List[Product]
+    ) -> SalePriceRefreshResult:
+        result = SalePriceRefreshResult()
+        stored = stored_sale_prices(self.session, channel, (product.id for product in products))
+        stale: List[tuple] = []
+        for product in products:
+            overrides = product_price_overrides(product)
+            digest = pricing_inputs_hash(evaluator, product.raw_price, overrides)
+            options: List[Optional[ProductOption]] = list(product.options) or [None]
+            for option in options:
+                result.checked += 1
+                price_diff = float(option.raw_price_diff or 0) if option else 0.0
+                row = stored.pop((product.id, option.id if option else None), None)
+                if not is_current(row, digest, price_diff):
+                    stale.append((product, option, row, digest, price_diff, overrides))
+
+        # Rows of options that no longer exist.
+        for row in stored.values():
+            self.session.delete(row)
+            result.removed += 1
+        if not stale:
+            return result
+
+        prices = evaluator.prices(
+            [float(product.raw_price) for product, *_ in stale],
+            [price_diff for *_, price_diff, _ in stale],
+            shipping_fees=[overrides[0] for *_, overrides in stale],
+            margin_rates=[overrides[1] for *_, overrides in stale],
+            vat_rates=[overrides[2] for *_, overrides in stale],
+            exchange_rates=[overrides[3] for *_, overrides in stale],
+            weights_kg=[overrides[4] for *_, overrides in stale],
+        ).tolist()
+        now = datetime.utcnow()
+        for (product, option, row, digest, price_diff, _), price in zip(stale, prices):
+            if row is None:
+                row = ProductSalePrice(
+                    product_id=product.id,
+                    option_id=option.id if option else None,
+                    channel=channel,
+                )
+                self.session.add(row)
+            row.sale_price = price
+            row.raw_price_diff = price_diff
+            row.inputs_hash = digest
+            row.computed_at = now
+            result.updated += 1
+        return result
+
+
+def run_sale_price_refresh(
+    session_factory: Callable[[], Session], product_ids: Iterable[int] | None = None
+) -> Optional[SalePriceRefreshResult]:
+    """Refresh on a new session (for background tasks); failures are logged."""
+
+    session = session_factory()
+    try:
+        return SalePriceRefresher(session).refresh(product_ids)
+    except Exception:
+        logger.exception("Sale price refresh failed")
+        session.rollback()
+        return None
+    finally:
+        session.close()
+
+
+async def run_sale_price_refresh_forever(
+    session_factory: Callable[[], Session], *, interval_seconds: float
+) -> None:
+    """Periodically re-price the catalog when channel pricing changed, until cancelled.
+
+    Imports, product edits and re-syncs refresh their own products, and rate
+    or tier updates through the API refresh the catalog. This sweep catches
+    the rest: it scans the catalog when a channel's compiled rules changed
+    since its last pass, and otherwise prices only products that have no
+    stored price yet.
+    """
+
+    last: Optional[Dict[str, tuple]] = None
+
+    def refresh() -> None:
+        nonlocal last
+        session = session_factory()
+        try:
+            refresher = SalePriceRefresher(session)
+            current = refresher.fingerprints()
+            if current != last:
+                refresher.refresh()
+                last = current
+            else:
+                missing = refresher.unpriced_product_ids()
+                if missing:
+                    refresher.refresh(missing)
+        except Exception:
+            logger.exception("Sale price refresh failed; retrying in %ss", interval_seconds)
+            session.rollback()
+        finally:
+            session.close()
+
+    while True:
+        await asyncio.sleep(interval_seconds)
+        await asyncio.to_thread(refresh)
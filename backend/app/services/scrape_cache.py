@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class ScrapeCacheKey:
+    source_site: str
+    num_iid: str
+    item_source_market: str | None = None
+
+    def filename(self) -> str:
+        market = self.item_source_market or "default"
+        raw = f"{self.source_site}_{market}_{self.num_iid}".lower()
+        return re.sub(r"[^a-z0-9_.-]", "_", raw) + ".json"
+
+
+@dataclass
+class ScrapeCacheEntry:
+    payload: Any
+    fetched_at: float
+    is_stale: bool = False
+
+
+@dataclass
+class ScrapeCacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    revalidations: int = 0
+    revalidation_failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class ScrapeCache:
+    """Disk-backed cache of raw IOP ``/product/get`` responses.
+
+    Entries younger than ``ttl_seconds`` are served as fresh. Entries older than
+    that but still within ``stale_seconds`` are served as stale so the caller
+    can revalidate in the background; anything older counts as a miss.
+    """
+
+    def __init__(
+        self,
+        base_path: Path | str,
+        *,
+        ttl_seconds: float = 3600.0,
+        stale_seconds: float = 0.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.base_path = Path(base_path)
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.clock = clock
+        self.stats = ScrapeCacheStats()
+        self._lock = threading.Lock()
+
+    def get(self, key: ScrapeCacheKey) -> Optional[ScrapeCacheEntry]:
+        path = self.base_path / key.filename()
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                record = json.load(handle)
+            fetched_at = float(record["fetched_at"])
+            payload = record["payload"]
+        except (OSError, ValueError, KeyError, TypeError):
+            self._count("misses")
+            return None
+
+        age = self.clock() - fetched_at
+        if age <= self.ttl_seconds:
+            self._count("hits")
+            return ScrapeCacheEntry(payload=payload, fetched_at=fetched_at)
+        if age <= self.ttl_seconds + self.stale_seconds:
+            self._count("stale_hits")
+            return ScrapeCacheEntry(payload=payload, fetched_at=fetched_at, is_stale=True)
+
+        self._count("misses")
+        return None
+
+    def set(self, key: ScrapeCacheKey, payload: Any) -> None:
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        record = {"fetched_at": self.clock(), "payload": payload}
+        # Write to a temp file first so concurrent readers never see a partial entry.
+        fd, tmp_name = tempfile.mkstemp(dir=self.base_path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(record, handle, ensure_ascii=False)
+            os.replace(tmp_name, self.base_path / key.filename())
+        except Exception:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._count("writes")
+
+    def record_revalidation(self, succeeded: bool) -> None:
+        self._count("revalidations" if succeeded else "revalidation_failures")
+
+    def _count(self, field_name: str) -> None:
+        with self._lock:
+            setattr(self.stats, field_name, getattr(self.stats, field_name) + 1)
+
+
+_default_cache: ScrapeCache | None = None
+
+
+def get_scrape_cache() -> ScrapeCache | None:
+    """Return the process-wide scrape cache, or ``None`` when disabled."""
+
+    global _default_cache
+    if not settings.scrape_cache_enabled:
+        return None
+    if _default_cache is None:
+        _default_cache = ScrapeCache(
+            settings.scrape_cache_dir,
+            ttl_seconds=settings.scrape_cache_ttl_seconds,
+            stale_seconds=settings.scrape_cache_stale_seconds,
+        )
+    return _default_cache
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.domain import Product, ShippingRateTier
+
+
+def chargeable_weight(
+    weight_kg: Optional[float],
+    length_cm: Optional[float] = None,
+    width_cm: Optional[float] = None,
+    height_cm: Optional[float] = None,
+) -> Optional[float]:
+    """The larger of actual and volumetric weight; ``None`` when neither is known."""
+
+    candidates = []
+    if weight_kg is not None:
+        candidates.append(float(weight_kg))
+    if length_cm is not None and width_cm is not None and height_cm is not None:
+        volume = float(length_cm) * float(width_cm) * float(height_cm)
+        candidates.append(volume / settings.shipping_volumetric_divisor)
+    return max(candidates) if candidates else None
+
+
+def product_chargeable_weight(product: Product) -> Optional[float]:
+    return chargeable_weight(
+        product.weight_kg, product.length_cm, product.width_cm, product.height_cm
+    )
+
+
+def chargeable_weights(
+    weights_kg: np.ndarray, lengths_cm: np.ndarray, widths_cm: np.ndarray, heights_cm: np.ndarray
+) -> np.ndarray:
+    """Vectorized ``chargeable_weight`` over NaN-for-unknown columns."""
+
+    volumetric = lengths_cm * widths_cm * heights_cm / settings.shipping_volumetric_divisor
+    return np.fmax(weights_kg, volumetric)
+
+
+@dataclass(frozen=True)
+class ShippingTiers:
+    """Sorted tier bounds (inclusive upper chargeable weight) and their fees.
+
+    A weight resolves to the first tier whose bound is at or above it; weights
+    above the last bound pay the last tier's fee.
+    """
+
+    max_weights: Tuple[float, ...] = ()
+    fees: Tuple[float, ...] = ()
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[float, float]]) -> "ShippingTiers":
+        ordered = sorted((float(bound), float(fee)) for bound, fee in pairs)
+        return cls(tuple(bound for bound, _ in ordered), tuple(fee for _, fee in ordered))
+
+    def __bool__(self) -> bool:
+        return bool(self.max_weights)
+
+    def fee(self, weight_kg: Optional[float]) -> Optional[float]:
+        if weight_kg is None or not self.max_weights:
+            return None
+        position = bisect_left(self.max_weights, weight_kg)
+        return self.fees[min(position, len(self.fees) - 1)]
+
+    def fees_for(self, weights_kg: np.ndarray) -> np.ndarray:
+        """Vectorized ``fee``; NaN for unknown weights or an empty table."""
+
+        if not self.max_weights:
+            return np.full(weights_kg.shape, np.nan)
+        positions = np.searchsorted(np.asarray(self.max_weights), weights_kg, side="left")
+        fees = np.asarray(self.fees)[np.minimum(positions, len(self.fees) - 1)]
+        return np.where(np.isnan(weights_kg), np.nan, fees)
+
+
+@dataclass
+class ShippingRateStats:
+    reloads: int = 0
+    tiers: int = 0
+
+    def as_dict(self) -> dict:
+        return {"reloads": self.reloads, "tiers": self.tiers}
+
+
+class ShippingRateIndex:
+    """In-memory copy of ``shipping_rate_tiers``, reloaded when the table changes."""
+
+    def __init__(self) -> None:
+        self.tiers = ShippingTiers()
+        self._fingerprint: Optional[tuple] = None
+        self._lock = threading.Lock()
+        self.stats = ShippingRateStats()
+
+    @staticmethod
+    def _table_fingerprint(session: Session) -> tuple:
+        return tuple(
+            session.query(
+                func.count(ShippingRateTier.id),
+                func.max(ShippingRateTier.id),
+                func.max(ShippingRateTier.updated_at),
+            ).one()
+        )
+
+    def sync(self, session: Session) -> None:
+        fingerprint = self._table_fingerprint(session)
+        if fingerprint != self._fingerprint:
+            self.load(session, fingerprint=fingerprint)
+
+    def load(self, session: Session, *, fingerprint: Optional[tuple] = None) -> None:
+        tiers = ShippingTiers.from_pairs(
+            session.query(ShippingRateTier.max_weight_kg, ShippingRateTier.fee)
+        )
+        with self._lock:
+            self.tiers = tiers
+            self._fingerprint = fingerprint or self._table_fingerprint(session)
+            self.stats.reloads += 1
+            self.stats.tiers = len(tiers.max_weights)
+
+    def replace(self, session: Session, pairs: Iterable[Tuple[float, float]]) -> ShippingTiers:
+        """Replace the whole tier table with ``(max_weight_kg, fee)`` pairs."""
+
+        tiers = ShippingTiers.from_pairs(pairs)
+        if len(set(tiers.max_weights)) != len(tiers.max_weights):
+            raise ValueError("Shipping tiers must have distinct max_weight_kg values")
+        session.query(ShippingRateTier).delete(synchronize_session=False)
+        session.add_all(
+            ShippingRateTier(max_weight_kg=bound, fee=fee)
+            for bound, fee in zip(tiers.max_weights, tiers.fees)
+        )
+        session.commit()
+        self.load(session)
+        return self.tiers
+
+
+_default_index: ShippingRateIndex | None = None
+
+
+def get_shipping_rate_index() -> ShippingRateIndex:
+    """Return the process-wide shipping-rate index."""
+
+    global _default_index
+    if _default_index is None:
+        _default_index = ShippingRateIndex()
+    return _default_index
@@ -3,7 +3,71 @@ from __future__ import annotations
 import os
 from typing import Any, Dict, Optional
 
-import iop
+import requests
+
+from app.config import settings
+from app.services.iop_http import IopHttpClient
+from app.services.resilience import (
+    Bulkhead,
+    CallGuard,
+    CircuitBreaker,
+    RetryPolicy,
+    TokenBucket,
+    TransientCallError,
+)
+
+# IOP error codes that indicate throttling or a temporary gateway problem.
+TRANSIENT_IOP_CODES = frozenset(
+    {
+        "ApiCallLimit",
+        "AppCallLimit",
+        "ServiceTimeout",
+        "ServiceUnavailable",
+        "IspServiceUnavailable",
+        "SystemBusy",
+    }
+)
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    return isinstance(
+        exc,
+        (
+            TransientCallError,
+            TimeoutError,
+            ConnectionError,
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ),
+    )
+
+
+_default_guard: CallGuard | None = None
+
+
+def get_taobao_call_guard() -> CallGuard:
+    """Return the process-wide guard shared by every ``TaobaoClient``."""
+
+    global _default_guard
+    if _default_guard is None:
+        _default_guard = CallGuard(
+            bucket=TokenBucket(
+                settings.taobao_rate_limit_per_second, settings.taobao_rate_limit_burst
+            ),
+            breaker=CircuitBreaker(
+                settings.taobao_breaker_failure_threshold,
+                settings.taobao_breaker_reset_seconds,
+            ),
+            retry=RetryPolicy(
+                max_attempts=settings.taobao_retry_max_attempts,
+                base_delay=settings.taobao_retry_base_delay,
+                max_delay=settings.taobao_retry_max_delay,
+            ),
+            max_rate_wait=settings.taobao_rate_limit_max_wait,
+            is_transient=_is_transient_error,
+            bulkhead=Bulkhead(settings.taobao_max_concurrent_calls),
+        )
+    return _default_guard
 
 
 class TaobaoClient:
@@ -17,6 +81,11 @@ class TaobaoClient:
 
     The client assumes a valid seller access token already exists and does not
     implement the OAuth flow for obtaining one.
+
+    Every call goes through a shared ``CallGuard`` (token-bucket rate limit,
+    jittered retries on transient errors, circuit breaker) and a pooled
+    keep-alive ``IopHttpClient`` with a per-call timeout. Construct one
+    instance per process (see ``TaobaoClientRegistry``) so connections are reused.
     """
 
     def __init__(
@@ -25,6 +94,10 @@ class TaobaoClient:
         app_secret: Optional[str] = None,
         access_token: Optional[str] = None,
         callback_url: Optional[str] = None,
+        *,
+        timeout: Optional[float] = None,
+        guard: Optional[CallGuard] = None,
+        http_client: Optional[IopHttpClient] = None,
     ) -> None:
         self.app_key = app_key or os.getenv("TAOBAO_APP_KEY", "")
         self.app_secret = app_secret or os.getenv("TAOBAO_APP_SECRET", "")
@@ -37,7 +110,15 @@ class TaobaoClient:
         if not self.callback_url:
             raise ValueError("TAOBAO_CALLBACK_URL must be set")
 
-        self.client = iop.IopClient(self.callback_url, self.app_key, self.app_secret)
+        self.timeout = timeout or settings.taobao_request_timeout_seconds
+        self.guard = guard or get_taobao_call_guard()
+        self.client = http_client or IopHttpClient(
+            self.callback_url,
+            self.app_key,
+            self.app_secret,
+            timeout=self.timeout,
+            pool_size=settings.taobao_http_pool_size,
+        )
 
         if not self.access_token:
             # The access token can be overridden per call if not set globally.
@@ -58,12 +139,43 @@ class TaobaoClient:
             http_method: HTTP verb for the request (GET by default).
         """
 
-        request = iop.IopRequest("/product/get", http_method.upper())
-        for key, value in (api_params or {}).items():
-            request.add_api_param(key, value)
+        token = access_token or self.access_token
+        return self.guard.call(
+            lambda: self._execute_once(api_params or {}, token, http_method.upper())
+        )
+
+    async def execute_async(
+        self,
+        api_params: Optional[Dict[str, Any]] = None,
+        *,
+        access_token: Optional[str] = None,
+        http_method: str = "GET",
+    ) -> Any:
+        """``execute`` for event-loop callers.
+
+        Rate-limit waits and retry backoff are awaited on the loop, and the
+        guard's bulkhead bounds how many calls occupy worker threads.
+        """
 
         token = access_token or self.access_token
-        return self.client.execute(request, token)
+        return await self.guard.call_async(
+            lambda: self._execute_once(api_params or {}, token, http_method.upper())
+        )
+
+    def _execute_once(
+        self, api_params: Dict[str, Any], token: str, http_method: str
+    ) -> Dict[str, Any]:
+        response = self.client.call(
+            "/product/get", api_params, access_token=token, http_method=http_method
+        )
+        code = response.get("code")
+        if code in TRANSIENT_IOP_CODES:
+            message = response.get("message") or ""
+            raise TransientCallError(f"IOP transient error {code}: {message}")
+        return response
+
+    def close(self) -> None:
+        self.client.close()
 
     def get_item_detail(
         self,
@@ -74,7 +186,24 @@ class TaobaoClient:
     ) -> Any:
         """Convenience wrapper for ``/product/get`` using a product identifier."""
 
-        params = {"num_iid": num_iid}
+        return self.execute(
+            api_params=self._item_params(num_iid, item_source_market), access_token=access_token
+        )
+
+    async def get_item_detail_async(
+        self,
+        num_iid: int | str,
+        *,
+        access_token: Optional[str] = None,
+        item_source_market: Optional[str] = None,
+    ) -> Any:
+        return await self.execute_async(
+            api_params=self._item_params(num_iid, item_source_market), access_token=access_token
+        )
+
+    @staticmethod
+    def _item_params(num_iid: int | str, item_source_market: Optional[str]) -> Dict[str, Any]:
+        params: Dict[str, Any] = {"num_iid": num_iid}
         if item_source_market:
             params["item_source_market"] = item_source_market
-        return self.execute(api_params=params, access_token=access_token)
+        return params
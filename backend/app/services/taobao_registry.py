@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, Dict, Optional
+
+from app.services.scrape_cache import get_scrape_cache
+from app.services.taobao_client import TaobaoClient
+from app.services.taobao_scraper import TaobaoScraper
+
+# source_site -> item_source_market passed to ``/product/get``
+SOURCE_SITES: Dict[str, str | None] = {
+    "TAOBAO": None,
+    "1688": "CBU_MARKET",
+}
+
+
+class TaobaoClientRegistry:
+    """Application-scoped owner of the Taobao client and per-site scrapers.
+
+    The client (and its keep-alive HTTP session) and the scrapers are built once
+    on first use and shared by every request; ``close`` releases the pooled
+    connections on shutdown.
+    """
+
+    def __init__(
+        self, client_factory: Callable[[], TaobaoClient] = TaobaoClient
+    ) -> None:
+        self.client_factory = client_factory
+        self._client: Optional[TaobaoClient] = None
+        self._scrapers: Optional[Dict[str, TaobaoScraper]] = None
+        self._lock = threading.Lock()
+
+    def scrapers(self) -> Dict[str, TaobaoScraper]:
+        with self._lock:
+            # Without a client (credentials were missing) try again on every
+            # call so setting them later does not require a restart.
+            if self._scrapers is None or self._client is None:
+                try:
+                    self._client = self.client_factory()
+                except Exception:
+                    # Missing credentials: scrapers report "not configured" per
+                    # call instead of building clients that bypass the factory.
+                    self._client = None
+                cache = get_scrape_cache()
+                self._scrapers = {
+                    site: TaobaoScraper(
+                        self._client,
+                        source_site=site,
+                        item_source_market=market,
+                        cache=cache,
+                        default_client=False,
+                    )
+                    for site, market in SOURCE_SITES.items()
+                }
+            return self._scrapers
+
+    def close(self) -> None:
+        with self._lock:
+            if self._client is not None:
+                self._client.close()
+            self._client = None
+            self._scrapers = None
+
+
+_registry = TaobaoClientRegistry()
+
+
+def get_taobao_registry() -> TaobaoClientRegistry:
+    """FastAPI dependency returning the process-wide Taobao client registry."""
+
+    return _registry
@@ -3,17 +3,29 @@ from __future__ import annotations
 import asyncio
 import re
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from urllib.parse import parse_qs, urlparse
 
+from app.services.scrape_cache import ScrapeCache, ScrapeCacheKey
 from app.services.taobao_client import TaobaoClient
 
 
+@dataclass(frozen=True)
+class ScrapedVariantValue:
+    """One ``prop_id:value_id`` component of a SKU's ``prop_path``."""
+
+    prop_id: str
+    prop_name: str
+    value_id: str
+    value_name: str
+
+
 @dataclass
 class ScrapedOption:
     option_key: str
     raw_name: str
     raw_price_diff: Optional[float] = None
+    variant: List[ScrapedVariantValue] = field(default_factory=list)
 
 
 @dataclass
@@ -26,14 +38,25 @@ class ScrapedProduct:
     image_urls: List[str]
     detail_image_urls: List[str] = field(default_factory=list)
     options: List[ScrapedOption] = field(default_factory=list)
+    raw_payload: Optional[dict] = field(default=None, repr=False)
 
 
 class ScrapeFailed(Exception):
     """Raised when scraping a product from Taobao fails."""
 
 
+# Strong references to in-flight background refreshes; the event loop itself
+# only keeps weak references to tasks.
+_revalidation_tasks: Dict[ScrapeCacheKey, asyncio.Task] = {}
+
+
 class TaobaoScraper:
-    """Scraper that delegates to the official Taobao TOP API client."""
+    """Scraper that delegates to the official Taobao TOP API client.
+
+    Without ``client`` a default ``TaobaoClient`` is built, unless
+    ``default_client`` is false; a scraper without a client reports every
+    fetch as failed.
+    """
 
     def __init__(
         self,
@@ -41,27 +64,98 @@ class TaobaoScraper:
         *,
         source_site: str = "TAOBAO",
         item_source_market: str | None = None,
+        cache: Optional[ScrapeCache] = None,
+        default_client: bool = True,
     ) -> None:
         self.source_site = source_site.upper()
         self.item_source_market = item_source_market
-        try:
-            self.client = client or TaobaoClient()
-        except Exception:
-            self.client = None
+        self.cache = cache
+        self.client = client
+        if client is None and default_client:
+            try:
+                self.client = TaobaoClient()
+            except Exception:
+                self.client = None
+
+    async def fetch_product(self, url: str, *, refresh: bool = False) -> ScrapedProduct:
+        """Fetch and parse an item, serving from the scrape cache when possible.
+
+        ``refresh=True`` skips the cache lookup (the fresh response is still
+        written back), which re-sync jobs use to observe upstream drift.
+        """
 
-    async def fetch_product(self, url: str) -> ScrapedProduct:
         num_iid = self._extract_num_iid(url)
         if not num_iid:
             raise ScrapeFailed("상품 ID를 URL에서 추출할 수 없습니다.")
+
+        cache_key = ScrapeCacheKey(self.source_site, num_iid, self.item_source_market)
+        cached = None
+        if self.cache and not refresh:
+            # Cache reads and writes are blocking file I/O; keep them off the loop.
+            cached = await asyncio.to_thread(self.cache.get, cache_key)
+        if cached is not None and self.is_valid_payload(cached.payload):
+            if cached.is_stale:
+                self._schedule_revalidation(cache_key)
+            return self.parse_payload(cached.payload, num_iid)
+
+        data = await self._fetch_raw(num_iid)
+        product = self.parse_payload(data, num_iid)
+        if self.cache:
+            await asyncio.to_thread(self.cache.set, cache_key, data)
+        return product
+
+    async def _fetch_raw(self, num_iid: str) -> dict:
         if not self.client:
             raise ScrapeFailed("Taobao 클라이언트를 초기화하지 못했습니다.")
-
         try:
-            data = await asyncio.to_thread(
-                self.client.get_item_detail,
-                num_iid,
-                item_source_market=self.item_source_market,
+            data = await self.client.get_item_detail_async(
+                num_iid, item_source_market=self.item_source_market
             )
+        except Exception as exc:
+            raise ScrapeFailed("상품 정보를 불러오는 중 오류가 발생했습니다.") from exc
+        if not self.is_valid_payload(data):
+            raise ScrapeFailed("상품 정보를 불러오는 중 오류가 발생했습니다.")
+        return data
+
+    @staticmethod
+    def is_valid_payload(data: object) -> bool:
+        """Whether ``data`` is a successful item response (only these are cached).
+
+        IOP reports errors such as ``{"code": "ApiCallLimit", ...}`` in the body
+        of an HTTP 200 response.
+        """
+
+        if not isinstance(data, dict):
+            return False
+        if str(data.get("code", "0")) != "0":
+            return False
+        item = data.get("data") or (data.get("item_get_response") or {}).get("item")
+        return isinstance(item, dict) and bool(item)
+
+    def _schedule_revalidation(self, cache_key: ScrapeCacheKey) -> None:
+        """Refresh a stale cache entry in the background (stale-while-revalidate)."""
+
+        if cache_key in _revalidation_tasks:
+            return
+        task = asyncio.get_running_loop().create_task(self._revalidate(cache_key))
+        _revalidation_tasks[cache_key] = task
+        # A done-callback also runs when the task is cancelled before it starts.
+        task.add_done_callback(lambda _: _revalidation_tasks.pop(cache_key, None))
+
+    async def _revalidate(self, cache_key: ScrapeCacheKey) -> None:
+        try:
+            data = await self._fetch_raw(cache_key.num_iid)
+            self.parse_payload(data, cache_key.num_iid)
+            await asyncio.to_thread(self.cache.set, cache_key, data)
+        except Exception:
+            self.cache.record_revalidation(succeeded=False)
+        else:
+            self.cache.record_revalidation(succeeded=True)
+
+    def parse_payload(self, data: dict, num_iid: str) -> ScrapedProduct:
+        """Convert a raw ``/product/get`` response into a ``ScrapedProduct``."""
+
+        try:
             item = data.get("data") or data.get("item_get_response", {}).get("item", {})
             title = item.get("title", "")
             price = self._safe_float(item.get("promotion_price") or item.get("price"), 0)
@@ -80,6 +174,7 @@ class TaobaoScraper:
 
         options: List[ScrapedOption] = []
         skus = item.get("sku_list") or item.get("skus", {}).get("sku", []) or []
+        props_list = item.get("props_list") if isinstance(item.get("props_list"), dict) else {}
         for sku in skus:
             sku_price = self._safe_float(
                 sku.get("promotion_price") or sku.get("price"), None
@@ -98,6 +193,7 @@ class TaobaoScraper:
                     or "Default"
                 ),
                 raw_price_diff=sku_price - price if price and sku_price is not None else None,
+                variant=self._parse_variant(sku, props_list),
             )
             options.append(option)
 
@@ -105,7 +201,7 @@ class TaobaoScraper:
             options.append(ScrapedOption(option_key="default", raw_name="기본", raw_price_diff=0))
 
         return ScrapedProduct(
-            source_url=f"https://item.taobao.com/item.htm?id={num_iid}",
+            source_url=self.canonical_url(num_iid),
             source_site=self.source_site,
             title=title or "Taobao Item",
             price=price,
@@ -113,8 +209,17 @@ class TaobaoScraper:
             image_urls=image_urls,
             detail_image_urls=detail_image_urls,
             options=options,
+            raw_payload=data,
         )
 
+    def canonical_item_id(self, url: str) -> Optional[str]:
+        """Return the ``num_iid`` identifying ``url`` regardless of URL shape."""
+
+        return self._extract_num_iid(url)
+
+    def canonical_url(self, num_iid: str) -> str:
+        return f"https://item.taobao.com/item.htm?id={num_iid}"
+
     def _normalize_image_list(self, images: Optional[List[str] | str]) -> List[str]:
         if not images:
             return []
@@ -140,6 +245,65 @@ class TaobaoScraper:
             return [str(img) for img in description if isinstance(img, str)]
         return []
 
+    def _parse_variant(self, sku: dict, props_list: dict) -> List[ScrapedVariantValue]:
+        """Split a SKU into its ``prop_id:value_id`` dimensions.
+
+        Accepts ``properties_name`` (``pid:vid:prop:value;...``), a structured
+        ``properties`` list, or a bare ``prop_path`` resolved through the item's
+        ``props_list``. Returns an empty list when the SKU cannot be decomposed.
+        """
+
+        properties = sku.get("properties")
+        if isinstance(properties, list):
+            variant = []
+            for prop in properties:
+                if not isinstance(prop, dict):
+                    return []
+                prop_id = prop.get("prop_id") or prop.get("pid")
+                value_id = prop.get("value_id") or prop.get("vid")
+                if prop_id is None or value_id is None:
+                    return []
+                variant.append(
+                    ScrapedVariantValue(
+                        prop_id=str(prop_id),
+                        prop_name=str(prop.get("prop_name") or prop.get("name") or prop_id),
+                        value_id=str(value_id),
+                        value_name=str(
+                            prop.get("value_name")
+                            or prop.get("value_desc")
+                            or prop.get("value")
+                            or value_id
+                        ),
+                    )
+                )
+            return variant
+
+        properties_name = sku.get("properties_name")
+        if isinstance(properties_name, str) and properties_name:
+            variant = []
+            for part in properties_name.split(";"):
+                pieces = part.split(":", 3)
+                if len(pieces) != 4:
+                    return []
+                prop_id, value_id, prop_name, value_name = pieces
+                variant.append(ScrapedVariantValue(prop_id, prop_name, value_id, value_name))
+            return variant
+
+        prop_path = sku.get("prop_path") or (
+            properties if isinstance(properties, str) else None
+        )
+        if isinstance(prop_path, str) and prop_path and props_list:
+            variant = []
+            for part in prop_path.split(";"):
+                label = props_list.get(part)
+                pieces = part.split(":", 1)
+                if not label or ":" not in label or len(pieces) != 2:
+                    return []
+                prop_name, value_name = label.split(":", 1)
+                variant.append(ScrapedVariantValue(pieces[0], prop_name, pieces[1], value_name))
+            return variant
+        return []
+
     def _safe_float(self, value: object, default: float | None) -> float | None:
         try:
             return float(value)
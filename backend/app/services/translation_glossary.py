@@ -0,0 +1,265 @@
+from __future__ import annotations
+
+import json
+import threading
+import unicodedata
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.domain import GlossaryTerm
+
+# Longer strings (titles, descriptions) are never fully covered by glossary tokens.
+MAX_GLOSSARY_TEXT_LENGTH = 64
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: every occurrence of every pattern in one pass."""
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        for pattern in patterns:
+            if pattern:
+                self._add(pattern)
+        self._build()
+
+    def _add(self, pattern: str) -> None:
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = next_node
+        self._out[node].append(len(pattern))
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[child] = candidate if candidate != child else 0
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def spans(self, text: str) -> Dict[int, List[int]]:
+        """Map each start offset to the end offsets of every pattern starting there."""
+
+        spans: Dict[int, List[int]] = {}
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            end = index + 1
+            for length in self._out[node]:
+                spans.setdefault(end - length, []).append(end)
+        return spans
+
+
+def _is_passthrough(char: str) -> bool:
+    """Characters kept verbatim: separators, punctuation, digits and ASCII letters."""
+
+    if char.isascii() and char.isalnum():
+        return True
+    return unicodedata.category(char)[0] in ("Z", "P", "S", "N")
+
+
+def _needs_space(left: str, right: str) -> bool:
+    return not (
+        left[-1].isdigit()
+        or right[0].isdigit()
+        or not left[-1].isalnum()
+        or not right[0].isalnum()
+    )
+
+
+class Glossary:
+    """Compiled glossary for one target language."""
+
+    def __init__(self, terms: Dict[str, str]) -> None:
+        self.terms = dict(terms)
+        self._matcher = AhoCorasick(self.terms)
+
+    def translate(self, text: str) -> Optional[str]:
+        """Translate ``text`` when it consists only of glossary tokens.
+
+        Passthrough characters (digits, ASCII, punctuation, spaces) may appear
+        between tokens; the segmentation uses the fewest tokens. Returns
+        ``None`` when any other character is not covered or no token matched.
+        """
+
+        if not text or len(text) > MAX_GLOSSARY_TEXT_LENGTH:
+            return None
+        ends_from = self._matcher.spans(text)
+        size = len(text)
+        inf = size + 1
+        best = [inf] * (size + 1)
+        choice: List[Optional[int]] = [None] * (size + 1)
+        best[size] = 0
+        for start in range(size - 1, -1, -1):
+            if _is_passthrough(text[start]) and best[start + 1] < best[start]:
+                best[start] = best[start + 1]
+                choice[start] = -1
+            for end in ends_from.get(start, ()):
+                if best[end] + 1 < best[start]:
+                    best[start] = best[end] + 1
+                    choice[start] = end
+        if best[0] >= inf or best[0] == 0:
+            return None
+
+        pieces: List[str] = []
+        position = 0
+        while position < size:
+            end = choice[position]
+            if end == -1:
+                run_end = position + 1
+                while run_end < size and choice[run_end] == -1:
+                    run_end += 1
+                piece = text[position:run_end]
+                position = run_end
+            else:
+                piece = self.terms[text[position:end]]
+                position = end
+            if pieces and piece.strip() and pieces[-1].strip() and _needs_space(pieces[-1], piece):
+                pieces.append(" ")
+            pieces.append(piece)
+        return "".join(pieces)
+
+
+@dataclass
+class GlossaryStats:
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class GlossaryStore:
+    """Per-language glossaries: shipped defaults overlaid with database terms.
+
+    Defaults live in ``config/translation_glossary/<lang>.json``; rows in
+    ``translation_glossary_terms`` override or extend them, like channel
+    templates, and disabled rows switch a default off. Compiled matchers are
+    cached per language with a fingerprint of that language's rows, so edits
+    made by other workers are picked up on the next lookup; ``invalidate``
+    drops them immediately.
+    """
+
+    def __init__(self, base_path: Optional[Path] = None) -> None:
+        self.base_path = base_path or (
+            Path(__file__).resolve().parents[2] / "config" / "translation_glossary"
+        )
+        self.stats = GlossaryStats()
+        self._compiled: Dict[str, Tuple[tuple, Glossary]] = {}
+        self._lock = threading.Lock()
+
+    def default_terms(self, target_lang: str) -> Dict[str, str]:
+        path = self.base_path / f"{target_lang}.json"
+        if not path.exists():
+            return {}
+        try:
+            with path.open("r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Glossary {path.name} could not be parsed: {exc}") from exc
+        if not isinstance(data, dict):
+            raise ValueError(f"Glossary {path.name} must be a JSON object of term: translation")
+        return {str(source): str(target) for source, target in data.items()}
+
+    def custom_terms(self, session: Session, target_lang: str) -> Dict[str, str]:
+        rows = session.query(GlossaryTerm).filter(
+            GlossaryTerm.target_lang == target_lang, GlossaryTerm.disabled.is_(False)
+        )
+        return {row.source_text: row.translated_text for row in rows}
+
+    def disabled_terms(self, session: Session, target_lang: str) -> Set[str]:
+        rows = session.query(GlossaryTerm.source_text).filter(
+            GlossaryTerm.target_lang == target_lang, GlossaryTerm.disabled.is_(True)
+        )
+        return {source for source, in rows}
+
+    def terms(self, session: Session, target_lang: str) -> Dict[str, str]:
+        """Effective terms: enabled defaults, then database overrides and additions."""
+
+        disabled = self.disabled_terms(session, target_lang)
+        terms = {
+            source: target
+            for source, target in self.default_terms(target_lang).items()
+            if source not in disabled
+        }
+        terms.update(self.custom_terms(session, target_lang))
+        return terms
+
+    @staticmethod
+    def _table_fingerprint(session: Session, target_lang: str) -> tuple:
+        return tuple(
+            session.query(
+                func.count(GlossaryTerm.id),
+                func.max(GlossaryTerm.id),
+                func.max(GlossaryTerm.updated_at),
+            )
+            .filter(GlossaryTerm.target_lang == target_lang)
+            .one()
+        )
+
+    def get(self, session: Session, target_lang: str) -> Glossary:
+        fingerprint = self._table_fingerprint(session, target_lang)
+        with self._lock:
+            cached = self._compiled.get(target_lang)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        glossary = Glossary(self.terms(session, target_lang))
+        with self._lock:
+            self._compiled[target_lang] = (fingerprint, glossary)
+        return glossary
+
+    def translate_many(
+        self, session: Session, texts: Iterable[str], target_lang: str
+    ) -> Dict[str, str]:
+        glossary = self.get(session, target_lang)
+        found: Dict[str, str] = {}
+        misses = 0
+        for text in texts:
+            translated = glossary.translate(text)
+            if translated is None:
+                misses += 1
+            else:
+                found[text] = translated
+        with self._lock:
+            self.stats.hits += len(found)
+            self.stats.misses += misses
+        return found
+
+    def invalidate(self, target_lang: Optional[str] = None) -> None:
+        with self._lock:
+            if target_lang is None:
+                self._compiled.clear()
+            else:
+                self._compiled.pop(target_lang, None)
+
+
+_default_store: GlossaryStore | None = None
+
+
+def get_glossary_store() -> GlossaryStore:
+    """Return the process-wide glossary store."""
+
+    global _default_store
+    if _default_store is None:
+        _default_store = GlossaryStore()
+    return _default_store
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import html
+import re
+from dataclasses import dataclass, field
+from typing import List, Mapping, Optional, Tuple
+
+# Tags, comments and whole script/style blocks are kept verbatim; everything
+# between them is text.
+_MARKUP = re.compile(
+    r"<!--.*?-->|<(script|style)\b.*?</\1\s*>|<[^>]*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_SENTENCE_END = re.compile(r"(?<=[。！？!?.;；\n])")
+
+
+def _split_long(text: str, limit: int) -> List[str]:
+    """Split ``text`` at sentence ends into pieces of at most ``limit`` characters.
+
+    A single sentence longer than ``limit`` is kept whole.
+    """
+
+    if len(text) <= limit:
+        return [text]
+    pieces: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_END.split(text):
+        if current and len(current) + len(sentence) > limit:
+            pieces.append(current)
+            current = ""
+        current += sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+@dataclass
+class HtmlSegments:
+    """An HTML document split into verbatim markup and translatable text.
+
+    ``parts`` holds ``(literal, source)`` pairs: markup and surrounding
+    whitespace as ``literal`` with ``source`` ``None``, text segments as
+    unescaped ``source`` strings.
+    """
+
+    parts: List[Tuple[str, Optional[str]]] = field(default_factory=list)
+
+    @property
+    def texts(self) -> List[str]:
+        """Distinct text segments in document order."""
+
+        return list(dict.fromkeys(source for _, source in self.parts if source is not None))
+
+    def join(self, translations: Mapping[str, str]) -> str:
+        """Reassemble the document with each segment replaced by its translation."""
+
+        return "".join(
+            literal
+            if source is None
+            else html.escape(translations.get(source, source), quote=False)
+            for literal, source in self.parts
+        )
+
+
+def split_html(document: str, max_segment_chars: int) -> HtmlSegments:
+    """Split ``document`` into markup and text segments of bounded length."""
+
+    segments = HtmlSegments()
+
+    def add_text(raw: str) -> None:
+        for piece in _split_long(html.unescape(raw), max_segment_chars):
+            core = piece.strip()
+            if not core:
+                segments.parts.append((html.escape(piece, quote=False), None))
+                continue
+            start = piece.index(core)
+            if start:
+                segments.parts.append((piece[:start], None))
+            segments.parts.append(("", core))
+            if start + len(core) < len(piece):
+                segments.parts.append((piece[start + len(core) :], None))
+
+    position = 0
+    for match in _MARKUP.finditer(document):
+        if match.start() > position:
+            add_text(document[position : match.start()])
+        segments.parts.append((match.group(0), None))
+        position = match.end()
+    if position < len(document):
+        add_text(document[position:])
+    return segments
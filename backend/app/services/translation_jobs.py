@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import exists
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.domain import Product, ProductLocalizedInfo
+from app.services.translation_providers import (
+    TranslationProviderRegistry,
+    get_translation_providers,
+)
+from app.services.translation_service import (
+    TranslationBudgetExceeded,
+    TranslationError,
+    TranslationService,
+)
+
+# Per-product errors kept on a job; counts are always exact.
+MAX_JOB_ERRORS = 50
+
+
+@dataclass
+class TranslationJob:
+    id: str
+    target_locale: str
+    provider: str
+    total: int
+    force: bool = False
+    status: str = "queued"
+    translated: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    deferred_until: Optional[datetime] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, product_id: int, error: Optional[Exception] = None) -> None:
+        with self._lock:
+            if error is None:
+                self.translated += 1
+                return
+            self.failed += 1
+            if len(self.errors) < MAX_JOB_ERRORS:
+                self.errors.append({"product_id": product_id, "error": str(error)})
+
+    def fail(self, error: BaseException) -> None:
+        """Mark the whole job failed, keeping ``error`` as a job-level entry."""
+
+        with self._lock:
+            self.status = "failed"
+            self.errors.append({"product_id": None, "error": str(error)})
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            processed = self.translated + self.failed
+            return {
+                "id": self.id,
+                "status": self.status,
+                "target_locale": self.target_locale,
+                "provider": self.provider,
+                "force": self.force,
+                "total": self.total,
+                "translated": self.translated,
+                "failed": self.failed,
+                "progress": round(processed / self.total, 4) if self.total else 1.0,
+                "errors": list(self.errors),
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "deferred_until": self.deferred_until,
+            }
+
+
+def select_products_for_translation(
+    session: Session,
+    *,
+    product_ids: Optional[List[int]] = None,
+    source_site: Optional[str] = None,
+    untranslated_only: bool = False,
+    target_locale: str = "ko-KR",
+    limit: Optional[int] = None,
+) -> List[int]:
+    query = session.query(Product.id)
+    if product_ids:
+        query = query.filter(Product.id.in_(product_ids))
+    if source_site:
+        query = query.filter(Product.source_site == source_site.upper())
+    if untranslated_only:
+        query = query.filter(
+            ~exists().where(
+                ProductLocalizedInfo.product_id == Product.id,
+                ProductLocalizedInfo.locale == target_locale,
+            )
+        )
+    query = query.order_by(Product.id)
+    if limit:
+        query = query.limit(limit)
+    return [product_id for (product_id,) in query.all()]
+
+
+class TranslationJobManager:
+    """Run catalog translations in the background with bounded parallelism.
+
+    Product ids are split into chunks of ``chunk_size``; up to ``workers``
+    chunks run at once in worker threads, each with its own session. A chunk
+    first sends its missing source strings to the provider with no
+    transaction open (bounded per provider by the provider registry), then applies
+    the translations - now all memory hits - under a manager-wide write lock
+    and commits once. The lock keeps SQLite from failing lock upgrades between
+    workers; the slow provider round trips still overlap. Each product runs in
+    a savepoint so one failure does not discard its neighbours.
+
+    A chunk that would overrun the provider's daily character budget is
+    rejected before any provider call; the job turns ``deferred`` and the
+    chunk is retried once the budget has room again (after the UTC reset),
+    instead of failing the rest of the run. If a chunk fails outright, no
+    further chunks start and the job is marked ``failed`` only after the
+    chunks already running have finished.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        *,
+        workers: int | None = None,
+        chunk_size: int | None = None,
+        poll_seconds: float | None = None,
+        providers: TranslationProviderRegistry | None = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.workers = workers or settings.translation_bulk_workers
+        self.chunk_size = chunk_size or settings.translation_bulk_chunk_size
+        self.poll_seconds = poll_seconds or settings.translation_budget_poll_seconds
+        self.providers = providers or get_translation_providers()
+        self.jobs: Dict[str, TranslationJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._write_lock = threading.Lock()
+
+    def submit(
+        self,
+        product_ids: List[int],
+        *,
+        target_locale: str,
+        provider: str,
+        force: bool = False,
+    ) -> TranslationJob:
+        job = TranslationJob(
+            id=uuid.uuid4().hex,
+            target_locale=target_locale,
+            provider=provider,
+            total=len(product_ids),
+            force=force,
+        )
+        self.jobs[job.id] = job
+        task = asyncio.get_running_loop().create_task(self.run(job, product_ids))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    def get(self, job_id: str) -> Optional[TranslationJob]:
+        return self.jobs.get(job_id)
+
+    async def wait(self, job_id: str) -> None:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.shield(task)
+
+    async def run(self, job: TranslationJob, product_ids: List[int]) -> None:
+        job.status = "running"
+        job.started_at = datetime.utcnow()
+        semaphore = asyncio.Semaphore(self.workers)
+        aborted = asyncio.Event()
+
+        async def run_chunk(chunk: List[int]) -> None:
+            async with semaphore:
+                while not aborted.is_set():
+                    try:
+                        await asyncio.to_thread(self._translate_chunk, job, chunk)
+                        return
+                    except TranslationBudgetExceeded as exc:
+                        if not await self._wait_for_budget(job, exc, aborted):
+                            for product_id in chunk:
+                                job.record(product_id, exc)
+                            return
+                    except Exception:
+                        aborted.set()
+                        raise
+
+        chunks = [
+            product_ids[start : start + self.chunk_size]
+            for start in range(0, len(product_ids), self.chunk_size)
+        ]
+        try:
+            # Worker threads cannot be cancelled; let running chunks finish so
+            # nothing writes after the final status is set.
+            results = await asyncio.gather(
+                *(run_chunk(chunk) for chunk in chunks), return_exceptions=True
+            )
+            failures = [result for result in results if isinstance(result, BaseException)]
+            if failures:
+                # Nobody awaits the task; keep the failure on the job handle instead.
+                job.fail(failures[0])
+            else:
+                job.status = "completed"
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    async def _wait_for_budget(
+        self, job: TranslationJob, exc: TranslationBudgetExceeded, aborted: asyncio.Event
+    ) -> bool:
+        """Defer ``job`` until the budget fits the rejected chunk; ``False`` if it never will."""
+
+        budget = self.providers.metrics.budget
+        if budget.limit and exc.needed > budget.limit:
+            return False
+        job.status = "deferred"
+        job.deferred_until = exc.resets_at
+        while not budget.has_room(exc.provider, exc.needed) and not aborted.is_set():
+            await asyncio.sleep(self.poll_seconds)
+        job.status = "running"
+        job.deferred_until = None
+        return True
+
+    def _translate_chunk(self, job: TranslationJob, product_ids: List[int]) -> None:
+        """Translate one chunk; outcomes are recorded on ``job`` only once committed.
+
+        Raises ``TranslationBudgetExceeded`` when the budget runs out so the
+        caller can defer and retry the whole chunk; translations fetched
+        before that are kept in memory for the retry.
+        """
+
+        session = self.session_factory()
+        target_language = job.target_locale.split("-")[0]
+        try:
+            service = TranslationService(session, providers=self.providers)
+            texts: Dict[int, List[str]] = {
+                product.id: service.source_texts(
+                    product, target_locale=job.target_locale, force=job.force
+                )
+                for product in session.query(Product).filter(Product.id.in_(product_ids))
+            }
+            failures: Dict[int, Exception] = {}
+            deferred: Optional[TranslationBudgetExceeded] = None
+            try:
+                fresh = service.request_missing_translations(
+                    [text for product_texts in texts.values() for text in product_texts],
+                    target_language,
+                    job.provider,
+                )
+            except TranslationBudgetExceeded:
+                raise
+            except TranslationError:
+                # Retry product by product - still outside the write lock - to
+                # find which products fail.
+                fresh = {}
+                for product_id, product_texts in texts.items():
+                    try:
+                        fresh.update(
+                            service.request_missing_translations(
+                                product_texts, target_language, job.provider
+                            )
+                        )
+                    except TranslationBudgetExceeded as exc:
+                        deferred = exc
+                        break
+                    except TranslationError as exc:
+                        failures[product_id] = exc
+
+            outcomes: Dict[int, Optional[Exception]] = {}
+            with self._write_lock:
+                service.memory.store_many(session, fresh, target_language, job.provider)
+                if deferred is not None:
+                    session.commit()
+                    raise deferred
+                for product_id in product_ids:
+                    if product_id in failures:
+                        outcomes[product_id] = failures[product_id]
+                        continue
+                    try:
+                        with session.begin_nested():
+                            service.translate_product(
+                                product_id,
+                                target_locale=job.target_locale,
+                                provider=job.provider,
+                                force=job.force,
+                            )
+                    except TranslationBudgetExceeded:
+                        raise
+                    except (LookupError, TranslationError) as exc:
+                        outcomes[product_id] = exc
+                    else:
+                        outcomes[product_id] = None
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+        for product_id, error in outcomes.items():
+            job.record(product_id, error)
+
+
+_default_manager: TranslationJobManager | None = None
+
+
+def get_translation_job_manager() -> TranslationJobManager:
+    """Return the process-wide translation job manager (FastAPI dependency)."""
+
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = TranslationJobManager(SessionLocal)
+    return _default_manager
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Mapping, Set
+
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.domain import TranslationMemoryEntry
+
+# Keeps ``IN (...)`` lists well under SQLite's bound-parameter limit.
+LOOKUP_CHUNK_SIZE = 500
+
+MemoryKey = tuple[str, str, str]
+
+
+def source_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class TranslationMemoryStats:
+    lru_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
+    writes: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        data: dict[str, float] = asdict(self)
+        lookups = self.lru_hits + self.db_hits + self.misses
+        data["hit_rate"] = round((self.lru_hits + self.db_hits) / lookups, 4) if lookups else 0.0
+        return data
+
+
+class TranslationMemory:
+    """Translation memory keyed by ``(source hash, target language, provider)``.
+
+    Lookups hit a bounded in-process LRU first and then the
+    ``translation_memory`` table in one query per chunk; stored translations
+    are written to both. The table is the source of truth, so every worker
+    process converges on the same entries.
+    """
+
+    def __init__(self, lru_size: int = 20_000) -> None:
+        self.lru_size = lru_size
+        self.stats = TranslationMemoryStats()
+        self._lru: "OrderedDict[MemoryKey, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup_many(
+        self, session: Session, texts: Iterable[str], target_lang: str, provider: str
+    ) -> Dict[str, str]:
+        """Return the remembered translation of every known text in ``texts``."""
+
+        found: Dict[str, str] = {}
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for text in dict.fromkeys(texts):
+                key = (source_hash(text), target_lang, provider)
+                cached = self._lru.get(key)
+                if cached is None:
+                    missing[key[0]] = text
+                    continue
+                self._lru.move_to_end(key)
+                found[text] = cached
+            self.stats.lru_hits += len(found)
+
+        hashes = list(missing)
+        db_found: Dict[str, str] = {}
+        for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            rows = (
+                session.query(TranslationMemoryEntry.source_hash, TranslationMemoryEntry.translated_text)
+                .filter(
+                    TranslationMemoryEntry.target_lang == target_lang,
+                    TranslationMemoryEntry.provider == provider,
+                    TranslationMemoryEntry.source_hash.in_(hashes[start : start + LOOKUP_CHUNK_SIZE]),
+                )
+                .all()
+            )
+            for hash_value, translated in rows:
+                db_found[missing[hash_value]] = translated
+
+        with self._lock:
+            for text, translated in db_found.items():
+                self._remember((source_hash(text), target_lang, provider), translated)
+            self.stats.db_hits += len(db_found)
+            self.stats.misses += len(missing) - len(db_found)
+        found.update(db_found)
+        return found
+
+    def store_many(
+        self,
+        session: Session,
+        translations: Mapping[str, str],
+        target_lang: str,
+        provider: str,
+    ) -> None:
+        """Persist new translations; entries another writer stored first are kept.
+
+        On SQLite and PostgreSQL each row is an ``INSERT ... ON CONFLICT DO
+        NOTHING``, so a key a concurrent writer stored in the meantime is
+        skipped without aborting the caller's transaction; other databases
+        insert each row in its own SAVEPOINT. Only rows actually written are
+        cached, so the LRU never disagrees with the table.
+        """
+
+        if not translations:
+            return
+        rows = {source_hash(text): (text, translated) for text, translated in translations.items()}
+        existing = self._existing_hashes(session, list(rows), target_lang, provider)
+        written: Dict[str, str] = {}
+        for hash_value, (text, translated) in rows.items():
+            if hash_value in existing:
+                continue
+            values = dict(
+                source_hash=hash_value,
+                target_lang=target_lang,
+                provider=provider,
+                source_text=text,
+                translated_text=translated,
+            )
+            if self._insert_ignoring_conflict(session, values):
+                written[hash_value] = translated
+
+        with self._lock:
+            for hash_value, translated in written.items():
+                self._remember((hash_value, target_lang, provider), translated)
+            self.stats.writes += len(written)
+
+    @staticmethod
+    def _insert_ignoring_conflict(session: Session, values: dict) -> bool:
+        """Insert one entry unless its key exists; return whether a row was written."""
+
+        dialect = session.get_bind().dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            module = sqlite if dialect == "sqlite" else postgresql
+            statement = (
+                module.insert(TranslationMemoryEntry)
+                .values(**values)
+                .on_conflict_do_nothing(
+                    index_elements=["source_hash", "target_lang", "provider"]
+                )
+            )
+            return session.execute(statement).rowcount == 1
+        try:
+            with session.begin_nested():
+                session.execute(insert(TranslationMemoryEntry).values(**values))
+        except IntegrityError:
+            return False
+        return True
+
+    @staticmethod
+    def _existing_hashes(
+        session: Session, hashes: List[str], target_lang: str, provider: str
+    ) -> Set[str]:
+        existing: Set[str] = set()
+        for start in range(0, len(hashes), LOOKUP_CHUNK_SIZE):
+            existing.update(
+                hash_value
+                for (hash_value,) in session.query(TranslationMemoryEntry.source_hash).filter(
+                    TranslationMemoryEntry.target_lang == target_lang,
+                    TranslationMemoryEntry.provider == provider,
+                    TranslationMemoryEntry.source_hash.in_(hashes[start : start + LOOKUP_CHUNK_SIZE]),
+                )
+            )
+        return existing
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self.stats = TranslationMemoryStats()
+
+    def _remember(self, key: MemoryKey, translated: str) -> None:
+        self._lru[key] = translated
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+
+_default_memory: TranslationMemory | None = None
+
+
+def get_translation_memory() -> TranslationMemory:
+    """Return the process-wide translation memory."""
+
+    global _default_memory
+    if _default_memory is None:
+        _default_memory = TranslationMemory(settings.translation_memory_lru_size)
+    return _default_memory
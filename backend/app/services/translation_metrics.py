@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Callable, Dict, List
+
+from app.config import settings
+
+# Upper bounds (milliseconds) of the provider latency histogram buckets.
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class ProviderMetrics:
+    """Counters for one translation provider since process start."""
+
+    calls: int = 0
+    segments: int = 0
+    characters: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    latency_sum_ms: float = 0.0
+    latency_buckets: List[int] = field(
+        default_factory=lambda: [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    )
+
+    def observe(self, seconds: float) -> None:
+        milliseconds = seconds * 1000
+        self.latency_sum_ms += milliseconds
+        self.latency_buckets[bisect_left(LATENCY_BUCKETS_MS, milliseconds)] += 1
+
+    def as_dict(self) -> dict:
+        bounds = [str(bound) for bound in LATENCY_BUCKETS_MS] + ["+Inf"]
+        return {
+            "calls": self.calls,
+            "segments": self.segments,
+            "characters": self.characters,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "latency_ms": {
+                "count": self.calls,
+                "sum": round(self.latency_sum_ms, 3),
+                "mean": round(self.latency_sum_ms / self.calls, 3) if self.calls else 0.0,
+                "buckets": dict(zip(bounds, self.latency_buckets)),
+            },
+        }
+
+
+class DailyCharacterBudget:
+    """Per-provider character allowance that resets at UTC midnight.
+
+    ``limit`` of ``0`` disables the budget. Usage is counted in this process
+    only, so run bulk translation from a single worker when a budget is set.
+    """
+
+    def __init__(self, limit: int, *, clock: Callable[[], datetime] = _utcnow) -> None:
+        self.limit = limit
+        self.clock = clock
+        self._day: date = clock().date()
+        self._used: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _roll(self) -> None:
+        today = self.clock().date()
+        if today != self._day:
+            self._day = today
+            self._used = {}
+
+    def resets_at(self) -> datetime:
+        return datetime.combine(self._day + timedelta(days=1), time.min, tzinfo=timezone.utc)
+
+    def remaining(self, provider: str) -> int | None:
+        if not self.limit:
+            return None
+        with self._lock:
+            self._roll()
+            return max(0, self.limit - self._used.get(provider, 0))
+
+    def has_room(self, provider: str, characters: int) -> bool:
+        remaining = self.remaining(provider)
+        return remaining is None or characters <= remaining
+
+    def reserve(self, provider: str, characters: int) -> bool:
+        """Count ``characters`` against today's budget; ``False`` if they do not fit."""
+
+        with self._lock:
+            self._roll()
+            used = self._used.get(provider, 0)
+            if self.limit and used + characters > self.limit:
+                return False
+            self._used[provider] = used + characters
+            return True
+
+    def release(self, provider: str, characters: int) -> None:
+        """Return characters of a request the provider rejected."""
+
+        with self._lock:
+            self._used[provider] = max(0, self._used.get(provider, 0) - characters)
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            self._roll()
+            return {
+                "limit": self.limit or None,
+                "date": self._day.isoformat(),
+                "resets_at": self.resets_at(),
+                "used": dict(self._used),
+            }
+
+
+class TranslationMetrics:
+    """Per-provider call, volume, latency, error and cache counters plus the budget."""
+
+    def __init__(self, budget: DailyCharacterBudget | None = None) -> None:
+        self.budget = budget or DailyCharacterBudget(settings.translation_daily_char_budget)
+        self.providers: Dict[str, ProviderMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _metrics(self, provider: str) -> ProviderMetrics:
+        metrics = self.providers.get(provider)
+        if metrics is None:
+            metrics = self.providers[provider] = ProviderMetrics()
+        return metrics
+
+    def record_call(
+        self, provider: str, texts: List[str], seconds: float, *, error: bool = False
+    ) -> None:
+        with self._lock:
+            metrics = self._metrics(provider)
+            metrics.calls += 1
+            metrics.segments += len(texts)
+            metrics.characters += sum(len(text) for text in texts)
+            metrics.errors += int(error)
+            metrics.observe(seconds)
+
+    def record_cache_hits(self, provider: str, hits: int) -> None:
+        if not hits:
+            return
+        with self._lock:
+            self._metrics(provider).cache_hits += hits
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            providers = {name: metrics.as_dict() for name, metrics in self.providers.items()}
+        return {"providers": providers, "daily_budget": self.budget.as_dict()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.providers = {}
+
+
+_default_metrics: TranslationMetrics | None = None
+
+
+def get_translation_metrics() -> TranslationMetrics:
+    """Return the process-wide translation metrics."""
+
+    global _default_metrics
+    if _default_metrics is None:
+        _default_metrics = TranslationMetrics()
+    return _default_metrics
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import re
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, FrozenSet, Iterable, Optional
+
+# Letter scripts a target language is written in; text whose letters all fall
+# in these (and that uses the language's own script) is already translated.
+TARGET_SCRIPTS: Dict[str, FrozenSet[str]] = {
+    "ko": frozenset({"hangul", "latin"}),
+    "ja": frozenset({"kana", "han", "latin"}),
+    "zh": frozenset({"han", "latin"}),
+    "en": frozenset({"latin"}),
+}
+PRIMARY_SCRIPT = {"ko": "hangul", "ja": "kana", "zh": "han", "en": "latin"}
+
+# Apparel/shoe size tokens: S, XL, XXL, 3XL, XS, F, FREE ...
+_SIZE_TOKEN = re.compile(r"^(?:\d?X{0,4}[SML]|XS|F|FREE)$", re.IGNORECASE)
+_TOKEN_SPLIT = re.compile(r"[\s/,;|]+")
+_PART_SPLIT = re.compile(r"[^0-9A-Za-z]+")
+
+
+def char_script(char: str) -> Optional[str]:
+    """Return the script of a letter, or ``None`` for digits, spaces and symbols."""
+
+    if not char.isalpha():
+        return None
+    code = ord(char)
+    if 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F:
+        return "hangul"
+    if 0x3040 <= code <= 0x30FF or 0x31F0 <= code <= 0x31FF or 0xFF66 <= code <= 0xFF9F:
+        return "kana"
+    if (
+        0x4E00 <= code <= 0x9FFF
+        or 0x3400 <= code <= 0x4DBF
+        or 0xF900 <= code <= 0xFAFF
+        or 0x20000 <= code <= 0x2FFFF
+    ):
+        return "han"
+    if code <= 0x024F or 0xFF21 <= code <= 0xFF5A or 0x1E00 <= code <= 0x1EFF:
+        return "latin"
+    return "other"
+
+
+def _is_code_token(token: str) -> bool:
+    """A model/SKU code (``AB-1234``) or a size (``XXL``, ``S-M``); plain words are not."""
+
+    if any(char.isdigit() for char in token):
+        return True
+    parts = [part for part in _PART_SPLIT.split(token) if part]
+    return bool(parts) and all(_SIZE_TOKEN.match(part) for part in parts)
+
+
+def needs_translation(text: str, target_lang: str) -> bool:
+    """Decide from character ranges alone whether ``text`` must go to a provider.
+
+    Text without letters (numbers, prices, punctuation), ASCII codes containing
+    digits and sizes such as ``AB-1234`` or ``XXL``, and text already written in
+    the target language's script are passed through unchanged. All-caps words
+    such as ``NEW ARRIVAL`` are still translated.
+    """
+
+    scripts = {script for script in map(char_script, text) if script}
+    if not scripts:
+        return False
+    if scripts == {"latin"} and text.isascii():
+        if all(_is_code_token(token) for token in _TOKEN_SPLIT.split(text) if token):
+            return False
+    allowed = TARGET_SCRIPTS.get(target_lang)
+    if allowed is not None and PRIMARY_SCRIPT[target_lang] in scripts and scripts <= allowed:
+        return False
+    return True
+
+
+@dataclass
+class PassthroughStats:
+    checked: int = 0
+    skipped: int = 0
+    skipped_chars: int = 0
+
+    def as_dict(self) -> dict[str, float]:
+        data: dict[str, float] = asdict(self)
+        data["skip_rate"] = round(self.skipped / self.checked, 4) if self.checked else 0.0
+        return data
+
+
+class PassthroughFilter:
+    """Counts the provider calls saved by ``needs_translation``."""
+
+    def __init__(self) -> None:
+        self.stats = PassthroughStats()
+        self._lock = threading.Lock()
+
+    def untranslatable(self, texts: Iterable[str], target_lang: str) -> Dict[str, str]:
+        """Return ``{text: text}`` for every text that should not be translated."""
+
+        checked = 0
+        found: Dict[str, str] = {}
+        for text in texts:
+            checked += 1
+            if not needs_translation(text, target_lang):
+                found[text] = text
+        with self._lock:
+            self.stats.checked += checked
+            self.stats.skipped += len(found)
+            self.stats.skipped_chars += sum(len(text) for text in found)
+        return found
+
+    def reset(self) -> None:
+        with self._lock:
+            self.stats = PassthroughStats()
+
+
+_default_filter: PassthroughFilter | None = None
+
+
+def get_passthrough_filter() -> PassthroughFilter:
+    """Return the process-wide passthrough filter."""
+
+    global _default_filter
+    if _default_filter is None:
+        _default_filter = PassthroughFilter()
+    return _default_filter
@@ -0,0 +1,345 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.config import settings
+from app.services.translation_metrics import TranslationMetrics, get_translation_metrics
+
+T = TypeVar("T")
+
+GOOGLE_TRANSLATE_URL = "https://translation.googleapis.com/language/translate/v2"
+GOOGLE_TRANSLATE_SCOPE = "https://www.googleapis.com/auth/cloud-translation"
+# "text": plain (unescaped) strings; "html": markup the provider must keep intact.
+TEXT_FORMATS = ("text", "html")
+
+
+class TranslationError(RuntimeError):
+    """Raised when translation cannot be performed."""
+
+
+class TranslationBudgetExceeded(TranslationError):
+    """Raised before a request that would exceed the daily character budget."""
+
+    def __init__(self, provider: str, needed: int, remaining: int, resets_at: datetime) -> None:
+        super().__init__(
+            f"Daily translation budget for {provider} exhausted: "
+            f"{needed} characters needed, {remaining} left until {resets_at.isoformat()}"
+        )
+        self.provider = provider
+        self.needed = needed
+        self.remaining = remaining
+        self.resets_at = resets_at
+
+
+class TranslationProvider(ABC):
+    """A machine-translation backend reachable with batched async requests."""
+
+    name: str
+
+    @abstractmethod
+    async def translate_batch(
+        self, texts: List[str], target_language: str, *, text_format: str = "text"
+    ) -> List[str]:
+        """Translate ``texts`` in one request, returning results in input order.
+
+        ``text_format`` is one of ``TEXT_FORMATS``; ``"html"`` results are HTML.
+        """
+
+    async def aclose(self) -> None:
+        """Release pooled connections."""
+
+
+class GoogleTranslationProvider(TranslationProvider):
+    """Google Cloud Translation v2 over a pooled, keep-alive ``httpx.AsyncClient``.
+
+    Authenticates with ``TRANSLATION_API_KEY`` when set and otherwise with
+    application-default credentials (``GOOGLE_APPLICATION_CREDENTIALS``),
+    refreshing the bearer token off the event loop when it expires.
+    """
+
+    name = "gcloud"
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        credentials_path: Optional[str] = None,
+        *,
+        timeout: Optional[float] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.api_key = api_key
+        self.credentials_path = credentials_path
+        self.timeout = timeout or settings.translation_provider_timeout_seconds
+        self._client = http_client
+        self._credentials: Any = None
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            pool = max(1, settings.translation_provider_concurrency)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=pool, max_keepalive_connections=pool),
+            )
+        return self._client
+
+    async def _auth(self) -> Tuple[Dict[str, str], Dict[str, str]]:
+        if self.api_key:
+            return {"key": self.api_key}, {}
+        if self._credentials is None:
+            self._credentials = await asyncio.to_thread(self._load_credentials)
+        if not self._credentials.valid:
+            from google.auth.transport.requests import Request
+
+            await asyncio.to_thread(self._credentials.refresh, Request())
+        return {}, {"Authorization": f"Bearer {self._credentials.token}"}
+
+    def _load_credentials(self) -> Any:
+        import google.auth
+        from google.auth.exceptions import DefaultCredentialsError
+
+        if self.credentials_path:
+            os.environ.setdefault("GOOGLE_APPLICATION_CREDENTIALS", self.credentials_path)
+        # In test/dev environments without credentials, surface a translation
+        # failure deterministically instead of a credentials error.
+        try:
+            credentials, _ = google.auth.default(scopes=[GOOGLE_TRANSLATE_SCOPE])
+        except DefaultCredentialsError as exc:
+            raise TranslationError("Translation client not available") from exc
+        return credentials
+
+    async def translate_batch(
+        self, texts: List[str], target_language: str, *, text_format: str = "text"
+    ) -> List[str]:
+        params, headers = await self._auth()
+        try:
+            response = await self._http_client().post(
+                GOOGLE_TRANSLATE_URL,
+                params=params,
+                headers=headers,
+                json={"q": texts, "target": target_language, "format": text_format},
+            )
+            response.raise_for_status()
+            items = response.json()["data"]["translations"]
+        except (httpx.HTTPError, KeyError, ValueError) as exc:
+            raise TranslationError("Translation request failed") from exc
+        return [item["translatedText"] for item in items]
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class FakeTranslationProvider(TranslationProvider):
+    """Deterministic local provider for tests and benchmarks.
+
+    Returns ``template`` formatted with each text and the target language
+    after ``latency`` seconds, and records every batch it receives (and its
+    format) along with the peak number of batches in flight.
+    """
+
+    def __init__(
+        self, name: str = "fake", template: str = "[{lang}] {text}", latency: float = 0.0
+    ) -> None:
+        self.name = name
+        self.template = template
+        self.latency = latency
+        self.requests: List[List[str]] = []
+        self.formats: List[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def translate_batch(
+        self, texts: List[str], target_language: str, *, text_format: str = "text"
+    ) -> List[str]:
+        self.requests.append(list(texts))
+        self.formats.append(text_format)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        return [self.template.format(text=text, lang=target_language) for text in texts]
+
+
+def default_provider_factories() -> Dict[str, Callable[[], TranslationProvider]]:
+    factories: Dict[str, Callable[[], TranslationProvider]] = {
+        "gcloud": lambda: GoogleTranslationProvider(
+            settings.translation_api_key, settings.google_application_credentials
+        ),
+    }
+    if settings.translation_fake_provider_enabled:
+        factories["fake"] = lambda: FakeTranslationProvider(
+            latency=settings.translation_fake_provider_latency_ms / 1000
+        )
+    return factories
+
+
+class TranslationProviderRegistry:
+    """Process-wide owner of translation providers and the loop they run on.
+
+    Providers are built once on first use and run on a dedicated event-loop
+    thread, so their pooled connections are shared by sync request handlers,
+    async routes and background job threads alike. ``translate`` blocks the
+    calling thread and ``atranslate`` awaits; both fan the batches of one
+    call out concurrently, with at most ``concurrency`` requests in flight
+    per provider across the whole process.
+    """
+
+    def __init__(
+        self,
+        factories: Optional[Dict[str, Callable[[], TranslationProvider]]] = None,
+        *,
+        concurrency: Optional[int] = None,
+        metrics: Optional[TranslationMetrics] = None,
+    ) -> None:
+        self.factories = default_provider_factories() if factories is None else factories
+        self.concurrency = concurrency
+        self.metrics = metrics or get_translation_metrics()
+        self.providers: Dict[str, TranslationProvider] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def names(self) -> Tuple[str, ...]:
+        return tuple(dict.fromkeys([*self.factories, *self.providers]))
+
+    def get(self, name: str) -> TranslationProvider:
+        with self._lock:
+            provider = self.providers.get(name)
+            if provider is None:
+                factory = self.factories.get(name)
+                if factory is None:
+                    raise LookupError(f"Unknown translation provider: {name}")
+                provider = self.providers[name] = factory()
+            return provider
+
+    def translate(
+        self,
+        name: str,
+        batches: List[List[str]],
+        target_language: str,
+        *,
+        text_format: str = "text",
+    ) -> List[List[str]]:
+        """Translate ``batches`` from a synchronous caller."""
+
+        coroutine = self._translate_batches(name, batches, target_language, text_format)
+        return self._submit(coroutine).result()
+
+    async def atranslate(
+        self,
+        name: str,
+        batches: List[List[str]],
+        target_language: str,
+        *,
+        text_format: str = "text",
+    ) -> List[List[str]]:
+        """Translate ``batches`` from a coroutine running on any event loop."""
+
+        coroutine = self._translate_batches(name, batches, target_language, text_format)
+        return await asyncio.wrap_future(self._submit(coroutine))
+
+    async def _translate_batches(
+        self, name: str, batches: List[List[str]], target_language: str, text_format: str
+    ) -> List[List[str]]:
+        if text_format not in TEXT_FORMATS:
+            raise ValueError(f"Unsupported text format: {text_format}")
+        provider = self.get(name)
+        semaphore = self._semaphore(name)
+        budget = self.metrics.budget
+        characters = sum(len(text) for batch in batches for text in batch)
+        if not budget.reserve(name, characters):
+            raise TranslationBudgetExceeded(
+                name, characters, budget.remaining(name) or 0, budget.resets_at()
+            )
+
+        async def send(batch: List[str]) -> List[str]:
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    translated = await provider.translate_batch(
+                        batch, target_language, text_format=text_format
+                    )
+                    if len(translated) != len(batch):
+                        raise TranslationError("Translation response size mismatch")
+                except Exception:
+                    self.metrics.record_call(
+                        name, batch, time.perf_counter() - started, error=True
+                    )
+                    budget.release(name, sum(len(text) for text in batch))
+                    raise
+            self.metrics.record_call(name, batch, time.perf_counter() - started)
+            return translated
+
+        return list(await asyncio.gather(*(send(batch) for batch in batches)))
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            limit = self.concurrency or settings.translation_provider_concurrency
+            semaphore = self._semaphores[name] = asyncio.Semaphore(max(1, limit))
+        return semaphore
+
+    def _submit(self, coroutine: Coroutine[Any, Any, T]) -> "Future[T]":
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("Cannot wait on translation providers from their own loop")
+        return asyncio.run_coroutine_threadsafe(coroutine, loop)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="translation-providers", daemon=True
+                )
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def close(self) -> None:
+        """Close every provider and stop the loop thread."""
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            providers = list(self.providers.values())
+            self._loop = self._thread = None
+            self.providers = {}
+            self._semaphores = {}
+        if loop is None:
+            return
+
+        async def close_all() -> None:
+            for provider in providers:
+                await provider.aclose()
+
+        asyncio.run_coroutine_threadsafe(close_all(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join()
+        loop.close()
+
+
+_registry: TranslationProviderRegistry | None = None
+
+
+def get_translation_providers() -> TranslationProviderRegistry:
+    """Return the process-wide translation provider registry."""
+
+    global _registry
+    if _registry is None:
+        _registry = TranslationProviderRegistry()
+    return _registry
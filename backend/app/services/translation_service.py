@@ -1,86 +1,276 @@
 from __future__ import annotations
 
-import os
-from typing import List
-
-from google.cloud import translate_v2 as translate
-from google.auth.exceptions import DefaultCredentialsError
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models.domain import Product, ProductLocalizedInfo, ProductOption
-
-
-class TranslationError(RuntimeError):
-    """Raised when translation cannot be performed."""
+from app.models.domain import (
+    Product,
+    ProductLocalizedInfo,
+    ProductOption,
+)
+from app.services.product_variants import VariantLabels
+from app.services.translation_glossary import GlossaryStore, get_glossary_store
+from app.services.translation_html import HtmlSegments, split_html
+from app.services.translation_memory import (
+    TranslationMemory,
+    get_translation_memory,
+    source_hash,
+)
+from app.services.translation_passthrough import PassthroughFilter, get_passthrough_filter
+from app.services.translation_providers import (
+    TranslationBudgetExceeded,
+    TranslationError,
+    TranslationProviderRegistry,
+    get_translation_providers,
+)
 
 
 class UnsupportedTranslationProviderError(ValueError):
     """Raised when a translation provider is not supported."""
 
 
+# ``(row, attribute, hash attribute, source text)``; ``row`` is ``None`` for a
+# localization that does not exist yet.
+StaleField = Tuple[Optional[Any], str, str, str]
+
+
+def translation_source_hash(text: str, target_language: str) -> str:
+    """Hash recorded next to a translated field to detect source changes."""
+
+    return source_hash(f"{target_language}\x00{text}")
+
+
 class TranslationService:
-    def __init__(self, session: Session) -> None:
+    def __init__(
+        self,
+        session: Session,
+        memory: TranslationMemory | None = None,
+        glossary: GlossaryStore | None = None,
+        passthrough: PassthroughFilter | None = None,
+        providers: TranslationProviderRegistry | None = None,
+    ) -> None:
         self.session = session
+        self.memory = memory or get_translation_memory()
+        self.glossary = glossary or get_glossary_store()
+        self.passthrough = passthrough or get_passthrough_filter()
+        self.providers = providers or get_translation_providers()
         self.provider = settings.translation_provider.lower()
-        self.translation_api_key = settings.translation_api_key
-        self.google_credentials = settings.google_application_credentials
-        self._client: translate.Client | None = None
-        self.supported_providers: tuple[str, ...] = ("gcloud",)
-
-    def _get_gcloud_client(self) -> translate.Client:
-        if not self._client:
-            client_kwargs: dict[str, str] = {}
-            if self.google_credentials:
-                os.environ.setdefault(
-                    "GOOGLE_APPLICATION_CREDENTIALS", self.google_credentials
-                )
-            if self.translation_api_key:
-                client_kwargs["api_key"] = self.translation_api_key
-
-            # In test/dev environments where credentials are not provided, allow
-            # the caller to surface translation failures deterministically
-            # instead of raising DefaultCredentialsError here.
-            try:
-                self._client = translate.Client(**client_kwargs)
-            except DefaultCredentialsError:
-                self._client = None
-        return self._client
 
-    def _translate_text(
-        self, text: str, target_language: str, provider: str | None = None
-    ) -> str:
-        if not text:
-            return ""
+    @property
+    def supported_providers(self) -> tuple[str, ...]:
+        return self.providers.names()
+
+    def check_provider(self, provider: str | None) -> str:
         provider = (provider or self.provider).lower()
         if provider not in self.supported_providers:
             supported = ", ".join(self.supported_providers)
             raise UnsupportedTranslationProviderError(
                 f"Unsupported translation provider: {provider}. Supported providers: {supported}"
             )
+        return provider
 
-        client = self._get_gcloud_client()
-        if client is None:
-            raise TranslationError("Translation client not available")
-
-        try:
-            response = client.translate(text, target_language=target_language)
-            return response["translatedText"]
-        except Exception as exc:  # pragma: no cover - passthrough for clarity
-            raise TranslationError("Translation request failed") from exc
+    def _translate_text(
+        self, text: str, target_language: str, provider: str | None = None
+    ) -> str:
+        if not text:
+            return ""
+        return self._translate_list([text], target_language, provider=provider)[0]
 
     def _translate_list(
         self, texts: List[str], target_language: str, provider: str | None = None
     ) -> List[str]:
+        """Translate ``texts`` with as few batch requests as the limits allow.
+
+        Empty strings are passed through, duplicates are sent once and texts
+        that need no translation, that the glossary covers or that the
+        translation memory knows are not sent at all; results are returned in
+        input order.
+        """
+
+        provider = self.check_provider(provider)
+        unique = list(dict.fromkeys(text for text in texts if text))
+        if not unique:
+            return ["" for _ in texts]
+
+        translated = self._resolve_locally(unique, target_language, provider)
+        pending = [text for text in unique if text not in translated]
+        if pending:
+            fresh = self._request_translations(pending, target_language, provider)
+            self.memory.store_many(self.session, fresh, target_language, provider)
+            translated.update(fresh)
+        return [translated[text] if text else "" for text in texts]
+
+    def _resolve_locally(
+        self, texts: List[str], target_language: str, provider: str
+    ) -> dict[str, str]:
+        """Passthrough text, then the glossary, then the translation memory."""
+
+        known = self.passthrough.untranslatable(texts, target_language)
+        remaining = [text for text in texts if text not in known]
+        known.update(self.glossary.translate_many(self.session, remaining, target_language))
+        remaining = [text for text in remaining if text not in known]
+        known.update(self.memory.lookup_many(self.session, remaining, target_language, provider))
+        self.providers.metrics.record_cache_hits(provider, len(known))
+        return known
+
+    def _request_translations(
+        self, texts: List[str], target_language: str, provider: str
+    ) -> dict[str, str]:
+        """Send ``texts`` to ``provider`` in concurrent batch requests.
+
+        The batches run on the process-wide provider registry, which reuses
+        pooled connections and caps in-flight requests per provider however
+        many callers are translating. Description segments are unescaped text
+        nodes, so every text goes out in the ``"text"`` format.
+        """
+
+        batches = list(self._chunk_texts(texts))
+        results = self.providers.translate(
+            provider, batches, target_language, text_format="text"
+        )
+        translated: dict[str, str] = {}
+        for batch, result in zip(batches, results):
+            translated.update(zip(batch, result))
+        return translated
+
+    def _chunk_texts(self, texts: List[str]) -> Iterator[List[str]]:
+        """Group texts into requests under the segment and character limits.
+
+        A single text longer than the character limit is sent on its own.
+        """
+
+        max_segments = max(1, settings.translation_batch_max_segments)
+        max_chars = max(1, settings.translation_batch_max_chars)
+        chunk: List[str] = []
+        size = 0
+        for text in texts:
+            if chunk and (len(chunk) >= max_segments or size + len(text) > max_chars):
+                yield chunk
+                chunk, size = [], 0
+            chunk.append(text)
+            size += len(text)
+        if chunk:
+            yield chunk
+
+    def source_texts(
+        self,
+        product: Product,
+        options: List[ProductOption] | None = None,
+        target_locale: str = "ko-KR",
+        force: bool = False,
+    ) -> List[str]:
+        """Return the source strings ``translate_product`` would send for ``product``.
+
+        Only fields whose source changed since their last translation into
+        ``target_locale`` are included, unless ``force`` is set.
+        """
+
+        localized = next(
+            (info for info in product.localizations if info.locale == target_locale), None
+        )
+        fields = self._stale_fields(product, options, localized, target_locale, force)
+        return self._segment_fields(fields)[0]
+
+    def _segment_fields(
+        self, fields: List[StaleField]
+    ) -> Tuple[List[str], Dict[int, HtmlSegments]]:
+        """Expand stale fields into provider texts.
+
+        Descriptions are HTML and are split into their text segments, keyed
+        by field index, so markup and images never reach the provider and no
+        single request exceeds the size limits.
+        """
+
+        texts: List[str] = []
+        documents: Dict[int, HtmlSegments] = {}
+        for index, (_, attribute, _, text) in enumerate(fields):
+            if attribute == "description":
+                documents[index] = split_html(text, settings.translation_html_segment_max_chars)
+                texts.extend(documents[index].texts)
+            else:
+                texts.append(text)
+        return texts, documents
+
+    def _stale_fields(
+        self,
+        product: Product,
+        options: List[ProductOption] | None,
+        localized: ProductLocalizedInfo | None,
+        target_locale: str,
+        force: bool,
+    ) -> List[StaleField]:
+        """List ``(row, attribute, hash attribute, source)`` for fields to translate.
+
+        The title and description come first, followed by the variant matrix
+        names and the names of options that are not labelled from it. A field
+        is stale when its stored source hash differs from its current source.
+        """
+
+        options = list(product.options) if options is None else options
+        target_language = target_locale.split("-")[0]
+        dimensions = list(product.variant_dimensions)
+        labels = VariantLabels(dimensions)
+        candidates: List[StaleField] = [
+            (localized, "title", "title_source_hash", product.raw_title),
+            (localized, "description", "description_source_hash", product.raw_description or ""),
+            *((dim, "localized_name", "localized_source_hash", dim.raw_name) for dim in dimensions),
+            *(
+                (value, "localized_name", "localized_source_hash", value.raw_name)
+                for dim in dimensions
+                for value in dim.values
+            ),
+            *(
+                (opt, "localized_name", "localized_source_hash", opt.raw_name)
+                for opt in options
+                if labels.option_value(opt) is None
+            ),
+        ]
         return [
-            self._translate_text(text, target_language, provider=provider)
-            for text in texts
+            (row, attribute, hash_attribute, text)
+            for row, attribute, hash_attribute, text in candidates
+            if text
+            and (
+                force
+                or row is None
+                or getattr(row, hash_attribute) != translation_source_hash(text, target_language)
+            )
         ]
 
+    def request_missing_translations(
+        self, texts: List[str], target_language: str, provider: str | None = None
+    ) -> dict[str, str]:
+        """Translate the ``texts`` the memory does not know, without storing them.
+
+        The session's transaction is ended before the provider is called so
+        bulk workers never hold database locks while waiting on the network;
+        callers persist the result with ``memory.store_many``.
+        """
+
+        provider = self.check_provider(provider)
+        unique = list(dict.fromkeys(text for text in texts if text))
+        known = self._resolve_locally(unique, target_language, provider)
+        self.session.rollback()
+        pending = [text for text in unique if text not in known]
+        if not pending:
+            return {}
+        return self._request_translations(pending, target_language, provider)
+
     def translate_product(
-        self, product_id: int, target_locale: str = "ko-KR", provider: str = "gcloud"
+        self,
+        product_id: int,
+        target_locale: str = "ko-KR",
+        provider: str = "gcloud",
+        force: bool = False,
     ) -> ProductLocalizedInfo:
+        """Translate a product's changed fields into ``target_locale``.
+
+        Each translated field stores the hash of its source, so calling this
+        again only sends fields whose source changed since; ``force``
+        re-translates everything.
+        """
+
         provider_to_use = provider or self.provider
         product: Product | None = self.session.get(Product, product_id)
         if not product:
@@ -93,23 +283,6 @@ class TranslationService:
         )
 
         target_language = target_locale.split("-")[0]
-        translated_title = self._translate_text(
-            product.raw_title, target_language, provider=provider_to_use
-        )
-        translated_description = self._translate_text(
-            product.raw_description or "",
-            target_language,
-            provider=provider_to_use,
-        )
-
-        raw_option_names = [opt.raw_name for opt in options]
-        translated_option_names = self._translate_list(
-            raw_option_names, target_language, provider=provider_to_use
-        )
-
-        for opt, translated in zip(options, translated_option_names):
-            opt.localized_name = translated
-            self.session.add(opt)
 
         localized = (
             self.session.query(ProductLocalizedInfo)
@@ -122,8 +295,28 @@ class TranslationService:
         if not localized:
             localized = ProductLocalizedInfo(product_id=product_id, locale=target_locale)
 
-        localized.title = translated_title
-        localized.description = translated_description or localized.description or ""
+        # Every stale title/description/dimension/value/option name goes out
+        # together in as few batch calls as the request limits allow; SKU
+        # options are then labelled from the matrix.
+        fields = self._stale_fields(product, options, localized, target_locale, force)
+        texts, documents = self._segment_fields(fields)
+        translated = self._translate_list(texts, target_language, provider=provider_to_use)
+        translations = dict(zip(texts, translated))
+
+        for index, (row, attribute, hash_attribute, text) in enumerate(fields):
+            document = documents.get(index)
+            value = translations[text] if document is None else document.join(translations)
+            setattr(row, attribute, value)
+            setattr(row, hash_attribute, translation_source_hash(text, target_language))
+        labels = VariantLabels(list(product.variant_dimensions))
+        for opt in options:
+            label = labels.option_value(opt)
+            if label is not None:
+                opt.localized_name = label
+            self.session.add(opt)
+
+        localized.title = localized.title or ""
+        localized.description = localized.description or ""
         localized.option_display_name_format = localized.option_display_name_format or "{option}"
 
         self.session.add(localized)
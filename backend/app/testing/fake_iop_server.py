@@ -0,0 +1,313 @@
+"""Local stand-in for the Taobao IOP gateway.
+
+Serves ``/product/get`` from recorded payloads (or synthetic ones) with
+configurable latency, error rate and throttling, so ``TaobaoClient`` can be
+pointed at it via ``TAOBAO_CALLBACK_URL`` for offline load tests::
+
+    cd backend
+    # record real responses while proxying to the gateway
+    python -m app.testing.fake_iop_server --record-dir ./iop_recordings \\
+        --upstream https://api.taobao.com/rest
+    # replay them with 80ms +/- 20ms latency, 2% errors and 50 req/s throttling
+    python -m app.testing.fake_iop_server --replay-dir ./iop_recordings \\
+        --latency-ms 80 --jitter-ms 20 --error-rate 0.02 --max-rps 50
+    TAOBAO_CALLBACK_URL=http://127.0.0.1:8899 uvicorn app.main:app
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+
+from app.services.iop_http import sign_request
+from app.services.resilience import RateLimitExceeded, TokenBucket
+
+PayloadFactory = Callable[[str], Dict[str, Any]]
+
+
+def default_payload(num_iid: str) -> Dict[str, Any]:
+    return {
+        "code": "0",
+        "data": {
+            "num_iid": num_iid,
+            "title": f"Fake item {num_iid}",
+            "price": "19.90",
+            "pic_urls": [f"https://img.example.com/{num_iid}/main.jpg"],
+            "sku_list": [
+                {"sku_id": f"{num_iid}-1", "sku_name": "红色;M", "price": "19.90"},
+                {"sku_id": f"{num_iid}-2", "sku_name": "黑色;L", "price": "21.90"},
+            ],
+        },
+    }
+
+
+@dataclass
+class FaultProfile:
+    """Latency and failure behaviour applied to every request."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    max_rps: float = 0.0
+
+    def delay_seconds(self, rng: random.Random) -> float:
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+
+class PayloadStore:
+    """Recorded ``/product/get`` payloads stored as ``<num_iid>.json`` files."""
+
+    def __init__(self, base_path: Path | str) -> None:
+        self.base_path = Path(base_path)
+
+    def load(self, num_iid: str) -> Optional[Dict[str, Any]]:
+        path = self.base_path / f"{num_iid}.json"
+        if not path.exists():
+            return None
+        with path.open("r", encoding="utf-8") as handle:
+            return json.load(handle)
+
+    def save(self, num_iid: str, payload: Dict[str, Any]) -> None:
+        self.base_path.mkdir(parents=True, exist_ok=True)
+        with (self.base_path / f"{num_iid}.json").open("w", encoding="utf-8") as handle:
+            json.dump(payload, handle, ensure_ascii=False, indent=2)
+
+
+class FakeIopServer:
+    """HTTP/1.1 keep-alive stand-in for the IOP gateway's ``/product/get``.
+
+    Payloads come from ``replay`` when a recording exists, otherwise from
+    ``payload_factory``. With ``upstream_url`` and ``record`` set, requests are
+    forwarded verbatim, with their method, query and body (the IOP signature
+    does not cover the host), and the responses saved for later replay. When ``app_secret`` is set, request
+    signatures are verified the same way the real gateway does.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        app_secret: Optional[str] = None,
+        payload_factory: PayloadFactory = default_payload,
+        replay: Optional[PayloadStore] = None,
+        record: Optional[PayloadStore] = None,
+        upstream_url: Optional[str] = None,
+        faults: Optional[FaultProfile] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        if record is not None and not upstream_url:
+            raise ValueError("Recording requires an upstream_url to proxy to")
+        self.app_secret = app_secret
+        self.payload_factory = payload_factory
+        self.replay = replay
+        self.record = record
+        self.upstream_url = upstream_url.rstrip("/") if upstream_url else None
+        self.faults = faults or FaultProfile()
+        self.requests = 0
+        self.connections = 0
+        self.errors_injected = 0
+        self.throttled = 0
+        self._rng = random.Random(seed)
+        self._bucket = (
+            TokenBucket(self.faults.max_rps, max(1.0, self.faults.max_rps))
+            if self.faults.max_rps > 0
+            else None
+        )
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeIopServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeIopServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def handle(
+        self,
+        api_name: str,
+        params: Dict[str, str],
+        *,
+        method: str = "GET",
+        query: Optional[str] = None,
+        body: bytes = b"",
+        content_type: Optional[str] = None,
+    ) -> tuple[int, Dict[str, Any]]:
+        """Answer one call; ``params`` merges the query string and a form body.
+
+        ``method``, ``query``, ``body`` and ``content_type`` are the request as
+        received and are only used to forward it upstream when recording.
+        """
+
+        with self._lock:
+            self.requests += 1
+            delay = self.faults.delay_seconds(self._rng)
+            inject_error = self._rng.random() < self.faults.error_rate
+
+        if self._bucket is not None:
+            try:
+                self._bucket.acquire(max_wait=0)
+            except RateLimitExceeded:
+                with self._lock:
+                    self.throttled += 1
+                return 200, {"type": "ISP", "code": "ApiCallLimit", "message": "throttled"}
+        if delay:
+            time.sleep(delay)
+        if inject_error:
+            with self._lock:
+                self.errors_injected += 1
+            return 503, {"type": "ISP", "code": "ServiceUnavailable", "message": "injected"}
+
+        if api_name != "/product/get":
+            return 404, {"code": "InvalidApi", "message": api_name}
+        if self.record is not None:
+            if query is None:
+                query = urlencode(params) if method == "GET" else ""
+            return self._proxy_and_record(method, api_name, params, query, body, content_type)
+        if self.app_secret is not None:
+            unsigned = dict(params)
+            sent_sign = unsigned.pop("sign", None)
+            if sent_sign != sign_request(self.app_secret, api_name, unsigned):
+                return 200, {"type": "ISV", "code": "IncompleteSignature", "message": "bad sign"}
+        num_iid = params.get("num_iid")
+        if not num_iid:
+            return 200, {"type": "ISV", "code": "MissingParameter", "message": "num_iid"}
+
+        recorded = self.replay.load(num_iid) if self.replay else None
+        return 200, recorded if recorded is not None else self.payload_factory(num_iid)
+
+    def _proxy_and_record(
+        self,
+        method: str,
+        api_name: str,
+        params: Dict[str, str],
+        query: str,
+        body: bytes,
+        content_type: Optional[str],
+    ) -> tuple[int, Dict[str, Any]]:
+        url = f"{self.upstream_url}{api_name}" + (f"?{query}" if query else "")
+        response = requests.request(
+            method,
+            url,
+            data=body or None,
+            headers={"Content-Type": content_type} if content_type else None,
+            timeout=30,
+        )
+        payload = response.json()
+        num_iid = params.get("num_iid")
+        if response.ok and num_iid and str(payload.get("code", "0")) == "0":
+            self.record.save(num_iid, payload)
+        return response.status_code, payload
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are written separately; avoid Nagle/delayed-ACK stalls.
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                params = dict(parse_qsl(parsed.query))
+                self._respond(*server.handle(parsed.path, params, query=parsed.query))
+
+            def do_POST(self) -> None:
+                parsed = urlparse(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                params = dict(parse_qsl(parsed.query))
+                params.update(parse_qsl(body.decode("utf-8")))
+                self._respond(
+                    *server.handle(
+                        parsed.path,
+                        params,
+                        method="POST",
+                        query=parsed.query,
+                        body=body,
+                        content_type=self.headers.get("Content-Type"),
+                    )
+                )
+
+            def _respond(self, status: int, payload: Dict[str, Any]) -> None:
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json;charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                return
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Taobao IOP gateway")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--app-secret", default=None, help="verify request signatures")
+    parser.add_argument("--replay-dir", default=None)
+    parser.add_argument("--record-dir", default=None)
+    parser.add_argument("--upstream", default=None, help="gateway URL to proxy when recording")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server = FakeIopServer(
+        args.host,
+        args.port,
+        app_secret=args.app_secret,
+        replay=PayloadStore(args.replay_dir) if args.replay_dir else None,
+        record=PayloadStore(args.record_dir) if args.record_dir else None,
+        upstream_url=args.upstream,
+        faults=FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.max_rps),
+        seed=args.seed,
+    )
+    print(f"Fake IOP gateway listening on {server.url}")
+    server.start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
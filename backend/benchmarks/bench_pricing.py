@@ -0,0 +1,71 @@
+"""Compare scalar and vectorized sale-price calculation over many rows.
+
+Prices a synthetic option catalog with the per-row override columns the
+SmartStore exporter builds (about half the rows override each setting)::
+
+    cd backend
+    python -m benchmarks.bench_pricing --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from app.services.pricing import PricingService
+
+
+def sparse_column(rng: np.random.Generator, rows: int, low: float, high: float) -> np.ndarray:
+    values = np.round(rng.uniform(low, high, rows), 2)
+    values[rng.random(rows) < 0.5] = np.nan
+    return values
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--scalar-rows", type=int, default=100_000, help="rows timed on the scalar path")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    raw = np.round(rng.uniform(1, 500, args.rows), 2)
+    diffs = np.round(rng.uniform(0, 30, args.rows), 2)
+    shipping = sparse_column(rng, args.rows, 0, 8000)
+    margin = sparse_column(rng, args.rows, 5, 40)
+    vat = sparse_column(rng, args.rows, 0, 10)
+    rate = sparse_column(rng, args.rows, 180, 195)
+    service = PricingService()
+
+    started = time.perf_counter()
+    prices = service.calculate_sale_prices(
+        raw, diffs, shipping_fees=shipping, margin_rates=margin, vat_rates=vat, exchange_rates=rate
+    )
+    vectorized = time.perf_counter() - started
+
+    sample = min(args.scalar_rows, args.rows)
+    columns = [column[:sample].tolist() for column in (raw, diffs, shipping, margin, vat, rate)]
+    started = time.perf_counter()
+    scalar = [
+        service.calculate_sale_price(
+            r,
+            d,
+            shipping_fee=None if s != s else s,
+            margin_rate=None if m != m else m,
+            vat_rate=None if v != v else v,
+            exchange_rate=None if x != x else x,
+        )
+        for r, d, s, m, v, x in zip(*columns)
+    ]
+    scalar_seconds = (time.perf_counter() - started) * args.rows / sample
+
+    assert prices[:sample].tolist() == scalar, "vectorized prices diverge from the scalar path"
+    print(f"rows={args.rows:,}")
+    print(f"vectorized  {vectorized * 1000:9.1f}ms  ({args.rows / vectorized / 1e6:6.1f}M rows/s)")
+    print(f"scalar      {scalar_seconds * 1000:9.1f}ms  (extrapolated from {sample:,} rows)")
+    print(f"speedup     {scalar_seconds / vectorized:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
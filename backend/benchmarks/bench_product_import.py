@@ -0,0 +1,118 @@
+"""Measure ``ProductImportService`` throughput and tail latency offline.
+
+Each concurrency level imports distinct items through the real scraper,
+``TaobaoClient`` and IOP HTTP stack against a local ``FakeIopServer`` and an
+in-memory SQLite database::
+
+    cd backend
+    python -m benchmarks.bench_product_import --imports 200 --concurrency 1 8 32 \\
+        --latency-ms 50 --jitter-ms 20 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from itertools import count
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import domain  # noqa: F401
+from app.services.product_import_service import ProductImportService
+from app.services.resilience import CallGuard, CircuitBreaker, RetryPolicy, TokenBucket
+from app.services.taobao_client import TaobaoClient
+from app.services.taobao_registry import SOURCE_SITES
+from app.services.taobao_scraper import TaobaoScraper
+from app.testing.fake_iop_server import FakeIopServer, FaultProfile, PayloadStore
+
+APP_SECRET = "bench-secret"
+
+
+def percentile(ordered: List[float], pct: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+async def run_level(
+    server_url: str, concurrency: int, imports: int, item_ids: "count[int]"
+) -> str:
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+    guard = CallGuard(
+        bucket=TokenBucket(1_000_000, 1_000_000),
+        breaker=CircuitBreaker(1_000_000, reset_timeout=1),
+        retry=RetryPolicy(max_attempts=3, base_delay=0.05, max_delay=0.5),
+    )
+    client = TaobaoClient("bench-key", APP_SECRET, "bench-token", server_url, guard=guard)
+    scrapers = {
+        site: TaobaoScraper(client, source_site=site, item_source_market=market)
+        for site, market in SOURCE_SITES.items()
+    }
+
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def import_one(num_iid: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            session = session_factory()
+            started = time.perf_counter()
+            try:
+                await ProductImportService(session, scrapers=scrapers).import_product(
+                    f"https://item.taobao.com/item.htm?id={num_iid}", "TAOBAO"
+                )
+                latencies.append((time.perf_counter() - started) * 1000)
+            except ValueError:
+                failures += 1
+            finally:
+                session.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(import_one(next(item_ids)) for _ in range(imports)))
+    elapsed = time.perf_counter() - started
+    client.close()
+    engine.dispose()
+
+    ordered = sorted(latencies) or [0.0]
+    return (
+        f"concurrency={concurrency:<4} throughput={len(latencies) / elapsed:8.1f}/s "
+        f"p50={statistics.median(ordered):7.1f}ms p95={percentile(ordered, 95):7.1f}ms "
+        f"p99={percentile(ordered, 99):7.1f}ms failed={failures}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--imports", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--latency-ms", type=float, default=30.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    parser.add_argument("--replay-dir", default=None)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    faults = FaultProfile(args.latency_ms, args.jitter_ms, args.error_rate, args.max_rps)
+    replay = PayloadStore(args.replay_dir) if args.replay_dir else None
+    item_ids = count(1)
+    with FakeIopServer(
+        app_secret=APP_SECRET, replay=replay, faults=faults, seed=args.seed
+    ) as server:
+        for level in args.concurrency:
+            print(asyncio.run(run_level(server.url, level, args.imports, item_ids)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Compare per-request TaobaoClient construction with a shared, long-lived client.
+
+Runs against the local ``FakeIopServer`` so no credentials or network access
+are needed::
+
+    cd backend
+    python -m benchmarks.bench_taobao_client --calls 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+from typing import Callable, List
+
+from app.services.resilience import CallGuard, CircuitBreaker, RetryPolicy, TokenBucket
+from app.services.taobao_client import TaobaoClient
+from app.testing.fake_iop_server import FakeIopServer
+
+APP_KEY = "bench-key"
+APP_SECRET = "bench-secret"
+
+
+def unthrottled_guard() -> CallGuard:
+    return CallGuard(
+        bucket=TokenBucket(1_000_000, 1_000_000),
+        breaker=CircuitBreaker(1_000_000, reset_timeout=1),
+        retry=RetryPolicy(max_attempts=1),
+    )
+
+
+def make_client(server_url: str, guard: CallGuard) -> TaobaoClient:
+    return TaobaoClient(APP_KEY, APP_SECRET, "bench-token", server_url, guard=guard)
+
+
+def measure(calls: int, call: Callable[[int], None]) -> List[float]:
+    latencies: List[float] = []
+    for index in range(calls):
+        started = time.perf_counter()
+        call(index)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def summarize(label: str, latencies: List[float], connections: int) -> str:
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return (
+        f"{label:<12} mean={statistics.fmean(ordered):6.2f}ms "
+        f"p50={statistics.median(ordered):6.2f}ms p95={p95:6.2f}ms "
+        f"connections={connections}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    guard = unthrottled_guard()
+    with FakeIopServer(app_secret=APP_SECRET) as server:
+
+        def per_request(index: int) -> None:
+            client = make_client(server.url, guard)
+            try:
+                client.get_item_detail(index)
+            finally:
+                client.close()
+
+        latencies = measure(args.calls, per_request)
+        print(summarize("per-request", latencies, server.connections))
+
+        server.connections = 0
+        shared = make_client(server.url, guard)
+        latencies = measure(args.calls, lambda index: shared.get_item_detail(index))
+        shared.close()
+        print(summarize("shared", latencies, server.connections))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure translation throughput against the local fake provider.
+
+Translates a synthetic catalog through ``TranslationService`` with the batch
+size forced small, so each product fans out into several provider requests,
+and compares per-provider concurrency levels::
+
+    cd backend
+    python -m benchmarks.bench_translation --products 50 --options 40 \\
+        --concurrency 1 4 16 --latency-ms 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.config import settings
+from app.database import Base
+from app.models.domain import Product, ProductOption
+from app.services.translation_glossary import GlossaryStore
+from app.services.translation_memory import TranslationMemory
+from app.services.translation_providers import (
+    FakeTranslationProvider,
+    TranslationProviderRegistry,
+)
+from app.services.translation_service import TranslationService
+
+
+def run_level(products: int, options: int, concurrency: int, latency_ms: float) -> str:
+    engine = create_engine(
+        "sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    for index in range(products):
+        session.add(
+            Product(
+                source_url=f"https://item.taobao.com/item.htm?id={index}",
+                source_site="TAOBAO",
+                raw_title=f"商品{index}",
+                raw_description=f"<p>描述{index}</p>",
+                raw_price=1,
+                raw_currency="CNY",
+                options=[
+                    ProductOption(
+                        option_key=str(option), raw_name=f"款式{index}-{option}", raw_price_diff=0
+                    )
+                    for option in range(options)
+                ],
+            )
+        )
+    session.commit()
+
+    provider = FakeTranslationProvider("fake", latency=latency_ms / 1000)
+    registry = TranslationProviderRegistry({"fake": lambda: provider}, concurrency=concurrency)
+    service = TranslationService(
+        session,
+        memory=TranslationMemory(),
+        glossary=GlossaryStore(base_path=None),
+        providers=registry,
+    )
+    started = time.perf_counter()
+    for product_id in range(1, products + 1):
+        service.translate_product(product_id, "ko-KR", provider="fake")
+    session.commit()
+    elapsed = time.perf_counter() - started
+    registry.close()
+    session.close()
+    return (
+        f"concurrency={concurrency:<3} products={products} requests={len(provider.requests)} "
+        f"elapsed={elapsed:6.2f}s per_product={elapsed / products * 1000:7.1f}ms "
+        f"peak_in_flight={provider.max_in_flight}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--products", type=int, default=50)
+    parser.add_argument("--options", type=int, default=40)
+    parser.add_argument("--batch-segments", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    settings.translation_batch_max_segments = args.batch_segments
+    for level in args.concurrency:
+        print(run_level(args.products, args.options, level, args.latency_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base, get_session
+from app.main import app
+from app.models.domain import ExchangeRate
+from app.services.exchange_rates import ExchangeRateIndex, get_exchange_rate_index
+from app.services.pricing import (
+    PricingContext,
+    PricingEngine,
+    PricingRuleLoader,
+    PricingService,
+)
+from app.services.shipping_rates import ShippingRateIndex
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_index_serves_current_and_historical_rates(db_session, tmp_path):
+    index = ExchangeRateIndex()
+    january, march = datetime(2026, 1, 1), datetime(2026, 3, 1)
+    index.publish(db_session, "cny", "krw", 190, effective_from=march)
+    index.publish(db_session, "CNY", "KRW", 180, effective_from=january)
+
+    assert index.rate("CNY", "KRW", datetime(2025, 12, 31)) is None
+    assert index.rate("CNY", "KRW", january) == 180
+    assert index.rate("CNY", "KRW", datetime(2026, 2, 28)) == 180
+    assert index.rate("CNY", "KRW", datetime(2026, 3, 1, 9, tzinfo=timezone(timedelta(hours=9)))) == 190
+    assert index.rate("CNY", "KRW") == 190
+    assert index.rate("USD", "KRW") is None
+
+    # Re-publishing the same moment replaces the rate instead of adding a row.
+    index.publish(db_session, "CNY", "KRW", 195, effective_from=march)
+    assert index.rate("CNY", "KRW") == 195
+    assert db_session.query(ExchangeRate).count() == 2
+    with pytest.raises(ValueError):
+        index.publish(db_session, "CNY", "KRW", 0)
+
+    # Rates written elsewhere are picked up by the next sync.
+    db_session.add(
+        ExchangeRate(base_currency="CNY", quote_currency="KRW", rate=200, effective_from=datetime(2026, 4, 1))
+    )
+    db_session.commit()
+    other = ExchangeRateIndex()
+    other.sync(db_session)
+    assert other.rate("CNY", "KRW") == 200
+    assert other.rate("CNY", "KRW", datetime(2026, 3, 15)) == 195
+
+    # Republishing an existing moment in another worker is seen as well.
+    index.publish(db_session, "CNY", "KRW", 198, effective_from=march)
+    other.sync(db_session)
+    assert other.rate("CNY", "KRW", datetime(2026, 3, 15)) == 198
+
+    # Pricing follows the published rate unless a channel pins its own.
+    (tmp_path / "pinned.json").write_text('{"exchange_rate": 100}', encoding="utf-8")
+    pricing = PricingEngine(PricingRuleLoader(tmp_path), rates=other)
+    assert pricing.compiled("default").exchange_rate == 200
+    assert pricing.compiled("default", at=datetime(2026, 2, 1)).exchange_rate == 180
+    assert pricing.compiled("pinned").exchange_rate == 100
+
+
+def test_pricing_service_resolves_the_published_rate_when_pricing(db_session):
+    db_session.add(
+        ExchangeRate(base_currency="CNY", quote_currency="KRW", rate=100, effective_from=datetime(2026, 1, 1))
+    )
+    db_session.commit()
+    index = ExchangeRateIndex()
+    context = PricingContext(default_margin=0, vat_rate=0, default_delivery=0)
+
+    # Constructing with a session syncs the index before the first price.
+    service = PricingService(context, session=db_session, rates=index, shipping=ShippingRateIndex())
+    assert service.calculate_sale_price(10) == 1000
+    evaluator = service.compiled
+    assert service.compiled is evaluator
+
+    # Rates published after construction apply to the next price.
+    index.publish(db_session, "CNY", "KRW", 200, effective_from=datetime(2026, 2, 1))
+    assert service.calculate_sale_price(10) == 2000
+    assert service.calculate_sale_prices([10, 20]).tolist() == [2000, 4000]
+
+    pinned = PricingService(
+        PricingContext(exchange_rate=1, default_margin=0, vat_rate=0, default_delivery=0),
+        rates=index,
+    )
+    assert pinned.calculate_sale_price(10) == 10
+
+
+def test_publish_exchange_rate_endpoint(db_session):
+    index = ExchangeRateIndex()
+
+    def override_get_session():
+        session = TestingSessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_exchange_rate_index] = lambda: index
+    try:
+        with TestClient(app) as client:
+            response = client.post(
+                "/api/pricing/exchange-rates",
+                json={"rate": 191.5, "effective_from": "2026-05-01T00:00:00"},
+            )
+            assert response.status_code == 201
+            assert response.json()["base_currency"] == "CNY"
+            assert index.rate("CNY", "KRW", datetime(2026, 5, 2)) == 191.5
+
+            assert client.post("/api/pricing/exchange-rates", json={"rate": -1}).status_code == 422
+            listed = client.get("/api/pricing/exchange-rates").json()
+            assert [row["rate"] for row in listed] == [191.5]
+    finally:
+        app.dependency_overrides.clear()
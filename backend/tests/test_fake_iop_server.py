@@ -0,0 +1,116 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.resilience import (
+    CallGuard,
+    CircuitBreaker,
+    RetryPolicy,
+    TokenBucket,
+    TransientCallError,
+)
+from app.services.taobao_client import TaobaoClient
+from app.services.taobao_scraper import TaobaoScraper
+from app.testing.fake_iop_server import FakeIopServer, FaultProfile, PayloadStore
+
+
+def make_guard(max_attempts: int = 1) -> CallGuard:
+    return CallGuard(
+        bucket=TokenBucket(1000, 1000),
+        breaker=CircuitBreaker(100, reset_timeout=1),
+        retry=RetryPolicy(max_attempts=max_attempts, base_delay=0, max_delay=0),
+    )
+
+
+def test_fake_iop_server_replays_recorded_payloads(tmp_path):
+    store = PayloadStore(tmp_path)
+    store.save("555", {"code": "0", "data": {"title": "녹화된 상품", "price": "8.8"}})
+
+    with FakeIopServer(app_secret="secret", replay=store) as server:
+        client = TaobaoClient("key", "secret", "token", server.url, guard=make_guard())
+        scraper = TaobaoScraper(client)
+        try:
+            recorded = asyncio.run(scraper.fetch_product("555"))
+            synthetic = asyncio.run(scraper.fetch_product("556"))
+        finally:
+            client.close()
+
+    assert recorded.title == "녹화된 상품"
+    assert recorded.price == 8.8
+    assert synthetic.title == "Fake item 556"
+
+
+def test_fake_iop_server_injects_errors_and_throttling():
+    faults = FaultProfile(error_rate=1.0)
+    with FakeIopServer(faults=faults) as server:
+        client = TaobaoClient("key", "secret", "token", server.url, guard=make_guard(3))
+        try:
+            with pytest.raises(TransientCallError):
+                client.get_item_detail(1)
+        finally:
+            client.close()
+    assert server.errors_injected == 3
+
+    with FakeIopServer(faults=FaultProfile(max_rps=1)) as server:
+        client = TaobaoClient("key", "secret", "token", server.url, guard=make_guard())
+        try:
+            client.get_item_detail(1)
+            with pytest.raises(TransientCallError):
+                client.get_item_detail(2)
+        finally:
+            client.close()
+    assert server.throttled == 1
+
+
+def test_recording_proxy_forwards_method_query_and_body(tmp_path):
+    received = []
+
+    class Upstream(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            self._answer(b"")
+
+        def do_POST(self) -> None:
+            self._answer(self.rfile.read(int(self.headers["Content-Length"])))
+
+        def _answer(self, body: bytes) -> None:
+            received.append((self.command, self.path, body, self.headers.get("Content-Type")))
+            payload = json.dumps({"code": "0", "data": {"title": "upstream"}}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args) -> None:
+            return
+
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    threading.Thread(target=upstream.serve_forever, daemon=True).start()
+    store = PayloadStore(tmp_path)
+    host, port = upstream.server_address[:2]
+    try:
+        with FakeIopServer(record=store, upstream_url=f"http://{host}:{port}") as server:
+            posted = requests.post(
+                f"{server.url}/product/get?app_key=key",
+                data={"num_iid": "7", "sign": "ABC"},
+                timeout=5,
+            )
+            fetched = requests.get(f"{server.url}/product/get?num_iid=8&sign=DEF", timeout=5)
+    finally:
+        upstream.shutdown()
+        upstream.server_close()
+
+    assert posted.json()["data"]["title"] == fetched.json()["data"]["title"] == "upstream"
+    assert received == [
+        ("POST", "/product/get?app_key=key", b"num_iid=7&sign=ABC", "application/x-www-form-urlencoded"),
+        ("GET", "/product/get?num_iid=8&sign=DEF", b"", None),
+    ]
+    assert store.load("7") is not None and store.load("8") is not None
@@ -0,0 +1,232 @@
+import asyncio
+import csv
+import io
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config import settings
+from app.database import Base
+from app.models.domain import ImageMirror, Product, ProductLocalizedInfo
+from app.services.exporter_smartstore import SmartStoreExporter
+from app.services import image_mirror_service
+from app.services.image_mirror_service import ContentAddressedStore, ImageMirrorService
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+PNG_A = b"\x89PNG\r\n\x1a\n" + b"A" * 64
+PNG_B = b"\x89PNG\r\n\x1a\n" + b"B" * 64
+PNG_LARGE = b"\x89PNG\r\n\x1a\n" + b"L" * 4096
+PUBLIC_BASE = "https://cdn.example.com/media/images"
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def image_server():
+    """Local stand-in for the image CDN; ``/a`` and ``/a-copy`` serve identical bytes."""
+
+    bodies = {
+        "/a.png": PNG_A,
+        "/a-copy.png": PNG_A,
+        "/b.png": PNG_B,
+        "/b.png_400x400.png": PNG_A,
+        "/large.png": PNG_LARGE,
+    }
+    hits: list[str] = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            hits.append(self.path)
+            body = bodies.get(self.path)
+            if body is None:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:
+            return
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    host, port = httpd.server_address[:2]
+    try:
+        yield f"http://{host}:{port}", hits
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_mirror_deduplicates_identical_images_and_skips_known_urls(
+    db_session, image_server, tmp_path
+):
+    base_url, hits = image_server
+    db_session.add_all(
+        [
+            Product(
+                source_url="https://item.taobao.com/item.htm?id=1",
+                source_site="TAOBAO",
+                raw_title="상품1",
+                raw_price=10,
+                raw_currency="CNY",
+                image_urls=[f"{base_url}/a.png", f"{base_url}/b.png"],
+                detail_image_urls=[f"{base_url}/missing.png"],
+            ),
+            Product(
+                source_url="https://item.taobao.com/item.htm?id=2",
+                source_site="TAOBAO",
+                raw_title="상품2",
+                raw_price=10,
+                raw_currency="CNY",
+                image_urls=[f"{base_url}/a-copy.png", f"{base_url}/a.png"],
+            ),
+        ]
+    )
+    db_session.commit()
+
+    service = ImageMirrorService(
+        db_session, store=ContentAddressedStore(tmp_path), concurrency=2
+    )
+    result = asyncio.run(service.mirror_products())
+
+    assert (result.requested, result.downloaded, result.deduplicated, result.failed) == (4, 2, 1, 1)
+    mirrors = {row.source_url: row for row in db_session.query(ImageMirror).all()}
+    assert mirrors[f"{base_url}/a.png"].file_path == mirrors[f"{base_url}/a-copy.png"].file_path
+    assert (tmp_path / mirrors[f"{base_url}/a.png"].file_path).read_bytes() == PNG_A
+    assert len([path for path in tmp_path.rglob("*") if path.is_file()]) == 2
+
+    hits.clear()
+    again = asyncio.run(service.mirror_products())
+    assert again.already_mirrored == 3
+    assert hits == ["/missing.png"]
+
+
+def test_mirror_skips_images_over_the_size_cap(db_session, image_server, tmp_path, monkeypatch):
+    base_url, _ = image_server
+    monkeypatch.setattr(settings, "image_mirror_max_bytes", 1024)
+    service = ImageMirrorService(db_session, store=ContentAddressedStore(tmp_path))
+
+    result = asyncio.run(service.mirror_urls([f"{base_url}/large.png", f"{base_url}/a.png"]))
+
+    assert (result.downloaded, result.failed) == (1, 1)
+    assert [row.source_url for row in db_session.query(ImageMirror).all()] == [f"{base_url}/a.png"]
+
+
+def test_mirror_keeps_rows_written_by_a_concurrent_run(
+    db_session, image_server, tmp_path, monkeypatch
+):
+    base_url, _ = image_server
+    db_session.add(
+        ImageMirror(
+            source_url=f"{base_url}/a.png",
+            sha256="0" * 64,
+            file_path="00/00/other.png",
+            size_bytes=1,
+        )
+    )
+    db_session.commit()
+    # Simulate a run that checked for existing rows before the other run committed.
+    monkeypatch.setattr(image_mirror_service, "mirrored_paths", lambda session, urls: {})
+    service = ImageMirrorService(db_session, store=ContentAddressedStore(tmp_path))
+
+    result = asyncio.run(service.mirror_urls([f"{base_url}/a.png", f"{base_url}/b.png"]))
+
+    assert (result.already_mirrored, result.downloaded, result.failed) == (1, 1, 0)
+    mirrors = {row.source_url: row.file_path for row in db_session.query(ImageMirror).all()}
+    assert mirrors[f"{base_url}/a.png"] == "00/00/other.png"
+    assert f"{base_url}/b.png" in mirrors
+
+
+def test_smartstore_export_uses_mirrored_image_urls(
+    db_session, image_server, tmp_path, monkeypatch
+):
+    base_url, _ = image_server
+    product = Product(
+        source_url="https://item.taobao.com/item.htm?id=3",
+        source_site="TAOBAO",
+        raw_title="상품3",
+        raw_price=10,
+        raw_currency="CNY",
+        image_urls=[f"{base_url}/a.png"],
+        detail_image_urls=[f"{base_url}/b.png"],
+    )
+    db_session.add(product)
+    db_session.flush()
+    db_session.add(
+        ProductLocalizedInfo(
+            product_id=product.id,
+            locale="ko-KR",
+            title="상품3",
+            description=(
+                f'<img src="{base_url}/b.png" />'
+                f'<img src="{base_url}/b.png_400x400.png" />'
+                f'<p>{base_url}/b.png</p>'
+            ),
+        )
+    )
+    db_session.commit()
+
+    asyncio.run(
+        ImageMirrorService(db_session, store=ContentAddressedStore(tmp_path)).mirror_products(
+            [product.id]
+        )
+    )
+    mirrors = {row.source_url: row.file_path for row in db_session.query(ImageMirror).all()}
+
+    # Without an absolute public base URL the original URLs are exported.
+    rows = list(
+        csv.reader(
+            io.StringIO(SmartStoreExporter().export_products(db_session, [product.id]).getvalue())
+        )
+    )
+    assert rows[1][6] == f"{base_url}/a.png"
+    assert f'src="{base_url}/b.png"' in rows[1][5]
+
+    monkeypatch.setattr(settings, "image_mirror_public_base_url", PUBLIC_BASE)
+    rows = list(
+        csv.reader(
+            io.StringIO(SmartStoreExporter().export_products(db_session, [product.id]).getvalue())
+        )
+    )
+    assert rows[1][6] == f"{PUBLIC_BASE}/{mirrors[f'{base_url}/a.png']}"
+    assert f'src="{PUBLIC_BASE}/{mirrors[f"{base_url}/b.png"]}"' in rows[1][5]
+    # Only exact attribute values are rewritten.
+    assert f'src="{base_url}/b.png_400x400.png"' in rows[1][5]
+    assert f"<p>{base_url}/b.png</p>" in rows[1][5]
+
+
+def test_relative_public_base_url_is_not_used_for_exports(monkeypatch):
+    monkeypatch.setattr(settings, "image_mirror_public_base_url", "/media/images")
+    assert image_mirror_service.public_base_url() is None
+    monkeypatch.setattr(settings, "image_mirror_public_base_url", PUBLIC_BASE + "/")
+    assert image_mirror_service.public_base_url() == PUBLIC_BASE
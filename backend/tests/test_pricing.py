@@ -0,0 +1,99 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services import PricingInputs
+from app.services import PricingService as LegacyPricingService
+from app.services.pricing import (
+    PricingContext,
+    PricingEngine,
+    PricingRuleLoader,
+    PricingRules,
+    PricingService,
+)
+
+
+def test_vectorized_prices_match_scalar_path():
+    rng = np.random.default_rng(7)
+    size = 2_000
+    raw = np.round(rng.uniform(0.5, 900, size), 2)
+    diffs = np.round(rng.uniform(-5, 50, size), 2)
+
+    def sparse(low, high):
+        values = np.round(rng.uniform(low, high, size), 2)
+        return [None if rng.random() < 0.5 else float(value) for value in values]
+
+    shipping, margin, vat, rate = sparse(0, 9000), sparse(0, 60), sparse(0, 10), sparse(150, 200)
+    service = PricingService(PricingContext(exchange_rate=190.5, default_margin=12.5))
+
+    vectorized = service.calculate_sale_prices(
+        raw, diffs, shipping_fees=shipping, margin_rates=margin, vat_rates=vat, exchange_rates=rate
+    )
+
+    expected = [
+        service.calculate_sale_price(
+            raw[index],
+            diffs[index],
+            shipping_fee=shipping[index],
+            margin_rate=margin[index],
+            vat_rate=vat[index],
+            exchange_rate=rate[index],
+        )
+        for index in range(size)
+    ]
+    assert vectorized.dtype == np.int64
+    assert vectorized.tolist() == expected
+
+
+def test_vectorized_prices_use_context_defaults_and_validate_lengths():
+    service = PricingService(
+        PricingContext(exchange_rate=1, default_margin=0, vat_rate=0, default_delivery=0)
+    )
+    # Same half-to-even rounding as ``round``: 25 -> 20, 35 -> 40.
+    assert service.calculate_sale_prices([25, 35, 17.5]).tolist() == [20, 40, 20]
+    assert service.calculate_sale_prices([]).tolist() == []
+    with pytest.raises(ValueError):
+        service.calculate_sale_prices([1, 2], margin_rates=[10])
+
+
+def test_channel_rules_are_compiled_once_per_channel(tmp_path):
+    (tmp_path / "outlet.json").write_text(
+        '{"exchange_rate": 1, "margin_rate": 0, "delivery_fee": 0, "include_vat": false,'
+        ' "rounding_step": 100, "minimum_price": 1000}',
+        encoding="utf-8",
+    )
+    (tmp_path / "broken.json").write_text('{"rounding_step": 0}', encoding="utf-8")
+    engine = PricingEngine(PricingRuleLoader(tmp_path))
+
+    outlet = engine.compiled("outlet")
+    assert engine.compiled("OUTLET") is outlet
+    # VAT off, 100-won steps, floor at the channel minimum.
+    assert engine.prices("outlet", [1249, 1251, 10]).tolist() == [1200, 1300, 1000]
+    assert engine.price("outlet", 1251) == 1300
+    # Channels without a rules file use the environment defaults.
+    assert engine.compiled("other").rules == PricingRules.defaults("other")
+    with pytest.raises(ValueError):
+        engine.compiled("broken")
+
+    engine.invalidate("outlet")
+    assert engine.compiled("outlet") is not outlet
+
+
+def test_legacy_pricing_inputs_run_on_the_engine():
+    service = LegacyPricingService()
+    assert service.calculate_sale_price(
+        PricingInputs(base_price=10, exchange_rate=1300, margin_rate=0.25, shipping_fee=4000)
+    ) == 21250
+    assert service.calculate_sale_price(
+        PricingInputs(
+            base_price=10,
+            exchange_rate=1300,
+            margin_rate=0.25,
+            shipping_fee=4000,
+            include_vat=True,
+        )
+    ) == 23380
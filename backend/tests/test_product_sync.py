@@ -0,0 +1,282 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base
+from app.models.domain import Product, ProductOption, ProductSalePrice
+from app.services.payload_archive import load_raw_payload, store_raw_payload
+from app.services.product_sync_service import (
+    ProductSyncService,
+    run_product_sync_forever,
+    scraped_option_hash,
+    scraped_product_hash,
+)
+from app.services.taobao_scraper import ScrapedOption, ScrapedProduct, TaobaoScraper
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def scraped_item(num_iid: int, *, price: float = 10.0, red_diff: float = 0.0) -> ScrapedProduct:
+    return ScrapedProduct(
+        source_url=f"https://item.taobao.com/item.htm?id={num_iid}",
+        source_site="TAOBAO",
+        title=f"Item {num_iid}",
+        price=price,
+        currency="CNY",
+        image_urls=["https://example.com/a.jpg"],
+        options=[
+            ScrapedOption(option_key="red", raw_name="红色", raw_price_diff=red_diff),
+            ScrapedOption(option_key="blue", raw_name="蓝色", raw_price_diff=0),
+        ],
+    )
+
+
+class FakeScraper:
+    def __init__(self, items: dict[str, ScrapedProduct]) -> None:
+        self.items = items
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch_product(self, url: str, *, refresh: bool = False) -> ScrapedProduct:
+        assert refresh
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.items[url]
+
+
+def seed(db_session, scraped: ScrapedProduct, synced_at: datetime) -> Product:
+    product = Product(
+        source_url=scraped.source_url,
+        source_site="TAOBAO",
+        raw_title=scraped.title,
+        raw_price=scraped.price,
+        raw_currency=scraped.currency,
+        image_urls=scraped.image_urls,
+        detail_image_urls=scraped.detail_image_urls,
+        content_hash=scraped_product_hash(scraped),
+        synced_at=synced_at,
+    )
+    for opt in scraped.options:
+        product.options.append(
+            ProductOption(
+                option_key=opt.option_key,
+                raw_name=opt.raw_name,
+                raw_price_diff=opt.raw_price_diff,
+                content_hash=scraped_option_hash(opt),
+            )
+        )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+def test_resync_writes_only_changed_rows(db_session):
+    old = datetime.utcnow() - timedelta(days=2)
+    unchanged = seed(db_session, scraped_item(1), old)
+    drifted = seed(db_session, scraped_item(2), old)
+    fresh = seed(db_session, scraped_item(3), datetime.utcnow())
+
+    upstream = {
+        unchanged.source_url: scraped_item(1),
+        drifted.source_url: scraped_item(2, red_diff=3.5),
+        fresh.source_url: scraped_item(3, price=99),
+    }
+    scraper = FakeScraper(upstream)
+    service = ProductSyncService(
+        db_session, {"TAOBAO": scraper}, concurrency=1, batch_size=1
+    )
+
+    updated_rows = []
+
+    def record_option_updates(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE product_options"):
+            updated_rows.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_option_updates)
+    try:
+        result = asyncio.run(service.resync_stale(timedelta(days=1)))
+    finally:
+        event.remove(engine, "before_cursor_execute", record_option_updates)
+
+    assert result.checked == 2
+    assert result.unchanged == 1
+    assert result.products_updated == 0
+    assert result.options_updated == 1
+    assert scraper.max_in_flight == 1
+
+    red = next(o for o in drifted.options if o.option_key == "red")
+    assert float(red.raw_price_diff) == 3.5
+    assert len(updated_rows) == 1
+    assert float(fresh.raw_price) == 10.0
+
+
+def test_resync_updates_product_fields_and_adds_new_options(db_session):
+    product = seed(db_session, scraped_item(7), datetime.utcnow() - timedelta(days=3))
+    upstream = scraped_item(7, price=12.5)
+    upstream.options.append(ScrapedOption(option_key="green", raw_name="绿色", raw_price_diff=1))
+    scraper = FakeScraper({product.source_url: upstream})
+
+    result = asyncio.run(
+        ProductSyncService(db_session, {"TAOBAO": scraper}, concurrency=4).resync_stale(
+            timedelta(hours=1)
+        )
+    )
+
+    assert result.products_updated == 1
+    assert result.options_added == 1
+    db_session.refresh(product)
+    assert float(product.raw_price) == 12.5
+    assert {o.option_key for o in product.options} == {"red", "blue", "green"}
+    assert product.synced_at > datetime.utcnow() - timedelta(minutes=1)
+
+
+def test_resync_writes_only_product_fields_that_changed(db_session):
+    product = seed(db_session, scraped_item(9), datetime.utcnow() - timedelta(days=3))
+    scraper = FakeScraper({product.source_url: scraped_item(9, price=11.0)})
+    statements = []
+
+    def record_product_updates(conn, cursor, statement, *args):
+        if statement.startswith("UPDATE products"):
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_product_updates)
+    try:
+        result = asyncio.run(
+            ProductSyncService(db_session, {"TAOBAO": scraper}).resync_stale(timedelta(hours=1))
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record_product_updates)
+
+    assert result.products_updated == 1
+    assert statements and "raw_price" in statements[0]
+    # The price change re-priced the product's materialized sale prices.
+    assert {row.product_id for row in db_session.query(ProductSalePrice)} == {product.id}
+    assert not any("raw_title" in statement for statement in statements)
+
+
+def test_sync_loop_logs_failures_and_keeps_running(caplog):
+    runs = []
+
+    def failing_scrapers():
+        runs.append(1)
+        raise RuntimeError("registry unavailable")
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_product_sync_forever(
+                TestingSessionLocal,
+                failing_scrapers,
+                interval_seconds=0.01,
+                stale_after=timedelta(hours=1),
+            )
+        )
+        while len(runs) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    with caplog.at_level("ERROR", logger="app.services.product_sync_service"):
+        asyncio.run(scenario())
+
+    assert "registry unavailable" in caplog.text
+
+
+class OfflineClient:
+    def get_item_detail(self, *args, **kwargs):
+        raise AssertionError("re-parse must not call the upstream API")
+
+
+def test_payload_archive_round_trip_skips_identical_payloads(db_session):
+    product = seed(db_session, scraped_item(8), datetime.utcnow())
+    payload = {"data": {"title": "商品", "sku_list": [{"sku_id": "1"}] * 50}}
+
+    assert store_raw_payload(product, payload) is True
+    db_session.commit()
+    assert len(product.raw_payload.payload) < len(str(payload))
+    assert load_raw_payload(product) == payload
+    assert store_raw_payload(product, payload) is False
+
+
+def test_reparse_archived_rederives_fields_without_network(db_session, monkeypatch):
+    scraper = TaobaoScraper(OfflineClient())
+    payload = {
+        "data": {
+            "title": "Archived",
+            "price": "10.0",
+            "desc_imgs": "https://example.com/d1.jpg,https://example.com/d2.jpg",
+            "sku_list": [{"sku_id": "red", "sku_name": "红色", "price": "10.0"}],
+        }
+    }
+    parsed = scraper.parse_payload(payload, "9")
+    product = seed(db_session, parsed, datetime.utcnow() - timedelta(days=5))
+    store_raw_payload(product, payload)
+    db_session.commit()
+    synced_at = product.synced_at
+
+    # Simulate a parser change in how detail images are extracted.
+    original = TaobaoScraper._extract_detail_images
+    monkeypatch.setattr(
+        TaobaoScraper,
+        "_extract_detail_images",
+        lambda self, item: original(self, item)[:1],
+    )
+
+    service = ProductSyncService(db_session, {"TAOBAO": scraper})
+    result = service.reparse_archived()
+
+    assert result.checked == 1
+    assert result.products_updated == 1
+    assert result.options_updated == 0
+    db_session.refresh(product)
+    assert product.detail_image_urls == ["https://example.com/d1.jpg"]
+    assert product.synced_at == synced_at
+
+
+def test_reparse_archived_counts_corrupt_archives_as_failed(db_session):
+    scraper = TaobaoScraper(OfflineClient())
+    products = []
+    for num_iid in ("10", "11"):
+        payload = {"data": {"title": f"Archived {num_iid}", "price": "10.0", "sku_list": []}}
+        product = seed(db_session, scraper.parse_payload(payload, num_iid), datetime.utcnow())
+        product.raw_title, product.content_hash = "Stale", "stale"
+        store_raw_payload(product, payload)
+        products.append(product)
+    db_session.commit()
+    corrupt, intact = products
+    corrupt.raw_payload.payload = corrupt.raw_payload.payload[:8]
+    db_session.commit()
+
+    result = ProductSyncService(db_session, {"TAOBAO": scraper}).reparse_archived()
+
+    assert (result.checked, result.failed, result.products_updated) == (2, 1, 1)
+    db_session.refresh(intact)
+    assert intact.raw_title == "Archived 11"
+    with pytest.raises(ValueError):
+        load_raw_payload(corrupt)
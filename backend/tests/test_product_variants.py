@@ -0,0 +1,123 @@
+import asyncio
+import csv
+import io
+import os
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base
+from app.models.domain import ProductVariantValue
+from app.services.exporter_smartstore import SmartStoreExporter
+from app.services.product_import_service import ProductImportService
+from app.services.taobao_scraper import ScrapedVariantValue, TaobaoScraper
+from app.services.translation_glossary import GlossaryStore
+from app.services.translation_memory import get_translation_memory
+from app.services.translation_providers import FakeTranslationProvider, get_translation_providers
+from app.services.translation_service import TranslationService
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+COLORS = [("28341", "黑色"), ("28320", "白色"), ("28326", "红色")]
+SIZES = [("28314", "S"), ("28315", "M"), ("28316", "L"), ("28317", "XL")]
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    get_translation_memory().clear()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def grid_payload() -> dict:
+    skus = []
+    for color_id, color in COLORS:
+        for size_id, size in SIZES:
+            skus.append(
+                {
+                    "sku_id": f"{color_id}-{size_id}",
+                    "price": "10.00",
+                    "properties_name": f"1627207:{color_id}:颜色分类:{color};20509:{size_id}:尺码:{size}",
+                }
+            )
+    return {"data": {"title": "T恤", "price": "10.00", "pic_urls": [], "sku_list": skus}}
+
+
+class PayloadScraper(TaobaoScraper):
+    def __init__(self, payload: dict) -> None:
+        super().__init__(client=None)
+        self.payload = payload
+
+    async def _fetch_raw(self, num_iid: str) -> dict:
+        return self.payload
+
+
+def test_parse_payload_splits_sku_dimensions():
+    scraper = TaobaoScraper(client=None)
+    product = scraper.parse_payload(grid_payload(), "1")
+    assert product.options[0].variant == [
+        ScrapedVariantValue("1627207", "颜色分类", "28341", "黑色"),
+        ScrapedVariantValue("20509", "尺码", "28314", "S"),
+    ]
+
+    prop_path_payload = {
+        "data": {
+            "title": "bag",
+            "price": "5",
+            "props_list": {"1627207:1": "颜色:蓝色"},
+            "sku_list": [{"sku_id": "9", "prop_path": "1627207:1", "price": "5"}],
+        }
+    }
+    parsed = scraper.parse_payload(prop_path_payload, "2")
+    assert parsed.options[0].variant == [ScrapedVariantValue("1627207", "颜色", "1", "蓝色")]
+
+    flat = scraper.parse_payload(
+        {"data": {"title": "x", "price": "1", "sku_list": [{"sku_id": "1", "sku_name": "红色;M"}]}},
+        "3",
+    )
+    assert flat.options[0].variant == []
+
+
+def test_variant_matrix_is_translated_and_exported_per_value(db_session, monkeypatch, tmp_path):
+    importer = ProductImportService(db_session, scrapers={"TAOBAO": PayloadScraper(grid_payload())})
+    product = asyncio.run(importer.import_product("https://item.taobao.com/item.htm?id=1", "TAOBAO"))
+
+    assert len(product.options) == len(COLORS) * len(SIZES)
+    assert [dim.raw_name for dim in product.variant_dimensions] == ["颜色分类", "尺码"]
+    assert db_session.query(ProductVariantValue).count() == len(COLORS) + len(SIZES)
+    assert product.options[0].variant_path == "1627207:28341;20509:28314"
+
+    provider = FakeTranslationProvider("gcloud", template="<{text}>")
+    monkeypatch.setitem(get_translation_providers().providers, "gcloud", provider)
+    # An empty glossary keeps every name on the provider path.
+    service = TranslationService(db_session, glossary=GlossaryStore(base_path=tmp_path))
+    service.translate_product(product.id, target_locale="ko-KR")
+    db_session.commit()
+
+    calls = [text for request in provider.requests for text in request]
+    option_calls = [text for text in calls if text != "T恤"]
+    # Size codes need no translation and never reach the provider.
+    assert sorted(option_calls) == sorted(["颜色分类", "尺码", *(name for _, name in COLORS)])
+    assert product.options[0].localized_name == "<黑色> / S"
+
+    output = SmartStoreExporter().export_products(db_session, [product.id])
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+    assert len(rows) == 1 + len(COLORS) * len(SIZES)
+    assert rows[1][3] == "<颜色分类> / <尺码>"
+    assert rows[1][4] == "<黑色> / S"
@@ -0,0 +1,163 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.resilience import (
+    Bulkhead,
+    CallGuard,
+    CircuitBreaker,
+    CircuitOpenError,
+    RateLimitExceeded,
+    RetryPolicy,
+    TokenBucket,
+    TransientCallError,
+)
+from app.services.taobao_client import TaobaoClient
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_guard(clock: FakeClock, *, max_attempts: int = 3, threshold: int = 2) -> CallGuard:
+    return CallGuard(
+        bucket=TokenBucket(100, 100, clock=clock, sleep=lambda _: None),
+        breaker=CircuitBreaker(threshold, reset_timeout=30, clock=clock),
+        retry=RetryPolicy(max_attempts=max_attempts, base_delay=0, max_delay=0),
+        sleep=lambda _: None,
+    )
+
+
+def test_call_guard_retries_transient_errors():
+    guard = make_guard(FakeClock(), threshold=5)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TransientCallError("busy")
+        return "ok"
+
+    assert guard.call(flaky) == "ok"
+    assert guard.stats.retries == 2
+    assert guard.stats.successes == 1
+
+
+def test_call_guard_does_not_retry_caller_errors():
+    guard = make_guard(FakeClock())
+
+    def broken():
+        raise ValueError("bad params")
+
+    with pytest.raises(ValueError):
+        guard.call(broken)
+    assert guard.stats.retries == 0
+    assert guard.breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_breaker_fails_fast_then_recovers():
+    clock = FakeClock()
+    guard = make_guard(clock, max_attempts=1, threshold=2)
+
+    def down():
+        raise TimeoutError("upstream timeout")
+
+    for _ in range(2):
+        with pytest.raises(TimeoutError):
+            guard.call(down)
+    assert guard.breaker.state == CircuitBreaker.OPEN
+
+    with pytest.raises(CircuitOpenError):
+        guard.call(lambda: "never called")
+
+    clock.now += 31
+    assert guard.call(lambda: "probe") == "probe"
+    assert guard.state()["state"] == CircuitBreaker.CLOSED
+    assert guard.stats.short_circuited == 1
+    assert guard.stats.circuit_opened == 1
+    assert guard.stats.circuit_half_opened == 1
+    assert guard.stats.circuit_closed == 1
+
+
+def test_token_bucket_rejects_waits_beyond_budget():
+    clock = FakeClock()
+    waits = []
+    bucket = TokenBucket(2, 1, clock=clock, sleep=waits.append)
+
+    assert bucket.acquire(max_wait=1) == 0
+    assert bucket.acquire(max_wait=1) == pytest.approx(0.5)
+    with pytest.raises(RateLimitExceeded):
+        bucket.acquire(max_wait=0.5)
+    assert waits == [pytest.approx(0.5)]
+
+
+def test_taobao_client_retries_throttled_iop_responses():
+    responses = [{"code": "ApiCallLimit", "message": "slow down"}, {"code": "0", "data": {}}]
+
+    class FakeHttpClient:
+        def __init__(self):
+            self.calls = []
+
+        def call(self, api_name, api_params, *, access_token=None, http_method="GET"):
+            self.calls.append((api_name, dict(api_params), access_token))
+            return responses.pop(0)
+
+    http_client = FakeHttpClient()
+    guard = make_guard(FakeClock())
+    client = TaobaoClient(
+        "key", "secret", "token", "http://iop.local", guard=guard, http_client=http_client
+    )
+
+    assert client.get_item_detail(1) == {"code": "0", "data": {}}
+    assert http_client.calls[-1] == ("/product/get", {"num_iid": 1}, "token")
+    assert guard.stats.retries == 1
+
+
+def test_async_guard_waits_on_the_loop_and_bounds_concurrency():
+    def thread_sleep(_):
+        raise AssertionError("async calls must not sleep in worker threads")
+
+    guard = CallGuard(
+        bucket=TokenBucket(100, 100, sleep=thread_sleep),
+        breaker=CircuitBreaker(10, reset_timeout=30),
+        retry=RetryPolicy(max_attempts=2, base_delay=0.01, max_delay=0.01),
+        sleep=thread_sleep,
+        bulkhead=Bulkhead(2),
+    )
+    lock = threading.Lock()
+    running = [0, 0]
+    failed_once = set()
+
+    def call(index):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        try:
+            time.sleep(0.02)
+            if index == 0 and index not in failed_once:
+                failed_once.add(index)
+                raise TransientCallError("busy")
+            return index
+        finally:
+            with lock:
+                running[0] -= 1
+
+    async def scenario():
+        return await asyncio.gather(
+            *(guard.call_async(lambda index=index: call(index)) for index in range(6))
+        )
+
+    assert asyncio.run(scenario()) == list(range(6))
+    assert running[1] == 2
+    assert guard.stats.retries == 1
+    assert guard.stats.bulkhead_waits > 0
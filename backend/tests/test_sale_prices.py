@@ -0,0 +1,255 @@
+import asyncio
+import csv
+import io
+import os
+import sys
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base
+from app.models.domain import Order, OrderItem, Product, ProductOption, ProductSalePrice
+from app.services.exchange_rates import ExchangeRateIndex
+from app.services.exporter_smartstore import SmartStoreExporter
+from app.services.pricing import PricingEngine, PricingRuleLoader
+from app.services.pricing_simulation import PricingSimulator
+from app.services import sale_prices
+from app.services.sale_prices import SalePriceRefresher, run_sale_price_refresh_forever
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def pricing(tmp_path):
+    (tmp_path / "smartstore.json").write_text(
+        '{"margin_rate": 0, "vat_rate": 0, "delivery_fee": 0}', encoding="utf-8"
+    )
+    return PricingEngine(PricingRuleLoader(tmp_path), rates=ExchangeRateIndex())
+
+
+def _product(index: int, options: int) -> Product:
+    return Product(
+        source_url=f"https://item.taobao.com/item.htm?id={index}",
+        source_site="TAOBAO",
+        raw_title=f"商品{index}",
+        raw_price=10,
+        raw_currency="CNY",
+        options=[
+            ProductOption(option_key=str(option), raw_name=f"款式{option}", raw_price_diff=option)
+            for option in range(options)
+        ],
+    )
+
+
+def _prices(session):
+    return {
+        (row.product_id, row.option_id): row.sale_price
+        for row in session.query(ProductSalePrice).order_by(ProductSalePrice.id)
+    }
+
+
+def test_refresh_recomputes_only_changed_inputs(db_session, pricing):
+    first, second, plain = _product(1, 3), _product(2, 2), _product(3, 0)
+    db_session.add_all([first, second, plain])
+    db_session.commit()
+    refresher = SalePriceRefresher(db_session, engine=pricing, channels=["smartstore"], batch_size=2)
+    pricing.rates.publish(db_session, "CNY", "KRW", 100, effective_from=datetime(2026, 1, 1))
+
+    result = refresher.refresh()
+    assert (result.checked, result.updated, result.removed) == (6, 6, 0)
+    assert _prices(db_session)[(plain.id, None)] == 1000
+    assert _prices(db_session)[(first.id, first.options[2].id)] == 1200
+    assert refresher.refresh().updated == 0
+
+    first.options[1].raw_price_diff = 5
+    second.margin_rate = 10
+    deleted_option = first.options[2]
+    db_session.delete(deleted_option)
+    db_session.commit()
+    # The option's stored prices go with it, even without SQLite's FK pragma.
+    assert (first.id, deleted_option.id) not in _prices(db_session)
+    result = refresher.refresh()
+    assert (result.updated, result.removed) == (3, 0)
+    assert _prices(db_session)[(first.id, first.options[1].id)] == 1500
+    assert _prices(db_session)[(second.id, second.options[1].id)] == 1210
+
+    # A new exchange rate invalidates every price that does not pin its own.
+    second.exchange_rate = 100
+    db_session.commit()
+    refresher.refresh()
+    pricing.rates.publish(db_session, "CNY", "KRW", 200)
+    assert refresher.refresh().updated == 3
+    assert _prices(db_session)[(plain.id, None)] == 2000
+
+
+def test_export_reads_current_materialized_prices(db_session, pricing):
+    product = _product(1, 2)
+    db_session.add(product)
+    db_session.commit()
+    SalePriceRefresher(db_session, engine=pricing, channels=["smartstore"]).refresh()
+    # Mark a stored price so the export shows whether it was read or recomputed.
+    stored = db_session.query(ProductSalePrice).filter_by(option_id=product.options[0].id).one()
+    stored.sale_price = 1
+    product.options[1].raw_price_diff = 9
+    db_session.commit()
+
+    exporter = SmartStoreExporter(pricing_engine=pricing)
+    rows = list(csv.reader(io.StringIO(exporter.export_products(db_session, [product.id]).getvalue())))
+    price_column = rows[0].index("판매가")
+    settings_rate = pricing.compiled("smartstore").exchange_rate
+    assert [row[price_column] for row in rows[1:]] == ["1", str(round(19 * settings_rate / 10) * 10)]
+
+
+def test_simulation_reports_catalog_impact_without_writes(db_session, pricing):
+    first, plain = _product(1, 2), _product(2, 0)
+    plain.margin_rate = 50
+    db_session.add_all([first, plain])
+    db_session.flush()
+    now = datetime(2026, 6, 1)
+    db_session.add(
+        Order(
+            external_order_id="A-1",
+            channel_name="smartstore",
+            customer_name="홍길동",
+            customer_phone="010-0000-0000",
+            customer_address="서울",
+            order_datetime=now,
+            status="NEW",
+            total_amount_krw=3000,
+            items=[
+                OrderItem(product_id=first.id, product_option_id=first.options[1].id, quantity=2, unit_price_krw=1100),
+                OrderItem(product_id=plain.id, quantity=1, unit_price_krw=800),
+            ],
+        )
+    )
+    db_session.commit()
+    pricing.rates.publish(db_session, "CNY", "KRW", 100, effective_from=datetime(2026, 1, 1))
+
+    result = PricingSimulator(db_session, engine=pricing).simulate(
+        "smartstore", {"margin_rate": 10}, thresholds=[1200, 1600], now=now
+    )
+
+    # Baseline 1000/1100 and 1500 (product margin); candidate 1100/1210 and 1500.
+    assert (result["rows"], result["products"]) == (3, 2)
+    assert result["baseline"]["total"] == 3600 and result["candidate"]["total"] == 3810
+    assert result["changes"] == {"increased": 2, "decreased": 0, "unchanged": 1, "mean_delta": 70.0}
+    assert result["thresholds"][0]["crossed_up_rows"] == 1
+    assert result["thresholds"][0]["crossed_up_products"] == 1
+    assert result["thresholds"][1]["candidate_at_or_above"] == 0
+    assert result["revenue"] == {
+        "order_days": 30,
+        "order_items": 2,
+        "units": 3,
+        "actual": 3000.0,
+        "baseline": 3700,
+        "candidate": 3920,
+        "delta": 220,
+        "delta_pct": 5.95,
+    }
+    assert not db_session.new and not db_session.dirty
+    assert db_session.query(ProductSalePrice).count() == 0
+
+
+def test_refresh_loop_rescans_only_when_channel_pricing_changes(db_session, monkeypatch):
+    db_session.add(_product(1, 2))
+    db_session.commit()
+    scans = []
+    original = SalePriceRefresher.refresh
+
+    def counting_refresh(self, product_ids=None):
+        scans.append(product_ids)
+        return original(self, product_ids)
+
+    monkeypatch.setattr(SalePriceRefresher, "refresh", counting_refresh)
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_sale_price_refresh_forever(TestingSessionLocal, interval_seconds=0.01)
+        )
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert scans == [None]
+
+
+def test_refresh_loop_prices_products_created_since_the_last_pass(db_session, monkeypatch):
+    db_session.add(_product(1, 2))
+    db_session.commit()
+    scans = []
+    original = SalePriceRefresher.refresh
+
+    def counting_refresh(self, product_ids=None):
+        scans.append(product_ids)
+        return original(self, product_ids)
+
+    monkeypatch.setattr(SalePriceRefresher, "refresh", counting_refresh)
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_sale_price_refresh_forever(TestingSessionLocal, interval_seconds=0.01)
+        )
+        while not scans:
+            await asyncio.sleep(0.01)
+        session = TestingSessionLocal()
+        try:
+            product = _product(2, 1)
+            session.add(product)
+            session.commit()
+            new_id = product.id
+        finally:
+            session.close()
+        await asyncio.sleep(0.1)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return new_id
+
+    new_id = asyncio.run(scenario())
+    assert scans == [None, [new_id]]
+    assert db_session.query(ProductSalePrice).filter_by(product_id=new_id).count() == 1
+
+
+def test_refresh_loop_logs_failures_and_keeps_running(monkeypatch, caplog):
+    attempts = []
+
+    def broken_fingerprints(self):
+        attempts.append(1)
+        raise RuntimeError("pricing rules unreadable")
+
+    monkeypatch.setattr(SalePriceRefresher, "fingerprints", broken_fingerprints)
+
+    async def scenario():
+        task = asyncio.create_task(
+            run_sale_price_refresh_forever(TestingSessionLocal, interval_seconds=0.01)
+        )
+        while len(attempts) < 2:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    with caplog.at_level("ERROR", logger=sale_prices.__name__):
+        asyncio.run(scenario())
+    assert "pricing rules unreadable" in caplog.text
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.scrape_cache import ScrapeCache, ScrapeCacheKey
+from app.services.taobao_scraper import ScrapeFailed, TaobaoScraper, _revalidation_tasks
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingClient:
+    def __init__(self, title: str = "Cached Item") -> None:
+        self.title = title
+        self.calls = 0
+
+    def get_item_detail(self, num_iid, *, item_source_market=None):
+        self.calls += 1
+        return {"data": {"title": f"{self.title} {self.calls}", "price": "10.0"}}
+
+    async def get_item_detail_async(self, num_iid, *, item_source_market=None):
+        return self.get_item_detail(num_iid, item_source_market=item_source_market)
+
+
+def test_scrape_cache_serves_fresh_then_stale_then_miss(tmp_path):
+    clock = FakeClock()
+    cache = ScrapeCache(tmp_path, ttl_seconds=60, stale_seconds=120, clock=clock)
+    key = ScrapeCacheKey("TAOBAO", "123", None)
+
+    assert cache.get(key) is None
+    cache.set(key, {"data": {"title": "x"}})
+
+    clock.now += 30
+    fresh = cache.get(key)
+    assert fresh is not None and not fresh.is_stale
+
+    clock.now += 60
+    stale = cache.get(key)
+    assert stale is not None and stale.is_stale
+
+    clock.now += 200
+    assert cache.get(key) is None
+    assert cache.stats.as_dict() == {
+        "hits": 1,
+        "stale_hits": 1,
+        "misses": 2,
+        "writes": 1,
+        "revalidations": 0,
+        "revalidation_failures": 0,
+    }
+
+
+def test_scrape_cache_keys_by_source_market(tmp_path):
+    cache = ScrapeCache(tmp_path, ttl_seconds=60)
+    cache.set(ScrapeCacheKey("1688", "123", "CBU_MARKET"), {"data": {}})
+
+    assert cache.get(ScrapeCacheKey("1688", "123", None)) is None
+    assert cache.get(ScrapeCacheKey("1688", "123", "CBU_MARKET")) is not None
+
+
+def test_scraper_reuses_cached_payload_and_revalidates_stale(tmp_path):
+    clock = FakeClock()
+    cache = ScrapeCache(tmp_path, ttl_seconds=60, stale_seconds=600, clock=clock)
+    client = CountingClient()
+    scraper = TaobaoScraper(client, cache=cache)
+
+    async def scenario():
+        first = await scraper.fetch_product("https://item.taobao.com/item.htm?id=42")
+        second = await scraper.fetch_product("42")
+        clock.now += 120
+        stale = await scraper.fetch_product("42")
+        await asyncio.gather(*_revalidation_tasks.values())
+        refreshed = await scraper.fetch_product("42")
+        return first, second, stale, refreshed
+
+    first, second, stale, refreshed = asyncio.run(scenario())
+
+    assert first.title == second.title == stale.title == "Cached Item 1"
+    assert refreshed.title == "Cached Item 2"
+    assert client.calls == 2
+    assert cache.stats.revalidations == 1
+
+
+def test_scraper_does_not_cache_iop_error_payloads(tmp_path):
+    cache = ScrapeCache(tmp_path, ttl_seconds=60)
+    client = CountingClient()
+    responses = [{"code": "ApiCallLimit", "message": "slow down"}]
+    original = client.get_item_detail
+    client.get_item_detail = lambda num_iid, **kwargs: (
+        responses.pop(0) if responses else original(num_iid, **kwargs)
+    )
+    scraper = TaobaoScraper(client, cache=cache)
+    key = ScrapeCacheKey("TAOBAO", "7", None)
+
+    with pytest.raises(ScrapeFailed):
+        asyncio.run(scraper.fetch_product("7"))
+    assert cache.get(key) is None
+
+    # An error payload already on disk is treated as a miss.
+    cache.set(key, {"code": "IllegalAccessToken", "message": "expired"})
+    assert asyncio.run(scraper.fetch_product("7")).title == "Cached Item 1"
+    assert TaobaoScraper.is_valid_payload(cache.get(key).payload)
+
+
+def test_cancelled_revalidation_releases_its_key(tmp_path):
+    clock = FakeClock()
+    cache = ScrapeCache(tmp_path, ttl_seconds=60, stale_seconds=600, clock=clock)
+    scraper = TaobaoScraper(CountingClient(), cache=cache)
+    key = ScrapeCacheKey("TAOBAO", "9", None)
+    cache.set(key, {"data": {"title": "Old", "price": "1"}})
+    clock.now += 120
+
+    async def scenario():
+        await scraper.fetch_product("9")
+        task = _revalidation_tasks[key]
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+    assert key not in _revalidation_tasks
@@ -0,0 +1,166 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base, get_session
+from app.main import app
+from app.models.domain import Product, ProductSalePrice
+from app.services.exchange_rates import ExchangeRateIndex
+from app.services.pricing import PricingEngine, PricingRuleLoader
+from app.services.pricing_simulation import PricingSimulator
+from app.services.shipping_rates import (
+    ShippingRateIndex,
+    ShippingTiers,
+    chargeable_weight,
+    chargeable_weights,
+    get_shipping_rate_index,
+)
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def test_tiers_resolve_by_inclusive_upper_bound():
+    tiers = ShippingTiers.from_pairs([(2, 9000), (0.5, 5000), (1, 6500)])
+    assert [tiers.fee(weight) for weight in (0.1, 0.5, 0.51, 1, 1.5, 2, 30)] == [
+        5000, 5000, 6500, 6500, 9000, 9000, 9000
+    ]
+    assert tiers.fee(None) is None and ShippingTiers().fee(1) is None
+
+    weights = np.append(np.random.default_rng(3).uniform(0, 3, 500), [0.5, 1, 2, np.nan])
+    expected = [np.nan if np.isnan(weight) else tiers.fee(weight) for weight in weights]
+    np.testing.assert_array_equal(tiers.fees_for(weights), expected)
+
+    # 40 x 30 x 20 cm is 4 kg volumetric at the default 6000 divisor.
+    assert chargeable_weight(1.2, 40, 30, 20) == 4
+    assert chargeable_weight(5, 40, 30, 20) == 5
+    assert chargeable_weight(None, 40, 30, None) is None
+    np.testing.assert_array_equal(
+        chargeable_weights(
+            np.array([1.2, np.nan, np.nan]),
+            np.array([40, 40, np.nan]),
+            np.array([30, 30, np.nan]),
+            np.array([20, 20, np.nan]),
+        ),
+        [4, 4, np.nan],
+    )
+
+
+def test_pricing_uses_tier_fee_between_explicit_fee_and_channel_default(db_session, tmp_path):
+    (tmp_path / "smartstore.json").write_text(
+        '{"exchange_rate": 1, "margin_rate": 0, "vat_rate": 0, "delivery_fee": 3000}',
+        encoding="utf-8",
+    )
+    shipping = ShippingRateIndex()
+    pricing = PricingEngine(PricingRuleLoader(tmp_path), rates=ExchangeRateIndex(), shipping=shipping)
+    shipping.replace(db_session, [(1, 5000), (5, 12000)])
+
+    other = ShippingRateIndex()
+    pricing_elsewhere = PricingEngine(PricingRuleLoader(tmp_path), rates=ExchangeRateIndex(), shipping=other)
+    pricing_elsewhere.sync(db_session)
+    assert other.tiers == shipping.tiers
+
+    evaluator = pricing.compiled("smartstore")
+    assert evaluator.price(100, weight_kg=0.3) == 5100
+    assert evaluator.price(100, weight_kg=4) == 12100
+    assert evaluator.price(100, shipping_fee=0, weight_kg=4) == 100
+    assert evaluator.price(100) == 3100
+    assert pricing.prices(
+        "smartstore", [100, 100, 100, 100], shipping_fees=[None, None, 0, None], weights_kg=[0.3, 4, 4, None]
+    ).tolist() == [5100, 12100, 100, 3100]
+
+    shipping.replace(db_session, [(1, 4000)])
+    assert pricing.compiled("smartstore") is not evaluator
+    assert pricing.price("smartstore", 100, weight_kg=0.3) == 4100
+    with pytest.raises(ValueError):
+        shipping.replace(db_session, [(1, 4000), (1, 5000)])
+
+
+def test_simulation_without_changes_keeps_tier_fees(db_session, tmp_path):
+    shipping = ShippingRateIndex()
+    pricing = PricingEngine(PricingRuleLoader(tmp_path), rates=ExchangeRateIndex(), shipping=shipping)
+    shipping.replace(db_session, [(1, 8000), (5, 15000)])
+    for index, weight in enumerate((0.5, 2, None)):
+        db_session.add(
+            Product(
+                source_url=f"https://item.taobao.com/item.htm?id={index}",
+                source_site="TAOBAO",
+                raw_title=f"상품 {index}",
+                raw_price=100,
+                raw_currency="CNY",
+                weight_kg=weight,
+            )
+        )
+    db_session.commit()
+
+    result = PricingSimulator(db_session, engine=pricing).simulate("smartstore", {})
+
+    assert result["changes"] == {"increased": 0, "decreased": 0, "unchanged": 3, "mean_delta": 0.0}
+    assert result["baseline"] == result["candidate"]
+
+
+def test_shipping_rates_endpoint_replaces_tiers(db_session):
+    shipping = ShippingRateIndex()
+
+    def override_get_session():
+        session = TestingSessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    product = Product(
+        source_url="https://item.taobao.com/item.htm?id=1",
+        source_site="TAOBAO",
+        raw_title="상품",
+        raw_price=10,
+        raw_currency="CNY",
+        weight_kg=1,
+    )
+    db_session.add(product)
+    db_session.commit()
+    product_id = product.id
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_shipping_rate_index] = lambda: shipping
+    try:
+        with TestClient(app) as client:
+            response = client.put(
+                "/api/pricing/shipping-rates",
+                json={"tiers": [{"max_weight_kg": 2, "fee": 8000}, {"max_weight_kg": 0.5, "fee": 4500}]},
+            )
+            assert response.status_code == 200
+            assert [tier["max_weight_kg"] for tier in response.json()] == [0.5, 2]
+            assert shipping.tiers.fee(1) == 8000
+            assert client.get("/api/pricing/shipping-rates").json() == response.json()
+
+        # The catalog was re-priced in the background under the new tiers.
+        with TestingSessionLocal() as session:
+            assert {row.product_id for row in session.query(ProductSalePrice)} == {product_id}
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.iop_http import sign_request, signing_payload
+from app.services.resilience import CallGuard, CircuitBreaker, RetryPolicy, TokenBucket
+from app.services.taobao_client import TaobaoClient
+from app.services import taobao_scraper
+from app.services.taobao_registry import TaobaoClientRegistry
+from app.services.taobao_scraper import ScrapeFailed
+from app.testing.fake_iop_server import FakeIopServer
+
+
+def make_guard() -> CallGuard:
+    return CallGuard(
+        bucket=TokenBucket(1000, 1000),
+        breaker=CircuitBreaker(100, reset_timeout=1),
+        retry=RetryPolicy(max_attempts=1),
+    )
+
+
+SIGNED_PARAMS = {
+    "app_key": "12345678",
+    "timestamp": "1517820392000",
+    "sign_method": "sha256",
+    "access_token": "token",
+    "num_iid": "652874751412",
+}
+
+
+def test_sign_request_matches_pinned_vectors():
+    # Expected digests computed independently with
+    # ``printf '%s' <payload> | openssl dgst -sha256 -hmac helloworld``.
+    assert signing_payload("/product/get", SIGNED_PARAMS) == (
+        "/product/getaccess_tokentokenapp_key12345678num_iid652874751412"
+        "sign_methodsha256timestamp1517820392000"
+    )
+    assert sign_request("helloworld", "/product/get", SIGNED_PARAMS) == (
+        "C41C0BB3CADD561977BF9C8F91071851AC789CE4C9B1A3BB783FBAB33EA3F455"
+    )
+    system_params = {
+        "app_key": "12345678",
+        "method": "aliexpress.solution.product.info.get",
+        "sign_method": "sha256",
+        "timestamp": "1517820392000",
+    }
+    assert sign_request("helloworld", "aliexpress.solution.product.info.get", system_params) == (
+        "19E7302AD173387320BD96B3F0C7DD7D300F33D8EB5223E27E3736DE71C2007C"
+    )
+
+
+def test_sign_request_matches_official_sdk():
+    sdk = pytest.importorskip("iop.base", reason="official IOP SDK not installed")
+    if not hasattr(sdk, "sign"):
+        pytest.skip("installed 'iop' package is not the IOP SDK")
+    assert sign_request("helloworld", "/product/get", SIGNED_PARAMS) == sdk.sign(
+        "helloworld", "/product/get", SIGNED_PARAMS
+    )
+
+
+def test_taobao_client_signs_requests_and_reuses_connection():
+    with FakeIopServer(app_secret="secret") as server:
+        client = TaobaoClient("key", "secret", "token", server.url, guard=make_guard())
+        try:
+            responses = [client.get_item_detail(num_iid) for num_iid in (1, 2, 3)]
+        finally:
+            client.close()
+
+    assert [r["data"]["title"] for r in responses] == [
+        "Fake item 1",
+        "Fake item 2",
+        "Fake item 3",
+    ]
+    assert server.requests == 3
+    assert server.connections == 1
+
+
+def test_registry_builds_client_once_and_shares_scrapers():
+    built = []
+
+    def factory():
+        built.append(1)
+        return TaobaoClient("key", "secret", "token", "http://iop.local", guard=make_guard())
+
+    registry = TaobaoClientRegistry(client_factory=factory)
+    first = registry.scrapers()
+    second = registry.scrapers()
+
+    assert first is second
+    assert first["TAOBAO"].client is first["1688"].client
+    assert first["1688"].item_source_market == "CBU_MARKET"
+    assert len(built) == 1
+
+    registry.close()
+    registry.scrapers()
+    assert len(built) == 2
+
+
+def test_registry_retries_client_build_after_missing_credentials(monkeypatch):
+    attempts = []
+    # Scrapers must never fall back to a client of their own.
+    monkeypatch.setattr(
+        taobao_scraper,
+        "TaobaoClient",
+        lambda *args, **kwargs: pytest.fail("scraper built its own TaobaoClient"),
+    )
+
+    def factory():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ValueError("TAOBAO_APP_KEY / TAOBAO_APP_SECRET must be set")
+        return TaobaoClient("key", "secret", "token", "http://iop.local", guard=make_guard())
+
+    registry = TaobaoClientRegistry(client_factory=factory)
+    unconfigured = registry.scrapers()["TAOBAO"]
+    assert unconfigured.client is None
+    with pytest.raises(ScrapeFailed):
+        asyncio.run(unconfigured.fetch_product("https://item.taobao.com/item.htm?id=1"))
+
+    scrapers = registry.scrapers()
+    assert scrapers["TAOBAO"].client is not None
+    assert registry.scrapers() is scrapers
+    assert len(attempts) == 2
+    registry.close()
@@ -0,0 +1,152 @@
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.database import Base, get_session
+from app.main import app
+from app.models.domain import GlossaryTerm, Product, ProductOption
+from app.services.translation_glossary import (
+    AhoCorasick,
+    Glossary,
+    GlossaryStore,
+    get_glossary_store,
+)
+from app.services.translation_memory import get_translation_memory
+from app.services.translation_providers import FakeTranslationProvider, get_translation_providers
+from app.services.translation_service import TranslationService
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    get_translation_memory().clear()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(db_session, tmp_path):
+    store = GlossaryStore(base_path=tmp_path)
+    (tmp_path / "ko.json").write_text('{"红色": "레드", "码": "사이즈"}', encoding="utf-8")
+
+    def override_get_session():
+        session = TestingSessionLocal()
+        try:
+            yield session
+            session.commit()
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_glossary_store] = lambda: store
+    with TestClient(app) as test_client:
+        yield test_client, store
+    app.dependency_overrides.clear()
+
+
+def test_aho_corasick_reports_overlapping_matches():
+    matcher = AhoCorasick(["红", "红色", "色", "深红色"])
+    assert matcher.spans("深红色") == {0: [3], 1: [2, 3], 2: [3]}
+
+
+def test_glossary_translates_only_fully_covered_names():
+    glossary = Glossary({"红色": "레드", "黑色": "블랙", "长袖": "긴팔", "件": "개", "码": "사이즈"})
+
+    assert glossary.translate("红色") == "레드"
+    assert glossary.translate("黑色长袖") == "블랙 긴팔"
+    assert glossary.translate("红色;XL码") == "레드;XL 사이즈"
+    assert glossary.translate("3件") == "3개"
+    assert glossary.translate("红色款") is None
+    assert glossary.translate("XL") is None
+
+
+def test_option_names_covered_by_glossary_skip_the_provider(client, db_session, monkeypatch):
+    test_client, store = client
+    resp = test_client.put(
+        "/api/translation/glossary/ko",
+        json={"terms": [{"source_text": "红色", "translated_text": "빨강"}, {"source_text": "蓝色", "translated_text": "파랑"}]},
+    )
+    assert resp.status_code == 200, resp.text
+    terms = {term["source_text"]: term for term in resp.json()}
+    assert terms["红色"] == {"source_text": "红色", "translated_text": "빨강", "custom": True}
+    assert terms["码"]["custom"] is False
+
+    provider = FakeTranslationProvider("gcloud", template="<{text}>")
+    monkeypatch.setitem(get_translation_providers().providers, "gcloud", provider)
+    product = Product(
+        source_url="https://item.taobao.com/item.htm?id=7",
+        source_site="TAOBAO",
+        raw_title="卫衣",
+        raw_price=1,
+        raw_currency="CNY",
+        options=[
+            ProductOption(option_key="1", raw_name="红色 XL码", raw_price_diff=0),
+            ProductOption(option_key="2", raw_name="蓝色", raw_price_diff=0),
+            ProductOption(option_key="3", raw_name="迷彩", raw_price_diff=0),
+        ],
+    )
+    db_session.add(product)
+    db_session.commit()
+
+    TranslationService(db_session, glossary=store).translate_product(product.id, "ko-KR")
+
+    assert provider.requests == [["卫衣", "迷彩"]]
+    assert [option.localized_name for option in product.options] == [
+        "빨강 XL 사이즈",
+        "파랑",
+        "<迷彩>",
+    ]
+    assert store.stats.hits == 2
+
+    # Deleting the override reverts to the default; deleting again disables the default.
+    assert test_client.delete("/api/translation/glossary/ko/红色").status_code == 204
+    assert store.get(db_session, "ko").translate("红色") == "레드"
+    assert test_client.delete("/api/translation/glossary/ko/红色").status_code == 204
+    assert store.get(db_session, "ko").translate("红色") is None
+    assert "红色" not in {term["source_text"] for term in test_client.get("/api/translation/glossary/ko").json()}
+    assert test_client.delete("/api/translation/glossary/ko/红色").status_code == 404
+    assert test_client.delete("/api/translation/glossary/ko/黄色").status_code == 404
+
+    resp = test_client.put(
+        "/api/translation/glossary/ko",
+        json={"terms": [{"source_text": "红色", "translated_text": "레드"}]},
+    )
+    assert resp.status_code == 200, resp.text
+    assert store.get(db_session, "ko").translate("红色") == "레드"
+
+
+def test_glossary_cache_notices_terms_written_by_other_workers(db_session, tmp_path):
+    (tmp_path / "ko.json").write_text('{"红色": "레드"}', encoding="utf-8")
+    store = GlossaryStore(base_path=tmp_path)
+    glossary = store.get(db_session, "ko")
+    assert store.get(db_session, "ko") is glossary
+
+    # Written without ``invalidate``, as another process would.
+    db_session.add(GlossaryTerm(source_text="蓝色", target_lang="ko", translated_text="블루"))
+    db_session.commit()
+    assert store.get(db_session, "ko").translate("蓝色") == "블루"
+
+    row = db_session.query(GlossaryTerm).one()
+    row.disabled = True
+    db_session.commit()
+    assert store.get(db_session, "ko").translate("蓝色") is None
+    assert store.get(db_session, "ko").translate("红色") == "레드"
@@ -0,0 +1,510 @@
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config import settings
+from app.database import Base
+from app.models.domain import (
+    Product,
+    ProductLocalizedInfo,
+    ProductOption,
+    TranslationMemoryEntry,
+)
+from app.services.translation_glossary import get_glossary_store
+from app.services.translation_memory import TranslationMemory, get_translation_memory
+from app.services.translation_metrics import DailyCharacterBudget, TranslationMetrics
+from app.services.translation_passthrough import PassthroughFilter, needs_translation
+from app.services import translation_providers
+from app.services.translation_jobs import TranslationJobManager, select_products_for_translation
+from app.services.translation_providers import (
+    FakeTranslationProvider,
+    GoogleTranslationProvider,
+    TranslationError,
+    TranslationProviderRegistry,
+    get_translation_providers,
+)
+from app.services.translation_service import TranslationService
+
+
+engine = create_engine(
+    "sqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+
+@pytest.fixture
+def db_session():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    get_translation_memory().clear()
+    get_glossary_store().invalidate()
+    session = TestingSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    provider = FakeTranslationProvider("gcloud", template="{text}@{lang}")
+    monkeypatch.setitem(get_translation_providers().providers, "gcloud", provider)
+    return provider
+
+
+def make_product(db_session, option_count: int) -> Product:
+    product = Product(
+        source_url="https://item.taobao.com/item.htm?id=42",
+        source_site="TAOBAO",
+        raw_title="连衣裙",
+        raw_description="夏季新款",
+        raw_price=10,
+        raw_currency="CNY",
+    )
+    for index in range(option_count):
+        product.options.append(
+            ProductOption(option_key=str(index), raw_name=f"款式{index}", raw_price_diff=0)
+        )
+    db_session.add(product)
+    db_session.commit()
+    return product
+
+
+def test_translate_product_batches_all_fields(db_session, client, monkeypatch):
+    monkeypatch.setattr(settings, "translation_batch_max_segments", 50)
+    product = make_product(db_session, 200)
+
+    localized = TranslationService(db_session).translate_product(product.id, "ko-KR")
+
+    # 202 segments in chunks of 50 -> 5 requests instead of 202.
+    assert [len(request) for request in client.requests] == [50, 50, 50, 50, 2]
+    assert localized.title == "连衣裙@ko"
+    assert localized.description == "夏季新款@ko"
+    assert [option.localized_name for option in product.options] == [
+        f"款式{index}@ko" for index in range(200)
+    ]
+
+
+def test_retranslation_sends_only_changed_fields(db_session, client):
+    product = make_product(db_session, 3)
+    memory = TranslationMemory()
+    service = TranslationService(db_session, memory=memory)
+
+    service.translate_product(product.id, "ko-KR")
+    db_session.commit()
+    assert service.source_texts(product, target_locale="ko-KR") == []
+    assert len(service.source_texts(product, target_locale="ja-JP")) == 5
+    assert len(service.source_texts(product, target_locale="ko-KR", force=True)) == 5
+
+    lookups = memory.stats.as_dict()
+    service.translate_product(product.id, "ko-KR")
+    assert memory.stats.as_dict() == lookups
+
+    product.raw_title = "长裙"
+    product.options[1].raw_name = "款式新"
+    db_session.commit()
+    client.requests.clear()
+    localized = service.translate_product(product.id, "ko-KR")
+
+    assert client.requests == [["长裙", "款式新"]]
+    assert (localized.title, localized.description) == ("长裙@ko", "夏季新款@ko")
+    assert [option.localized_name for option in product.options] == [
+        "款式0@ko",
+        "款式新@ko",
+        "款式2@ko",
+    ]
+
+
+def test_html_description_translates_text_nodes_only(db_session, client, monkeypatch):
+    monkeypatch.setattr(settings, "translation_batch_max_segments", 2)
+    monkeypatch.setattr(settings, "translation_html_segment_max_chars", 8)
+    product = make_product(db_session, 0)
+    product.raw_description = (
+        '<div class="desc"><p>纯棉面料 &amp; 舒适</p>'
+        '<img src="https://img.example.com/a.jpg" alt="x"/>\n'
+        "<p>纯棉面料 &amp; 舒适</p><script>var a = '不要翻译';</script>"
+        "<p>第一句很长。第二句也很长。</p></div>"
+    )
+    db_session.commit()
+
+    localized = TranslationService(db_session).translate_product(product.id, "ko-KR")
+
+    sent = [text for request in client.requests for text in request]
+    assert sorted(sent) == sorted(["连衣裙", "纯棉面料 & 舒适", "第一句很长。", "第二句也很长。"])
+    assert len(client.requests) == 2
+    assert localized.description == (
+        '<div class="desc"><p>纯棉面料 &amp; 舒适@ko</p>'
+        '<img src="https://img.example.com/a.jpg" alt="x"/>\n'
+        "<p>纯棉面料 &amp; 舒适@ko</p><script>var a = '不要翻译';</script>"
+        "<p>第一句很长。@ko第二句也很长。@ko</p></div>"
+    )
+
+
+def test_translate_list_respects_char_limit_and_preserves_order(
+    db_session, client, monkeypatch
+):
+    monkeypatch.setattr(settings, "translation_batch_max_chars", 10)
+
+    texts = ["aaaa", "", "bbbb", "aaaa", "cccccccccccc", "dd"]
+    result = TranslationService(db_session)._translate_list(texts, "ko")
+
+    assert result == ["aaaa@ko", "", "bbbb@ko", "aaaa@ko", "cccccccccccc@ko", "dd@ko"]
+    assert client.requests == [["aaaa", "bbbb"], ["cccccccccccc"], ["dd"]]
+
+
+def test_untranslatable_text_is_passed_through_without_provider_calls(db_session, client):
+    passthrough = PassthroughFilter()
+
+    texts = ["XXL", "AB-1234", "3XL/180", "99.5", "블랙 XL", "cotton shirt", "纯棉T恤"]
+    result = TranslationService(db_session, passthrough=passthrough)._translate_list(texts, "ko")
+
+    assert result[:5] == texts[:5]
+    assert client.requests == [["cotton shirt", "纯棉T恤"]]
+    assert passthrough.stats.as_dict() == {
+        "checked": 7,
+        "skipped": 5,
+        "skipped_chars": sum(len(text) for text in texts[:5]),
+        "skip_rate": round(5 / 7, 4),
+    }
+    assert needs_translation("블랙", "ja")
+    assert needs_translation("NEW ARRIVAL", "ko")
+    assert needs_translation("COTTON", "ko")
+    assert not needs_translation("S/M XL-XXL", "ko")
+    assert not needs_translation("ブラック 黒", "ja")
+    assert not needs_translation("Black", "en")
+
+
+def test_translation_memory_reuses_translations_across_products(db_session, client):
+    first = make_product(db_session, 3)
+    TranslationService(db_session).translate_product(first.id, "ko-KR")
+    db_session.commit()
+    assert len(client.requests) == 1
+
+    second = make_product(db_session, 4)
+    client.requests.clear()
+    TranslationService(db_session).translate_product(second.id, "ko-KR")
+    db_session.commit()
+    # Title, description and the first three options come from memory.
+    assert client.requests == [["款式3"]]
+    assert second.options[0].localized_name == "款式0@ko"
+
+    # A fresh process (empty LRU) still finds the entries in the table.
+    memory = TranslationMemory()
+    found = memory.lookup_many(db_session, ["连衣裙", "款式3", "新的"], "ko", "gcloud")
+    assert found == {"连衣裙": "连衣裙@ko", "款式3": "款式3@ko"}
+    assert memory.stats.as_dict()["hit_rate"] == round(2 / 3, 4)
+    assert memory.lookup_many(db_session, ["连衣裙"], "ja", "gcloud") == {}
+
+
+def test_provider_registry_serves_sync_and_async_callers():
+    provider = FakeTranslationProvider(latency=0.01)
+    registry = TranslationProviderRegistry({"fake": lambda: provider}, concurrency=2)
+    try:
+        assert registry.translate("fake", [["a"], ["b"], ["c"]], "ko") == [
+            ["[ko] a"],
+            ["[ko] b"],
+            ["[ko] c"],
+        ]
+        assert provider.max_in_flight == 2
+
+        async def from_route():
+            return await registry.atranslate("fake", [["d"]], "ja")
+
+        assert asyncio.run(from_route()) == [["[ja] d"]]
+        assert registry.get("fake") is provider
+    finally:
+        registry.close()
+
+
+def test_google_provider_posts_batches_over_one_client():
+    seen: list[dict] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        payload = json.loads(request.content)
+        seen.append({"key": request.url.params["key"], **payload})
+        return httpx.Response(
+            200,
+            json={"data": {"translations": [{"translatedText": f"ko:{q}"} for q in payload["q"]]}},
+        )
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    provider = GoogleTranslationProvider("secret", http_client=http_client)
+    registry = TranslationProviderRegistry({"gcloud": lambda: provider})
+    try:
+        assert registry.translate("gcloud", [["红", "黑"], ["白"]], "ko") == [
+            ["ko:红", "ko:黑"],
+            ["ko:白"],
+        ]
+        assert registry.translate("gcloud", [["<b>红</b>"]], "ko", text_format="html") == [
+            ["ko:<b>红</b>"]
+        ]
+        with pytest.raises(ValueError):
+            registry.translate("gcloud", [["红"]], "ko", text_format="markdown")
+    finally:
+        registry.close()
+    assert sorted(request["q"] for request in seen) == [["<b>红</b>"], ["白"], ["红", "黑"]]
+    assert all(request["key"] == "secret" for request in seen)
+    assert {request["q"][0]: request["format"] for request in seen} == {
+        "红": "text",
+        "白": "text",
+        "<b>红</b>": "html",
+    }
+    assert http_client.is_closed
+
+
+def test_provider_metrics_record_volume_latency_errors_and_cache_hits(db_session):
+    metrics = TranslationMetrics(DailyCharacterBudget(0))
+    provider = FakeTranslationProvider("gcloud", template="{text}@{lang}")
+    registry = TranslationProviderRegistry({"gcloud": lambda: provider}, metrics=metrics)
+    service = TranslationService(db_session, memory=TranslationMemory(), providers=registry)
+    try:
+        service._translate_list(["连衣裙", "夏季新款"], "ko")
+        service._translate_list(["连衣裙", "XL"], "ko")
+        provider.template = "{missing}"
+        with pytest.raises(KeyError):
+            service._translate_list(["新的"], "ko")
+    finally:
+        registry.close()
+
+    stats = metrics.as_dict()["providers"]["gcloud"]
+    assert (stats["calls"], stats["segments"], stats["characters"], stats["errors"]) == (2, 3, 9, 1)
+    assert stats["cache_hits"] == 2
+    assert stats["latency_ms"]["count"] == 2
+    assert sum(stats["latency_ms"]["buckets"].values()) == 2
+
+
+def test_translation_memory_tolerates_concurrent_writers(db_session):
+    writer_a, writer_b = TranslationMemory(), TranslationMemory(lru_size=1)
+    writer_a.store_many(db_session, {"红色": "빨강"}, "ko", "gcloud")
+    writer_b.store_many(db_session, {"红色": "빨간색", "蓝色": "파랑"}, "ko", "gcloud")
+    db_session.commit()
+
+    rows = {row.source_text: row.translated_text for row in db_session.query(TranslationMemoryEntry)}
+    assert rows == {"红色": "빨강", "蓝色": "파랑"}
+    assert writer_b.stats.writes == 1
+    assert len(writer_b._lru) == 1
+
+
+def test_translation_memory_conflict_keeps_the_callers_transaction(db_session, monkeypatch):
+    TranslationMemory().store_many(db_session, {"红色": "빨강"}, "ko", "gcloud")
+    db_session.commit()
+    product = Product(
+        source_url="https://item.taobao.com/item.htm?id=1",
+        source_site="TAOBAO",
+        raw_title="商品",
+        raw_price=1,
+        raw_currency="CNY",
+    )
+    db_session.add(product)
+    db_session.flush()
+
+    # Another writer stored "红色" after this one looked.
+    writer = TranslationMemory()
+    monkeypatch.setattr(writer, "_existing_hashes", lambda *args: set())
+    writer.store_many(db_session, {"红色": "빨간색", "蓝色": "파랑"}, "ko", "gcloud")
+    db_session.commit()
+
+    rows = {row.source_text: row.translated_text for row in db_session.query(TranslationMemoryEntry)}
+    assert rows == {"红色": "빨강", "蓝色": "파랑"}
+    assert writer.stats.writes == 1
+    assert db_session.query(Product).count() == 1
+    # Only the written row is cached; the conflicting key is read back from the table.
+    assert list(writer._lru.values()) == ["파랑"]
+    assert writer.lookup_many(db_session, ["红色"], "ko", "gcloud") == {"红色": "빨강"}
+
+
+def test_translation_job_runs_chunks_with_provider_limit(tmp_path, monkeypatch):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(bind=file_engine)
+    session_factory = sessionmaker(bind=file_engine, autocommit=False, autoflush=False)
+    get_translation_memory().clear()
+    get_glossary_store().invalidate()
+
+    provider = FakeTranslationProvider("gcloud", template="{text}@{lang}", latency=0.01)
+    registry = TranslationProviderRegistry({"gcloud": lambda: provider}, concurrency=1)
+    monkeypatch.setattr(translation_providers, "_registry", registry)
+
+    with session_factory() as session:
+        for index in range(5):
+            session.add(
+                Product(
+                    source_url=f"https://item.taobao.com/item.htm?id={index}",
+                    source_site="TAOBAO",
+                    raw_title=f"商品{index}",
+                    raw_price=1,
+                    raw_currency="CNY",
+                )
+            )
+        session.commit()
+        product_ids = select_products_for_translation(session, untranslated_only=True)
+
+    manager = TranslationJobManager(session_factory, workers=2, chunk_size=2)
+
+    async def scenario():
+        job = manager.submit([*product_ids, 999], target_locale="ko-KR", provider="gcloud")
+        await manager.wait(job.id)
+        return job
+
+    job = asyncio.run(scenario()).as_dict()
+
+    assert job["status"] == "completed", job["errors"]
+    assert (job["total"], job["translated"], job["failed"], job["progress"]) == (6, 5, 1, 1.0)
+    assert job["errors"][0]["product_id"] == 999
+    assert provider.max_in_flight == 1
+    with session_factory() as session:
+        assert session.query(ProductLocalizedInfo).count() == 5
+        assert select_products_for_translation(session, untranslated_only=True) == []
+    file_engine.dispose()
+    registry.close()
+
+
+def test_bulk_job_is_deferred_until_the_daily_budget_resets(tmp_path, monkeypatch):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'budget.db'}")
+    Base.metadata.create_all(bind=file_engine)
+    session_factory = sessionmaker(bind=file_engine, autocommit=False, autoflush=False)
+    get_translation_memory().clear()
+    get_glossary_store().invalidate()
+
+    now = [datetime(2024, 5, 1, 23, 0, tzinfo=timezone.utc)]
+    budget = DailyCharacterBudget(10, clock=lambda: now[0])
+    provider = FakeTranslationProvider("gcloud", template="{text}@{lang}")
+    registry = TranslationProviderRegistry(
+        {"gcloud": lambda: provider}, metrics=TranslationMetrics(budget)
+    )
+    with session_factory() as session:
+        session.add_all(
+            Product(
+                source_url=f"https://item.taobao.com/item.htm?id={index}",
+                source_site="TAOBAO",
+                raw_title=f"商品{index}",
+                raw_price=1,
+                raw_currency="CNY",
+            )
+            for index in range(4)
+        )
+        session.commit()
+        product_ids = select_products_for_translation(session)
+
+    manager = TranslationJobManager(
+        session_factory, workers=1, chunk_size=2, poll_seconds=0.01, providers=registry
+    )
+
+    async def scenario():
+        job = manager.submit(product_ids, target_locale="ko-KR", provider="gcloud")
+        while job.status != "deferred":
+            await asyncio.sleep(0.01)
+        deferred = job.as_dict()
+        now[0] += timedelta(hours=2)
+        await manager.wait(job.id)
+        return deferred, job.as_dict()
+
+    try:
+        deferred, finished = asyncio.run(scenario())
+    finally:
+        registry.close()
+        file_engine.dispose()
+
+    assert (deferred["translated"], deferred["failed"]) == (2, 0)
+    assert deferred["deferred_until"] == datetime(2024, 5, 2, tzinfo=timezone.utc)
+    assert (finished["status"], finished["translated"], finished["deferred_until"]) == (
+        "completed",
+        4,
+        None,
+    )
+    assert budget.as_dict()["used"] == {"gcloud": 6}
+
+
+def _job_products(session_factory, titles):
+    with session_factory() as session:
+        session.add_all(
+            Product(
+                source_url=f"https://item.taobao.com/item.htm?id={index}",
+                source_site="TAOBAO",
+                raw_title=title,
+                raw_price=1,
+                raw_currency="CNY",
+            )
+            for index, title in enumerate(titles)
+        )
+        session.commit()
+        return select_products_for_translation(session)
+
+
+def test_job_isolates_failing_products_without_holding_the_write_lock(tmp_path):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'fallback.db'}")
+    Base.metadata.create_all(bind=file_engine)
+    session_factory = sessionmaker(bind=file_engine, autocommit=False, autoflush=False)
+    get_translation_memory().clear()
+    get_glossary_store().invalidate()
+    locked_calls = []
+
+    class FlakyProvider(FakeTranslationProvider):
+        async def translate_batch(self, texts, target_language, *, text_format="text"):
+            locked_calls.append(manager._write_lock.locked())
+            if any("坏" in text for text in texts):
+                raise TranslationError("provider rejected the text")
+            return await super().translate_batch(texts, target_language, text_format=text_format)
+
+    registry = TranslationProviderRegistry({"gcloud": lambda: FlakyProvider("gcloud")})
+    product_ids = _job_products(session_factory, ["商品", "坏商品", "好商品"])
+    manager = TranslationJobManager(
+        session_factory, workers=1, chunk_size=3, providers=registry
+    )
+
+    async def scenario():
+        job = manager.submit(product_ids, target_locale="ko-KR", provider="gcloud")
+        await manager.wait(job.id)
+        return job.as_dict()
+
+    try:
+        job = asyncio.run(scenario())
+    finally:
+        registry.close()
+        file_engine.dispose()
+
+    assert (job["status"], job["translated"], job["failed"]) == ("completed", 2, 1)
+    assert job["errors"][0]["product_id"] == product_ids[1]
+    assert locked_calls and not any(locked_calls)
+
+
+def test_failed_job_waits_for_running_chunks_and_starts_no_more(tmp_path, monkeypatch):
+    file_engine = create_engine(f"sqlite:///{tmp_path / 'abort.db'}")
+    Base.metadata.create_all(bind=file_engine)
+    session_factory = sessionmaker(bind=file_engine, autocommit=False, autoflush=False)
+    manager = TranslationJobManager(session_factory, workers=2, chunk_size=1)
+    started = []
+
+    def translate_chunk(job, chunk):
+        started.append(chunk[0])
+        if chunk[0] == 1:
+            raise RuntimeError("database is gone")
+        time.sleep(0.05)
+        job.record(chunk[0])
+
+    monkeypatch.setattr(manager, "_translate_chunk", translate_chunk)
+
+    async def scenario():
+        job = manager.submit([1, 2, 3], target_locale="ko-KR", provider="gcloud")
+        await manager.wait(job.id)
+        return job.as_dict()
+
+    job = asyncio.run(scenario())
+    file_engine.dispose()
+
+    assert job["status"] == "failed"
+    assert job["translated"] == 1
+    assert job["errors"] == [{"product_id": None, "error": "database is gone"}]
+    assert sorted(started) == [1, 2]
@@ -4,10 +4,11 @@ from datetime import datetime
 import os
 import sys
 import io
+import time
 
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
@@ -22,12 +23,17 @@ from app.models.domain import Product, ProductLocalizedInfo, ProductOption
 from app.main import app
 from app.services import PricingInputs, PricingService
 from app.services.exporter_smartstore import SmartStoreExporter
+from app.services.product_import_service import ProductImportService
 from app.services.taobao_scraper import (
     ScrapeFailed,
     ScrapedOption,
     ScrapedProduct,
     TaobaoScraper,
 )
+from app.services.translation_jobs import TranslationJobManager, get_translation_job_manager
+from app.services.translation_glossary import get_glossary_store
+from app.services.translation_memory import get_translation_memory
+from app.services.translation_providers import FakeTranslationProvider, get_translation_providers
 from app.services.translation_service import (
     TranslationError,
     TranslationService,
@@ -65,6 +71,8 @@ def stub_taobao_scraper(monkeypatch):
 def setup_database():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    get_translation_memory().clear()
+    get_glossary_store().invalidate()
     yield
 
 
@@ -170,6 +178,14 @@ def test_product_import_uses_scraped_payload(client: TestClient, monkeypatch):
     body = resp.json()
     assert body["raw_title"] == "Real Item"
     assert body["raw_price"] == 123.45
+    # Imported products are priced right away, per option and channel.
+    option_id = body["options"][0]["id"]
+    assert [(row["channel"], row["option_id"]) for row in body["sale_prices"]] == [
+        ("smartstore", option_id)
+    ]
+    assert body["sale_prices"][0]["sale_price"] > 0
+    listed = client.get("/api/products").json()
+    assert listed[0]["sale_prices"] == body["sale_prices"]
 
 
 def test_product_import_propagates_scrape_failure(client: TestClient, monkeypatch):
@@ -190,6 +206,96 @@ def test_product_import_propagates_scrape_failure(client: TestClient, monkeypatc
     assert "상품 정보를 불러오지 못했습니다" in resp.json()["detail"]
 
 
+def test_concurrent_imports_of_same_item_share_one_scrape(monkeypatch):
+    calls = []
+
+    async def slow_fetch_product(self, url: str) -> ScrapedProduct:
+        calls.append(url)
+        await asyncio.sleep(0.05)
+        return ScrapedProduct(
+            source_url=self.canonical_url(self.canonical_item_id(url)),
+            source_site="TAOBAO",
+            title="Coalesced Item",
+            price=10.0,
+            currency="CNY",
+            image_urls=[],
+            options=[ScrapedOption(option_key="default", raw_name="기본", raw_price_diff=0)],
+        )
+
+    monkeypatch.setattr(TaobaoScraper, "fetch_product", slow_fetch_product)
+
+    async def import_twice():
+        sessions = [TestingSessionLocal(), TestingSessionLocal()]
+        try:
+            products = await asyncio.gather(
+                ProductImportService(sessions[0]).import_product(
+                    "https://item.taobao.com/item.htm?id=777", "TAOBAO"
+                ),
+                ProductImportService(sessions[1]).import_product(
+                    "https://item.taobao.com/item.htm?spm=a1z10&id=777", "TAOBAO"
+                ),
+            )
+            return [product.id for product in products]
+        finally:
+            for session in sessions:
+                session.close()
+
+    product_ids = asyncio.run(import_twice())
+
+    assert len(calls) == 1
+    assert product_ids[0] == product_ids[1]
+    with TestingSessionLocal() as session:
+        assert session.query(Product).count() == 1
+
+
+def test_cancelled_leader_import_does_not_break_followers(monkeypatch):
+    async def slow_fetch_product(self, url: str) -> ScrapedProduct:
+        await asyncio.sleep(0.05)
+        return ScrapedProduct(
+            source_url=self.canonical_url(self.canonical_item_id(url)),
+            source_site="TAOBAO",
+            title="Leader Item",
+            price=10.0,
+            currency="CNY",
+            image_urls=[],
+        )
+
+    monkeypatch.setattr(TaobaoScraper, "fetch_product", slow_fetch_product)
+    import_sessions = []
+
+    def import_session():
+        import_sessions.append(TestingSessionLocal())
+        return import_sessions[-1]
+
+    async def scenario():
+        leader_session, follower_session = TestingSessionLocal(), TestingSessionLocal()
+        url = "https://item.taobao.com/item.htm?id=778"
+        leader = asyncio.ensure_future(
+            ProductImportService(leader_session, session_factory=import_session).import_product(
+                url, "TAOBAO"
+            )
+        )
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(
+            ProductImportService(follower_session).import_product(url, "TAOBAO")
+        )
+        await asyncio.sleep(0.01)
+        # The request is abandoned: its task is cancelled and its session closed.
+        leader.cancel()
+        leader_session.close()
+        try:
+            product = await follower
+            return product.raw_title, [option.option_key for option in product.options]
+        finally:
+            follower_session.close()
+
+    assert asyncio.run(scenario()) == ("Leader Item", ["default"])
+    # The shared import ran on its own session, not the abandoned request's.
+    assert len(import_sessions) == 1
+    with TestingSessionLocal() as session:
+        assert session.query(Product).count() == 1
+
+
 def test_product_import_and_localization(client: TestClient):
     product_id, _ = create_sample_product(client)
 
@@ -306,12 +412,10 @@ def test_translation_endpoint_returns_failure(client: TestClient):
 def test_translation_endpoint_with_supported_provider(client: TestClient, monkeypatch):
     product_id, _ = create_sample_product(client, index=5)
 
-    class FakeClient:
-        def translate(self, text: str, target_language: str):
-            return {"translatedText": f"{text}-{target_language}"}
-
-    monkeypatch.setattr(
-        TranslationService, "_get_gcloud_client", lambda self: FakeClient()
+    monkeypatch.setitem(
+        get_translation_providers().providers,
+        "gcloud",
+        FakeTranslationProvider("gcloud", template="{text}-{lang}"),
     )
 
     resp = client.post(
@@ -326,7 +430,43 @@ def test_translation_endpoint_with_supported_provider(client: TestClient, monkey
     product = next(p for p in products_resp.json() if p["id"] == product_id)
     assert product["localizations"]
     assert product["localizations"][0]["title"] == "Dummy Taobao Product-ko"
-    assert product["options"][0]["localized_name"] == "기본-ko"
+    # Already Korean, so it is passed through without a provider call.
+    assert product["options"][0]["localized_name"] == "기본"
+
+
+def test_bulk_translation_endpoint_returns_job_handle(client: TestClient, monkeypatch):
+    product_ids = [create_sample_product(client, index=index)[0] for index in (11, 12)]
+
+    monkeypatch.setitem(
+        get_translation_providers().providers,
+        "gcloud",
+        FakeTranslationProvider("gcloud", template="{text}-{lang}"),
+    )
+    manager = TranslationJobManager(TestingSessionLocal, workers=1, chunk_size=1)
+    app.dependency_overrides[get_translation_job_manager] = lambda: manager
+
+    resp = client.post(
+        "/api/products/translate:bulk",
+        json={"product_ids": product_ids, "target_locale": "ko-KR"},
+    )
+    assert resp.status_code == 202, resp.text
+    job_id = resp.json()["id"]
+    assert resp.json()["total"] == 2
+
+    for _ in range(100):
+        job = client.get(f"/api/products/translate:bulk/{job_id}").json()
+        if job["status"] == "completed":
+            break
+        time.sleep(0.02)
+    assert (job["status"], job["translated"], job["progress"]) == ("completed", 2, 1.0)
+
+    products = client.get("/api/products").json()
+    assert all(
+        product["localizations"][0]["title"] == "Dummy Taobao Product-ko"
+        for product in products
+        if product["id"] in product_ids
+    )
+    assert client.get("/api/products/translate:bulk/unknown").status_code == 404
 
 
 def test_translation_endpoint_rejects_unsupported_provider(client: TestClient):
@@ -395,7 +535,7 @@ def test_translation_service_signals_failure_without_client(db_session):
 
     service = TranslationService(db_session)
     with pytest.raises(TranslationError):
-        service.translate_product(product.id, target_locale="ko-KR")
+        service.translate_product(product.id, target_locale="en-US")
 
     updated_option = db_session.get(ProductOption, option.id)
     assert updated_option.localized_name is None
@@ -667,3 +807,45 @@ def test_smartstore_export_appends_return_policy_image(db_session):
     assert rows[1][5].endswith(
         'return-policy.png" alt="return-policy" /></div>'
     )
+
+
+def test_smartstore_export_query_count_does_not_grow_with_products(db_session):
+    def add_products(count: int) -> list[int]:
+        products = [
+            Product(
+                source_url=f"https://example.com/n-plus-one/{index}",
+                source_site="TAOBAO",
+                raw_title=f"상품 {index}",
+                raw_price=10 + index,
+                raw_currency="CNY",
+                options=[
+                    ProductOption(option_key=str(option), raw_name=f"옵션 {option}", raw_price_diff=option)
+                    for option in range(3)
+                ],
+                localizations=[ProductLocalizedInfo(locale="ko-KR", title=f"상품 {index}")],
+            )
+            for index in range(count)
+        ]
+        db_session.add_all(products)
+        db_session.commit()
+        return [product.id for product in products]
+
+    statements: list[str] = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def export_query_count(product_ids: list[int]) -> int:
+        db_session.expire_all()
+        statements.clear()
+        event.listen(engine, "before_cursor_execute", count_statement)
+        try:
+            output = SmartStoreExporter().export_products(db_session, product_ids)
+        finally:
+            event.remove(engine, "before_cursor_execute", count_statement)
+        assert len(list(csv.reader(io.StringIO(output.getvalue())))) == len(product_ids) * 3 + 1
+        return len(statements)
+
+    few, many = add_products(2), add_products(25)
+    export_query_count(few)  # warm up template and pricing caches
+    assert export_query_count(few) == export_query_count(many)